@@ -0,0 +1,275 @@
+import os
+import re
+import json
+import functools
+from collections import deque
+from typing import Iterable, Iterator, Optional
+
+SKILLS_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills.json")
+
+# Word tokens; "+", "#" and inner dots are kept so C++, C# and Node.js stay whole.
+TOKEN_PATTERN = re.compile(r"(?<![A-Za-z0-9])\.?[A-Za-z0-9][A-Za-z0-9+#]*(?:\.[A-Za-z0-9+#]+)*")
+
+# Capitalized technical terms outside the lexicon: acronyms (AWS, SOC2) and mixed case (GraphQL, iOS)
+TERM_PATTERN = re.compile(r"\b(?:[A-Z][A-Z0-9]{1,6}s?|[a-z]+[A-Z][A-Za-z0-9]*|[A-Z][a-z0-9]+[A-Z][A-Za-z0-9]*)\b")
+NON_SKILL_TERMS = {
+    "US", "USA", "UK", "EU", "EEO", "EEOC", "OR", "AND", "THE", "WE", "YOU", "HR", "PTO", "LLC", "INC",
+    "CEO", "CTO", "CFO", "VP", "FAQ", "ETC", "ID", "OK", "IT", "BS", "BA", "MS", "MA", "MBA", "PHD", "PhD",
+    "TBD", "NA", "N/A", "KPI", "KPIs", "ROI", "Q1", "Q2", "Q3", "Q4", "AM", "PM", "PST", "EST", "CST", "UTC"
+}
+
+REQUIREMENT_LINE_PATTERN = re.compile(
+    r"\b(required|requirements?|must|minimum|qualifications?|need to have|you have|you bring)\b", re.IGNORECASE
+)
+# Degree words in any case; abbreviations only dotted (B.S., M.Sc.), as BSc/MSc, or as BS/MS next to a
+# degree context ("BS/MS", "MS in Statistics"), so "100 ms" or "MS Office" is not a degree requirement
+DEGREE_PATTERN = re.compile(
+    r"\b(?:(?i:bachelor'?s?|master'?s?|ph\.?\s?d|doctorate|degree)\b"
+    r"|[BM]\.\s?Sc?\.?(?!\w)"
+    r"|[BM]Sc\b"
+    r"|(?:BS|MS)\b(?=\s*(?:/|in\b|or\b|degree))"
+    r"|(?<=/)(?:BS|MS)\b)"
+)
+
+FILLER_PHRASES = [
+    "passionate about", "detail-oriented", "detail oriented", "team player", "hard worker", "hard-working",
+    "self-starter", "self starter", "go-getter", "results-driven", "results driven", "think outside the box",
+    "synergy", "dynamic", "motivated", "excellent communication skills", "responsible for", "duties included",
+    "various", "etc"
+]
+
+MAX_EXTRA_TERMS = 15
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into original-case word tokens."""
+    return TOKEN_PATTERN.findall(text)
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over word tokens, so phrases only match on word boundaries.
+
+    All patterns are found in one left-to-right pass, independent of how many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[tuple[tuple[str, ...], object]]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        for tokens, value in patterns:
+            self._add(tokens, value)
+        self._build_failure_links()
+
+    def _add(self, tokens: tuple[str, ...], value) -> None:
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(tokens), value))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def iter_matches(self, tokens: list[str]) -> Iterator[tuple[int, int, object]]:
+        """Yield (start, end, value) for every pattern occurrence in tokens."""
+        state = 0
+        for index, token in enumerate(tokens):
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for length, value in self._outputs[state]:
+                yield index - length + 1, index + 1, value
+
+
+class SkillsLexicon:
+    """Known skills and their aliases, compiled into a phrase automaton."""
+
+    def __init__(self, skills: dict[str, list[str]], case_sensitive: Iterable[str] = ()):
+        self.skills = skills
+        self.case_sensitive = set(case_sensitive)
+        self.automaton = AhoCorasick(
+            (tuple(token.lower() for token in tokenize(alias)), (canonical, alias))
+            for canonical, aliases in skills.items()
+            for alias in [canonical, *aliases]
+            if tokenize(alias)
+        )
+
+    def find(self, tokens: list[str], lowered: Optional[list[str]] = None) -> list[tuple[int, int, str]]:
+        """Return (start, end, canonical skill) for each lexicon phrase in the original-case tokens."""
+        lowered = lowered if lowered is not None else [token.lower() for token in tokens]
+        matches = []
+        for start, end, (canonical, alias) in self.automaton.iter_matches(lowered):
+            # Names that are also common words ("Go", "R") must match with their exact casing
+            if alias in self.case_sensitive and " ".join(tokens[start:end]) != alias:
+                continue
+            matches.append((start, end, canonical))
+        return matches
+
+
+@functools.lru_cache(maxsize=1)
+def get_skills_lexicon() -> SkillsLexicon:
+    """Load and compile the skills lexicon once per process."""
+    with open(SKILLS_LEXICON_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    return SkillsLexicon(data["skills"], data.get("case_sensitive", []))
+
+
+def extract_job_keywords(job_description: str) -> list[dict]:
+    """
+    Extract the keywords a job description asks for.
+    Lexicon skills are found with the phrase automaton; capitalized technical terms outside the
+    lexicon (acronyms, mixed case) are added as extra keywords. Keywords on a requirements-style
+    line, or under a requirements heading, are flagged as required.
+    """
+    lexicon = get_skills_lexicon()
+    keywords = {}
+    extras = 0
+    in_requirements = False
+    for line in job_description.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        is_requirement_line = bool(REQUIREMENT_LINE_PATTERN.search(stripped))
+        if stripped.endswith(":"):
+            # A heading such as "Requirements:" applies to the lines below it
+            in_requirements = is_requirement_line
+        required = in_requirements or is_requirement_line
+        tokens = tokenize(line)
+        lowered = [token.lower() for token in tokens]
+        covered = set()
+        for start, end, canonical in lexicon.find(tokens, lowered):
+            covered.update(lowered[start:end])
+            entry = keywords.setdefault(canonical, {"keyword": canonical, "required": False, "lexicon": True})
+            entry["required"] = entry["required"] or required
+        for term in TERM_PATTERN.findall(line):
+            if term in NON_SKILL_TERMS or term.lower() in covered or extras >= MAX_EXTRA_TERMS:
+                continue
+            if term not in keywords:
+                keywords[term] = {"keyword": term, "required": required, "lexicon": False}
+                extras += 1
+            else:
+                keywords[term]["required"] = keywords[term]["required"] or required
+    return list(keywords.values())
+
+
+def resume_text_fields(resume: dict) -> dict[str, str]:
+    """Flatten a ResumeData dict into the text groups scored separately."""
+    def entries(key, fields):
+        for entry in resume.get(key, []):
+            for field in fields:
+                value = entry.get(field, "")
+                yield "\n".join(value) if isinstance(value, list) else value
+
+    return {
+        "skills": "\n".join(resume.get("skills", [])),
+        "experience": "\n".join([
+            *entries("experience", ["position", "company", "description"]),
+            *entries("projects", ["name", "description", "technologies"]),
+            *entries("volunteer_experience", ["position", "organization", "description"])
+        ]),
+        "other": "\n".join([
+            resume.get("summary", ""),
+            *entries("education", ["degree", "institution", "relevant_coursework"]),
+            *entries("certifications", ["name", "issuer"]),
+            *entries("publications", ["title", "journal"]),
+            *resume.get("awards", []),
+            *resume.get("languages", [])
+        ])
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def extra_terms_automaton(terms: tuple[str, ...]) -> AhoCorasick:
+    """
+    Compile a job description's non-lexicon keywords into a phrase automaton. Cached by the terms, so every
+    resume field and every candidate scored against the same job reuses one automaton.
+    """
+    return AhoCorasick((tuple(token.lower() for token in tokenize(term)), term) for term in terms)
+
+
+def find_keywords(text: str, keywords: list[dict]) -> set[str]:
+    """Return which of the keywords occur in text."""
+    tokens = tokenize(text)
+    lowered = [token.lower() for token in tokens]
+    found = {canonical for _, _, canonical in get_skills_lexicon().find(tokens, lowered)}
+    extra = tuple(keyword["keyword"] for keyword in keywords if not keyword["lexicon"])
+    if extra:
+        found.update(term for _, _, term in extra_terms_automaton(extra).iter_matches(lowered))
+    return found & {keyword["keyword"] for keyword in keywords}
+
+
+def weighted_share(keywords: list[dict], found: set[str]) -> int:
+    """Percentage of keywords found, with required keywords counting double; 0 when there are no keywords."""
+    total = sum(2 if keyword["required"] else 1 for keyword in keywords)
+    if not total:
+        return 0
+    matched = sum(2 if keyword["required"] else 1 for keyword in keywords if keyword["keyword"] in found)
+    return round(100 * matched / total)
+
+
+def analyze_keywords(resume: dict, job_description: str, keywords: Optional[list[dict]] = None) -> dict:
+    """
+    Deterministically score a resume (ResumeData as a dict) against a job description.
+    Pass keywords to reuse an earlier extract_job_keywords result for the same job description.
+    Returns matched/missing keywords plus 0-100 keyword, skills, experience, education and overall scores.
+    has_keywords is False when no keywords were found in the job description; the keyword-based
+    scores are then 0 and say nothing about the resume.
+    """
+    if keywords is None:
+        keywords = extract_job_keywords(job_description)
+    fields = resume_text_fields(resume)
+    found_in_skills = find_keywords(fields["skills"], keywords)
+    found_in_experience = find_keywords(fields["experience"], keywords)
+    found_in_other = find_keywords(fields["other"], keywords)
+    found = found_in_skills | found_in_experience | found_in_other
+
+    keyword_match_score = weighted_share(keywords, found)
+    skills_alignment = weighted_share(keywords, found_in_skills | found_in_experience)
+    experience_relevance = weighted_share(keywords, found_in_experience)
+
+    has_education = bool(resume.get("education"))
+    if DEGREE_PATTERN.search(job_description):
+        education_fit = 100 if has_education else 30
+    else:
+        education_fit = 100 if has_education else 70
+
+    overall_score = round(
+        0.4 * keyword_match_score
+        + 0.25 * experience_relevance
+        + 0.2 * skills_alignment
+        + 0.15 * education_fit
+    )
+
+    resume_text = "\n".join(fields.values()).lower()
+    removable_words = [phrase for phrase in FILLER_PHRASES if re.search(rf"\b{re.escape(phrase)}\b", resume_text)]
+
+    return {
+        "keywords": keywords,
+        "has_keywords": bool(keywords),
+        "matched_keywords": [keyword["keyword"] for keyword in keywords if keyword["keyword"] in found],
+        "missing_keywords": [keyword["keyword"] for keyword in keywords if keyword["keyword"] not in found],
+        "missing_required_keywords": [
+            keyword["keyword"] for keyword in keywords if keyword["required"] and keyword["keyword"] not in found
+        ],
+        "keyword_match_score": keyword_match_score,
+        "skills_alignment": skills_alignment,
+        "experience_relevance": experience_relevance,
+        "education_fit": education_fit,
+        "overall_score": overall_score,
+        "removable_words": removable_words
+    }
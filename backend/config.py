@@ -10,18 +10,42 @@ class Config:
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     
+    # Shared HTTP connection pool for the async OpenAI client
+    OPENAI_HTTP = {
+        "max_connections": int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+        "max_keepalive_connections": int(os.getenv("OPENAI_MAX_KEEPALIVE", "20")),
+        "timeout": float(os.getenv("OPENAI_TIMEOUT", "120"))  # seconds
+    }
+    
     # Resume Parsing Configuration
     RESUME_PARSING = {
         "model": "gpt-4.1-mini",
         "max_tokens": 2000,
-        "temperature": 0.1
+        "temperature": 0.1,
+        "local_parser_version": "3",  # Bump when resume_parser.py changes to invalidate cached fast/hybrid results
+        "local_fallback": os.getenv("PARSING_LOCAL_FALLBACK", "true").lower() == "true",  # Use the offline parser when the LLM is unavailable
+        "hybrid_confidence_threshold": float(os.getenv("PARSING_HYBRID_THRESHOLD", "0.8")),  # Hybrid mode sends sections below this to the LLM
+        "max_input_tokens": int(os.getenv("PARSING_MAX_INPUT_TOKENS", "12000"))  # Prompt budget; longer resumes are trimmed by section priority
     }
     
     # Resume Optimization Configuration (for future use)
     RESUME_OPTIMIZATION = {
-        "model": "gpt-4",  # More powerful model for optimization
+        # More powerful model for optimization and ATS analysis. gpt-4 has no prompt caching; a gpt-4o or
+        # gpt-4.1 model caches the shared prompt prefix across requests once it reaches 1024 tokens
+        "model": os.getenv("OPTIMIZATION_MODEL", "gpt-4"),
         "max_tokens": 3000,
-        "temperature": 0.3  # Slightly more creative for optimization
+        "temperature": 0.3,  # Slightly more creative for optimization
+        "batch_concurrency": int(os.getenv("OPTIMIZATION_BATCH_CONCURRENCY", "5")),  # Parallel LLM calls per batch request
+        "max_batch_items": 50,  # The frontend splits "optimize all" into batches of this size (OPTIMIZATION_BATCH_SIZE)
+        "max_multi_ats_jobs": 25,  # Job descriptions per /analyze-ats/multi request
+        "ats_prefilter_min_score": int(os.getenv("ATS_PREFILTER_MIN_SCORE", "20")),  # Local keyword match below this skips the LLM when prefilter is on
+        "max_input_tokens": int(os.getenv("OPTIMIZATION_MAX_INPUT_TOKENS", "5000"))  # Prompt budget; longer job descriptions are trimmed, boilerplate first
+    }
+    
+    # Structured JSON output for all LLM calls
+    STRUCTURED_OUTPUT = {
+        "enabled": os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() == "true",  # Send a JSON schema response_format
+        "max_retries": int(os.getenv("LLM_MAX_RETRIES", "2"))  # Extra calls when the output cannot be parsed or validated
     }
     
     # PDF Generation Configuration
@@ -59,7 +83,8 @@ class Config:
     SERVER = {
         "host": "0.0.0.0",
         "port": 8000,
-        "debug": False
+        "debug": False,
+        "admin_token": os.getenv("ADMIN_TOKEN", "")  # Required in X-Admin-Token by admin endpoints; unset disables them
     }
     
     # CORS Configuration
@@ -68,14 +93,96 @@ class Config:
         "allowed_origins": ["*"], # Allow all origins for now todo: Remove this
         "allow_credentials": True,
         "allow_methods": ["*"],
-        "allow_headers": ["*"]
+        "allow_headers": ["*"],
+        "expose_headers": ["ETag", "Content-Disposition", "X-Tokens-In", "X-Tokens-Out", "X-Tokens-Cached"]
     }
     
     # File Upload Configuration
     UPLOAD = {
         "max_file_size": 10 * 1024 * 1024,  # 10MB
         "allowed_extensions": [".pdf", ".docx"],
-        "temp_dir": "temp_uploads"
+        "temp_dir": "temp_uploads",
+        "chunk_size": 64 * 1024,  # Bytes read from the upload at a time
+        "spill_threshold": 1024 * 1024  # Uploads larger than this are written to temp_dir instead of kept in memory
+    }
+    
+    # Text extraction limits; the model can only use so much of a very long CV
+    EXTRACTION = {
+        "max_pages": int(os.getenv("EXTRACTION_MAX_PAGES")) if os.getenv("EXTRACTION_MAX_PAGES") else None,  # None reads every page
+        "max_chars": int(os.getenv("EXTRACTION_MAX_CHARS", "100000"))
+    }
+    
+    # Worker processes for CPU-bound text extraction and PDF/DOCX rendering (0 runs inline)
+    PROCESS_POOL = {
+        "max_workers": int(os.getenv("PROCESS_POOL_WORKERS", str(os.cpu_count() or 1)))
+    }
+    
+    # Result Cache Configuration
+    CACHE = {
+        "parse": {
+            "max_entries": int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "512")),
+            "ttl_seconds": int(os.getenv("PARSE_CACHE_TTL", str(7 * 24 * 3600))),
+            "sqlite_enabled": os.getenv("PARSE_CACHE_SQLITE", "true").lower() == "true",
+            "sqlite_max_entries": int(os.getenv("PARSE_CACHE_SQLITE_MAX_ENTRIES", "20000")),
+            "sqlite_max_bytes": int(os.getenv("PARSE_CACHE_SQLITE_MAX_BYTES", str(256 * 1024 * 1024))),
+            "sqlite_purge_every": 100,  # Expired and over-limit entries are removed after this many writes
+            "sqlite_filename": "parse_cache.sqlite3"  # Stored under UPLOAD["temp_dir"]
+        },
+        "ats": {
+            "max_entries": int(os.getenv("ATS_CACHE_MAX_ENTRIES", "1024")),
+            "ttl_seconds": int(os.getenv("ATS_CACHE_TTL", str(24 * 3600)))
+        },
+        "documents": {
+            "max_bytes": int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        },
+        "resume_blocks": {
+            "max_entries": int(os.getenv("RESUME_BLOCK_CACHE_MAX_ENTRIES", "1024")),
+            "ttl_seconds": 3600
+        },
+        "job_descriptions": {
+            "max_entries": int(os.getenv("JOB_DESCRIPTION_CACHE_MAX_ENTRIES", "1024")),
+            "ttl_seconds": int(os.getenv("JOB_DESCRIPTION_CACHE_TTL", str(24 * 3600)))
+        }
+    }
+    
+    # Bulk resume parsing jobs
+    BULK = {
+        "max_files": int(os.getenv("BULK_MAX_FILES", "5000")),
+        "max_upload_size": int(os.getenv("BULK_MAX_UPLOAD_SIZE", str(500 * 1024 * 1024))),  # Whole request, including zips
+        "max_unpacked_size": int(os.getenv("BULK_MAX_UNPACKED_SIZE", str(2 * 1024 * 1024 * 1024))),  # Resumes unpacked from a request's zips, in total
+        "llm_concurrency": int(os.getenv("BULK_LLM_CONCURRENCY", "8")),  # LLM parses in flight across all bulk jobs
+        "ttl_seconds": int(os.getenv("BULK_JOB_TTL", str(7 * 24 * 3600))),  # Jobs and their results are kept this long
+        "heartbeat_seconds": 60,  # Each server process records that it is alive, and looks for interrupted jobs, this often
+        "stale_after_seconds": 300,  # Running jobs of a process with no heartbeat for this long are reported as interrupted
+        "event_poll_seconds": 2,  # Progress events are re-read from the database this often while streaming
+        "sqlite_filename": "bulk_jobs.sqlite3"  # Stored under UPLOAD["temp_dir"]
+    }
+    
+    # Candidate ranking: a local BM25 pass over every resume, then the full ATS analysis for the top K
+    RANKING = {
+        "max_candidates": int(os.getenv("RANKING_MAX_CANDIDATES", "1000")),
+        "top_k": int(os.getenv("RANKING_TOP_K", "10")),  # Default number of candidates sent to the LLM
+        "max_top_k": 50,
+        "llm_concurrency": int(os.getenv("RANKING_LLM_CONCURRENCY", "5")),  # Parallel ATS analyses per ranking request
+        "field_weights": {"skills": 2.0, "experience": 1.5, "other": 1.0}  # Weight of a term found in each resume field group
+    }
+    
+    # Local hashed n-gram embeddings for semantic requirement matching and bullet prioritization
+    EMBEDDINGS = {
+        "dimensions": int(os.getenv("EMBEDDING_DIMENSIONS", "512")),
+        "min_similarity": float(os.getenv("SEMANTIC_MATCH_MIN_SIMILARITY", "0.25")),  # Cosine similarity counted as a match
+        "max_priority_bullets": 5,  # Least job-aligned bullets named in section optimization prompts
+        "index_cache_max_entries": 256,  # Embedded resumes kept in memory
+        "index_cache_ttl": 3600
+    }
+    
+    # Server-side resume sessions, referenced by resume_id instead of re-sending ResumeData
+    SESSIONS = {
+        "backend": os.getenv("SESSION_BACKEND", "memory"),  # "memory" or "sqlite" (survives restarts, shared by workers)
+        "max_entries": int(os.getenv("SESSION_MAX_ENTRIES", "10000")),  # Memory backend only
+        "ttl_seconds": int(os.getenv("SESSION_TTL", str(7 * 24 * 3600))),  # Extended on every update
+        "sqlite_filename": "sessions.sqlite3",  # Stored under UPLOAD["temp_dir"]
+        "validated_max_entries": 1024  # Validated ResumeData objects kept in memory per session version
     }
     
     @classmethod
@@ -0,0 +1,114 @@
+import zlib
+import functools
+import numpy as np
+from ats_engine import tokenize
+from ranking import STOPWORDS
+
+# Entries of these ResumeData sections carry bullet lists under "description"
+BULLET_SECTIONS = ["experience", "projects", "volunteer_experience"]
+
+CHAR_NGRAM_SIZES = (3, 4, 5)
+WORD_FEATURE_WEIGHT = 2.0  # Whole words count more than the character n-grams spelling them
+
+
+@functools.lru_cache(maxsize=65536)
+def text_features(text: str) -> tuple[tuple[int, ...], tuple[float, ...]]:
+    """
+    Hashed features of text: lowercase words (stopwords dropped) and character n-grams of each word, as (hashes, weights).
+    crc32 is stable across processes, unlike hash(), so vectors can be compared between workers.
+    """
+    hashes = []
+    weights = []
+    for token in tokenize(text):
+        token = token.lower()
+        if token in STOPWORDS:
+            continue
+        hashes.append(zlib.crc32(b"w:" + token.encode("utf-8")))
+        weights.append(WORD_FEATURE_WEIGHT)
+        padded = f"<{token}>"
+        for size in CHAR_NGRAM_SIZES:
+            for start in range(len(padded) - size + 1):
+                hashes.append(zlib.crc32(padded[start:start + size].encode("utf-8")))
+                weights.append(1.0)
+    return tuple(hashes), tuple(weights)
+
+
+class HashedNgramEmbedder:
+    """
+    CPU-only text embeddings: hashed word and character n-gram counts in a fixed number of dimensions,
+    L2-normalized so a dot product is the cosine similarity. Catches spelling variants and shared stems
+    (PostgreSQL/Postgres), not synonyms (Kubernetes/K8s).
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts into a float32 matrix with one unit-length row per text (all zeros for empty text)."""
+        rows = []
+        columns = []
+        values = []
+        for row, text in enumerate(texts):
+            hashes, weights = text_features(text)
+            for feature_hash, weight in zip(hashes, weights):
+                rows.append(row)
+                columns.append(feature_hash % self.dimensions)
+                # One hash bit picks the sign, so colliding features tend to cancel instead of adding up
+                values.append(weight if feature_hash & 0x80000000 else -weight)
+        flat = np.asarray(rows, dtype=np.int64) * self.dimensions + np.asarray(columns, dtype=np.int64)
+        matrix = np.bincount(flat, weights=np.asarray(values, dtype=np.float64), minlength=len(texts) * self.dimensions)
+        matrix = matrix.astype(np.float32).reshape(len(texts), self.dimensions)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class EmbeddingIndex:
+    """Texts with metadata and their embeddings in one float32 matrix, queried by top-k cosine similarity."""
+
+    def __init__(self, embedder: HashedNgramEmbedder, items: list[dict]):
+        self.embedder = embedder
+        self.items = items  # Each has at least "text"
+        self.matrix = embedder.embed([item["text"] for item in items])
+
+    def search(self, queries: list[str], k: int = 1) -> list[list[tuple[dict, float]]]:
+        """The k most similar items for each query, best first, as (item, cosine similarity)."""
+        if not self.items or not queries:
+            return [[] for _ in queries]
+        similarities = self.embedder.embed(queries) @ self.matrix.T
+        k = min(k, len(self.items))
+        # argpartition finds the top k without sorting every row; only those k are sorted
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        results = []
+        for row, columns in enumerate(top):
+            columns = columns[np.argsort(-similarities[row, columns], kind="stable")]
+            results.append([(self.items[column], float(similarities[row, column])) for column in columns])
+        return results
+
+    def best_similarity(self, queries: list[str]) -> np.ndarray:
+        """For each item, its highest similarity to any of the queries (zeros when there are no queries)."""
+        if not self.items or not queries:
+            return np.zeros(len(self.items), dtype=np.float32)
+        return (self.matrix @ self.embedder.embed(queries).T).max(axis=1)
+
+
+def resume_items(resume: dict) -> list[dict]:
+    """
+    The skills and bullets of a ResumeData dict as index items:
+    {"kind": "skill", "text"} or {"kind": section, "text", "entry", "bullet"}.
+    """
+    items = [{"kind": "skill", "text": skill} for skill in resume.get("skills", []) if skill.strip()]
+    for section in BULLET_SECTIONS:
+        items += section_bullets(resume.get(section, []), section)
+    return items
+
+
+def section_bullets(entries: list, section: str) -> list[dict]:
+    """The description bullets of a section's entries, with their entry and bullet positions."""
+    bullets = []
+    for entry_index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("description"), list):
+            continue
+        for bullet_index, bullet in enumerate(entry["description"]):
+            if isinstance(bullet, str) and bullet.strip():
+                bullets.append({"kind": section, "text": bullet, "entry": entry_index, "bullet": bullet_index})
+    return bullets
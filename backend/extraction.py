@@ -0,0 +1,119 @@
+import re
+import zipfile
+from itertools import islice
+from typing import IO, Iterable, Iterator, Optional, Union
+from xml.etree.ElementTree import iterparse
+import PyPDF2
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+# Run-level elements that stand for a character rather than containing text
+DOCX_CHARACTER_ELEMENTS = {
+    f"{W_NS}tab": "\t",
+    f"{W_NS}br": "\n",
+    f"{W_NS}cr": "\n",
+    f"{W_NS}noBreakHyphen": "-"
+}
+
+
+def iter_pdf_pages(pdf_reader: PyPDF2.PdfReader, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each PDF page, stopping after max_pages if given."""
+    for page in islice(pdf_reader.pages, max_pages):
+        yield page.extract_text()
+
+
+def iter_docx_text(source: Union[str, IO[bytes]]) -> Iterator[str]:
+    """
+    Yield the text blocks of a DOCX in reading order without building the python-docx object model.
+    Headers come first, then the body (paragraphs, table rows and text boxes), then footers.
+    """
+    with zipfile.ZipFile(source) as archive:
+        names = set(archive.namelist())
+        headers = sorted(name for name in names if re.fullmatch(r"word/header\d*\.xml", name))
+        footers = sorted(name for name in names if re.fullmatch(r"word/footer\d*\.xml", name))
+        for name in headers + ["word/document.xml"] + footers:
+            if name in names:
+                with archive.open(name) as part:
+                    yield from iter_docx_part_text(part)
+
+
+def iter_docx_part_text(part: IO[bytes]) -> Iterator[str]:
+    """
+    Stream one WordprocessingML part with iterparse, yielding a block per paragraph and per table row.
+    Cells in a row are joined with " | ". Text box paragraphs become blocks of their own right after
+    the paragraph that anchors the text box, or join its cell's text inside a table.
+    Fallback copies of text boxes (mc:Fallback) are skipped so their text is not duplicated.
+    """
+    paragraphs = []  # (run text, text box blocks anchored in it) of each open paragraph, innermost last
+    containers = []  # Blocks of each open table cell or text box, innermost last
+    rows = []  # Cell text of each open table row, innermost last
+    skip_depth = 0
+    
+    for event, elem in iterparse(part, events=("start", "end")):
+        tag = elem.tag
+        
+        if tag == f"{MC_NS}Fallback":
+            skip_depth += 1 if event == "start" else -1
+            continue
+        if skip_depth:
+            continue
+        
+        if event == "start":
+            if tag == f"{W_NS}p":
+                paragraphs.append(([], []))
+            elif tag in (f"{W_NS}tc", f"{W_NS}txbxContent"):
+                containers.append([])
+            elif tag == f"{W_NS}tr":
+                rows.append([])
+            continue
+        
+        blocks = []
+        if tag == f"{W_NS}t":
+            if paragraphs and elem.text:
+                paragraphs[-1][0].append(elem.text)
+        elif tag in DOCX_CHARACTER_ELEMENTS:
+            if paragraphs:
+                paragraphs[-1][0].append(DOCX_CHARACTER_ELEMENTS[tag])
+        elif tag == f"{W_NS}p":
+            runs, text_boxes = paragraphs.pop()
+            text = "".join(runs).strip()
+            blocks = ([text] if text else []) + text_boxes
+            elem.clear()
+        elif tag == f"{W_NS}tc":
+            cell = " ".join(containers.pop())
+            if rows:
+                rows[-1].append(cell)
+        elif tag == f"{W_NS}txbxContent":
+            text_box = containers.pop()
+            if paragraphs:
+                # Read after the text of the paragraph the text box is anchored in
+                paragraphs[-1][1].extend(text_box)
+            else:
+                blocks = text_box
+        elif tag == f"{W_NS}tr":
+            row = " | ".join(cell for cell in rows.pop() if cell)
+            blocks = [row] if row else []
+            elem.clear()
+        
+        if blocks:
+            if containers:
+                containers[-1].extend(blocks)
+            else:
+                yield from blocks
+
+
+def join_chunks(chunks: Iterable[str], max_chars: Optional[int] = None) -> str:
+    """
+    Join text chunks with newlines in a single pass.
+    Stops consuming chunks once max_chars is reached, so lazy extractors skip the rest of the document.
+    """
+    parts = []
+    total = 0
+    for chunk in chunks:
+        if max_chars is not None and total + len(chunk) >= max_chars:
+            parts.append(chunk[:max_chars - total])
+            break
+        parts.append(chunk)
+        total += len(chunk) + 1  # Account for the joining newline
+    return "\n".join(parts).strip()
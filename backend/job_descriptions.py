@@ -0,0 +1,173 @@
+import re
+from typing import Optional
+from cache import TTLCache, stable_hash
+from ats_engine import DEGREE_PATTERN, REQUIREMENT_LINE_PATTERN, extract_job_keywords, get_skills_lexicon, tokenize
+
+# Job posting lines that rarely affect ATS matching: benefits, EEO statements, company blurbs, how to apply
+JOB_BOILERPLATE_PATTERN = re.compile(
+    r"\b(equal opportunity|eeo|benefits?|perks|401\(?k\)?|paid time off|pto|salary|compensation|pay range|"
+    r"about (?:us|the company)|who we are|our mission|how to apply|apply now|click apply|accommodations?|"
+    r"background check|e-verify|privacy (?:policy|notice))\b",
+    re.IGNORECASE
+)
+RESPONSIBILITY_HEADING_PATTERN = re.compile(
+    r"\b(responsibilit(?:y|ies)|duties|what you(?:'ll| will) do|the role|your role|day to day|in this role)\b", re.IGNORECASE
+)
+BULLET_PREFIX_PATTERN = re.compile(r"^\s*(?:[•●▪■◦‣∙·*\-–—>]|\d{1,2}[.)])\s+")
+
+# Seniority levels, most specific first; the posting title is checked before the body
+SENIORITY_PATTERNS = [
+    ("intern", re.compile(r"\bintern(?:ship)?\b", re.IGNORECASE)),
+    ("director", re.compile(r"\b(director|vice president|vp|head of|chief)\b", re.IGNORECASE)),
+    ("principal", re.compile(r"\b(principal|distinguished|staff)\b", re.IGNORECASE)),
+    ("lead", re.compile(r"\b(lead|manager)\b", re.IGNORECASE)),
+    ("senior", re.compile(r"\b(senior|sr\.?)(?=\s|$)", re.IGNORECASE)),
+    ("junior", re.compile(r"\b(junior|jr\.?|entry[- ]level|new grad(?:uate)?|associate)(?=\s|$)", re.IGNORECASE)),
+    ("mid", re.compile(r"\b(mid[- ]level|intermediate)\b", re.IGNORECASE))
+]
+YEARS_PATTERN = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:-|–|to)?\s*(?:\d{1,2}\s*)?\+?\s*years?\b", re.IGNORECASE)
+
+# Lines of each kind kept in the compact digest sent to prompts
+MAX_DIGEST_REQUIREMENTS = 15
+MAX_DIGEST_RESPONSIBILITIES = 10
+
+
+def normalize_job_description(text: str) -> str:
+    """
+    Normalize a pasted job description: collapse whitespace within lines, drop blank lines and
+    repeated lines (job boards often repeat blocks), keep the line structure requirement detection relies on.
+    """
+    lines = []
+    seen = set()
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if not line or line.lower() in seen:
+            continue
+        seen.add(line.lower())
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def classify_job_lines(lines: list[str]) -> list[str]:
+    """
+    Label each job description line "requirement", "responsibility", "skill", "other" or "boilerplate".
+    A heading line (ending in ":") also sets the label of the lines below it.
+    """
+    lexicon = get_skills_lexicon()
+    kinds = []
+    section = None
+    for line in lines:
+        is_requirement_line = bool(REQUIREMENT_LINE_PATTERN.search(line))
+        is_boilerplate_line = bool(JOB_BOILERPLATE_PATTERN.search(line))
+        if line.endswith(":"):
+            if is_requirement_line:
+                section = "requirement"
+            elif is_boilerplate_line:
+                section = "boilerplate"
+            elif RESPONSIBILITY_HEADING_PATTERN.search(line):
+                section = "responsibility"
+            else:
+                section = None
+        if is_requirement_line:
+            kinds.append("requirement")
+        elif is_boilerplate_line or section == "boilerplate":
+            kinds.append("boilerplate")
+        elif section in ("requirement", "responsibility"):
+            kinds.append(section)
+        elif lexicon.find(tokenize(line)):
+            kinds.append("skill")
+        else:
+            kinds.append("other")
+    return kinds
+
+
+def detect_seniority(title: str, text: str, min_years: Optional[int]) -> str:
+    """Seniority from the title, then the body, then the years of experience asked for."""
+    for source in (title, text):
+        for level, pattern in SENIORITY_PATTERNS:
+            if pattern.search(source):
+                return level
+    if min_years is None:
+        return "unspecified"
+    if min_years < 2:
+        return "junior"
+    if min_years < 5:
+        return "mid"
+    return "senior"
+
+
+def build_job_digest(job_description: str) -> dict:
+    """
+    Preprocess a job description once: normalized text, title, seniority, minimum years of experience,
+    degree requirement, requirement and responsibility lines, and ATS keywords.
+    """
+    text = normalize_job_description(job_description)
+    lines = text.splitlines()
+    kinds = classify_job_lines(lines)
+    title = lines[0] if lines else ""
+
+    def content_lines(kind):
+        # Headings only carry the section label, which the digest already gives
+        return [BULLET_PREFIX_PATTERN.sub("", line) for line, line_kind in zip(lines, kinds) if line_kind == kind and not line.endswith(":")]
+
+    years = [int(match.group(1)) for match in YEARS_PATTERN.finditer(text)]
+    min_years = max(years) if years else None
+    requirements = content_lines("requirement")
+    return {
+        "id": stable_hash(text)[:32],
+        "text": text,
+        "title": title,
+        "seniority": detect_seniority(title, text, min_years),
+        "min_years_experience": min_years,
+        "degree_required": any(DEGREE_PATTERN.search(line) for line in requirements),
+        "requirements": requirements,
+        "responsibilities": content_lines("responsibility") + content_lines("skill"),
+        "keywords": extract_job_keywords(text)
+    }
+
+
+def render_job_digest(digest: dict) -> str:
+    """Render a digest as the compact job description text used in prompts in place of the raw posting."""
+    required = [keyword["keyword"] for keyword in digest["keywords"] if keyword["required"]]
+    preferred = [keyword["keyword"] for keyword in digest["keywords"] if not keyword["required"]]
+    seniority = digest["seniority"]
+    if digest["min_years_experience"] is not None:
+        seniority += f" ({digest['min_years_experience']}+ years)"
+    lines = [
+        f"Title: {digest['title']}",
+        f"Seniority: {seniority}",
+        f"Degree required: {'yes' if digest['degree_required'] else 'no'}",
+        f"Required skills: {', '.join(required) or 'none listed'}",
+        f"Preferred skills: {', '.join(preferred) or 'none listed'}"
+    ]
+    if digest["requirements"]:
+        lines.append("Requirements:")
+        lines += [f"- {line}" for line in digest["requirements"][:MAX_DIGEST_REQUIREMENTS]]
+    if digest["responsibilities"]:
+        lines.append("Responsibilities:")
+        lines += [f"- {line}" for line in digest["responsibilities"][:MAX_DIGEST_RESPONSIBILITIES]]
+    return "\n".join(lines)
+
+
+class JobDescriptionRegistry:
+    """
+    Preprocessed job descriptions keyed by a hash of their normalized text, so registering the
+    same posting twice returns the same ID and the digest is built once.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = TTLCache(max_entries, ttl_seconds)
+
+    def register(self, job_description: str) -> dict:
+        job_id = stable_hash(normalize_job_description(job_description))[:32]
+        digest = self._cache.get(job_id)
+        if digest is None:
+            digest = build_job_digest(job_description)
+            self._cache.set(job_id, digest)
+        return digest
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self._cache.get(job_id)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
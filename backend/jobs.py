@@ -0,0 +1,260 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import secrets
+import sqlite3
+import zipfile
+import threading
+from typing import Optional
+from fastapi import HTTPException
+
+# Files in a zip that are never resumes: folders, macOS resource forks, hidden files
+IGNORED_ZIP_PREFIXES = ("__MACOSX/", ".")
+
+FILE_STATUSES = ["queued", "processing", "done", "failed"]
+
+
+def unpack_resume_zip(zip_path: str, dest_dir: str, allowed_extensions: list[str], max_member_size: int, max_files: int, max_total_size: int) -> list[dict]:
+    """
+    Unpack the resumes in a zip into dest_dir, one file per member named by its position, and hash them.
+    Returns one entry per member: {"filename", "extension", "path", "digest", "size", "error"}; members that are
+    unsupported or too large get an error and no path. Raises HTTPException for an unreadable zip, more than
+    max_files members, or more than max_total_size bytes unpacked (a zip bomb). Runs in a worker process.
+    """
+    entries = []
+    total_size = 0
+    chunk_size = 64 * 1024
+    too_large_total = HTTPException(status_code=413, detail=f"Zip contents too large. A job can unpack at most {max_total_size // (1024 * 1024)}MB.")
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Not a valid zip file")
+    with archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or os.path.basename(name).startswith(IGNORED_ZIP_PREFIXES) or name.startswith(IGNORED_ZIP_PREFIXES):
+                continue
+            if len(entries) >= max_files:
+                raise HTTPException(status_code=400, detail=f"Too many files. A job can contain at most {max_files} files.")
+            extension = os.path.splitext(name)[1].lower()
+            entry = {"filename": name, "extension": extension.lstrip("."), "path": "", "digest": "", "size": 0, "error": ""}
+            entries.append(entry)
+            if extension not in allowed_extensions:
+                entry["error"] = "Unsupported file type. Please upload a PDF or DOCX file."
+                continue
+            if info.file_size > max_member_size:
+                entry["error"] = f"File too large. Maximum size is {max_member_size // (1024 * 1024)}MB."
+                continue
+            if total_size + info.file_size > max_total_size:
+                raise too_large_total
+            # Member names are never used as paths, so entries like "../x.pdf" cannot escape dest_dir
+            path = os.path.join(dest_dir, f"{len(entries) - 1}{extension}")
+            digest = hashlib.sha256()
+            size = 0
+            with archive.open(info) as source, open(path, "wb") as target:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    # The declared sizes can lie; stop reading once the real size is over a limit
+                    size += len(chunk)
+                    if size > max_member_size or total_size + size > max_total_size:
+                        break
+                    digest.update(chunk)
+                    target.write(chunk)
+            if size > max_member_size:
+                os.remove(path)
+                entry["error"] = f"File too large. Maximum size is {max_member_size // (1024 * 1024)}MB."
+                continue
+            if total_size + size > max_total_size:
+                raise too_large_total
+            total_size += size
+            entry["path"] = path
+            entry["digest"] = digest.hexdigest()
+            entry["size"] = size
+    return entries
+
+
+class BulkJobStore:
+    """
+    Bulk parsing jobs and their per-file results, persisted in SQLite so results outlive the request and the process.
+    Each store instance is a run that owns the jobs it creates and records a heartbeat; running jobs whose run
+    stopped sending heartbeats (the process exited or restarted) are marked interrupted by interrupt_stale().
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, stale_after_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.run_id = secrets.token_hex(16)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, mode TEXT NOT NULL, status TEXT NOT NULL, total INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, finished_at REAL, owner TEXT NOT NULL DEFAULT '');"
+            "CREATE TABLE IF NOT EXISTS job_files ("
+            "job_id TEXT NOT NULL, idx INTEGER NOT NULL, filename TEXT NOT NULL, status TEXT NOT NULL, "
+            "resume_id TEXT NOT NULL DEFAULT '', message TEXT NOT NULL DEFAULT '', error TEXT NOT NULL DEFAULT '', "
+            "result TEXT, PRIMARY KEY (job_id, idx));"
+            "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL);"
+        )
+        # Databases created before jobs had owners; their running jobs belong to no live run
+        if "owner" not in [column[1] for column in self._conn.execute("PRAGMA table_info(jobs)")]:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+            self._conn.commit()
+        self._lock = threading.Lock()
+        self.heartbeat()
+        self.purge_expired()
+        self.interrupt_stale()
+
+    def create_job(self, mode: str, files: list[dict]) -> str:
+        """Create a job for files ({"filename", "error"}); files that already have an error start out failed."""
+        job_id = secrets.token_hex(16)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, mode, status, total, created_at, updated_at, owner) VALUES (?, ?, 'running', ?, ?, ?, ?)",
+                (job_id, mode, len(files), time.time(), time.time(), self.run_id)
+            )
+            self._conn.executemany(
+                "INSERT INTO job_files (job_id, idx, filename, status, error) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (job_id, index, entry["filename"], "failed" if entry["error"] else "queued", entry["error"])
+                    for index, entry in enumerate(files)
+                ]
+            )
+            self._conn.commit()
+        return job_id
+
+    def update_file(self, job_id: str, index: int, status: str, resume_id: str = "", message: str = "", error: str = "", result: Optional[str] = None) -> None:
+        """Record a file's progress. Files of a job that is no longer running (e.g. interrupted) are left as they are."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_files SET status = ?, resume_id = ?, message = ?, error = ?, result = ? "
+                "WHERE job_id = ? AND idx = ? AND job_id IN (SELECT id FROM jobs WHERE status = 'running')",
+                (status, resume_id, message, error, result, job_id, index)
+            )
+            self._conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+            self._conn.commit()
+
+    def finish_job(self, job_id: str, status: str = "completed") -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = 'running'", (status, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """Return the job with per-status file counts, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, mode, status, total, created_at, finished_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_files WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        return {
+            "job_id": row[0],
+            "mode": row[1],
+            "status": row[2],
+            "total": row[3],
+            "created_at": row[4],
+            "finished_at": row[5],
+            "counts": {status: counts.get(status, 0) for status in FILE_STATUSES}
+        }
+
+    def list_files(self, job_id: str, offset: int = 0, limit: int = 100, include_results: bool = False, status: Optional[str] = None) -> list[dict]:
+        query = "SELECT idx, filename, status, resume_id, message, error, result FROM job_files WHERE job_id = ?"
+        params = [job_id]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY idx LIMIT ? OFFSET ?"
+        params += [limit, offset]
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {
+                "index": index, "filename": filename, "status": file_status, "resume_id": resume_id,
+                "message": message, "error": error,
+                "result": json.loads(result) if include_results and result else None
+            }
+            for index, filename, file_status, resume_id, message, error, result in rows
+        ]
+
+    def heartbeat(self) -> None:
+        """Record that this run is alive. Call more often than stale_after_seconds, or other runs interrupt its jobs."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO runs (run_id, heartbeat_at) VALUES (?, ?)", (self.run_id, now))
+            self._conn.execute("DELETE FROM runs WHERE heartbeat_at < ?", (now - self.ttl_seconds,))
+            self._conn.commit()
+
+    def interrupt_stale(self) -> None:
+        """
+        Mark running jobs whose run has sent no heartbeat for stale_after_seconds as interrupted, e.g. after a server
+        restart. Their unfinished files are failed rather than retried. Jobs of this run and of other live runs are not
+        affected, however long they wait for an LLM slot.
+        """
+        cutoff = time.time() - self.stale_after_seconds
+        orphaned = (
+            "SELECT id FROM jobs WHERE status = 'running' AND owner != ? "
+            "AND owner NOT IN (SELECT run_id FROM runs WHERE heartbeat_at >= ?)"
+        )
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_files SET status = 'failed', error = 'Job was interrupted by a server restart' "
+                f"WHERE status IN ('queued', 'processing') AND job_id IN ({orphaned})",
+                (self.run_id, cutoff)
+            )
+            self._conn.execute(
+                f"UPDATE jobs SET status = 'interrupted', finished_at = ? WHERE id IN ({orphaned})",
+                (time.time(), self.run_id, cutoff)
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> None:
+        """Delete jobs, and their file results, created more than ttl_seconds ago."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            self._conn.execute("DELETE FROM job_files WHERE job_id IN (SELECT id FROM jobs WHERE created_at < ?)", (cutoff,))
+            self._conn.execute("DELETE FROM jobs WHERE created_at < ?", (cutoff,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {"path": self.path, "jobs": statuses}
+
+
+class JobEvents:
+    """Fans out progress events of running jobs to their stream subscribers in this process."""
+
+    def __init__(self):
+        self._subscribers = {}  # job_id -> set of asyncio.Queue
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def publish(self, job_id: str, event: str, data: dict) -> None:
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait((event, data))
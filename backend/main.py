@@ -1,29 +1,64 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response, JSONResponse
 import PyPDF2
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from reportlab.lib.pagesizes import letter
+from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.colors import black
 import io
+import os
+import functools
+import contextlib
+import asyncio
 import re
 import json
-from typing import Union, List, Dict
-from pydantic import BaseModel
-from openai import OpenAI
+import mmap
+import hashlib
+import hmac
+import shutil
+import tempfile
+import threading
+import httpx
+from typing import Union, List, Dict, Optional
+from pydantic import BaseModel, ValidationError
+from openai import AsyncOpenAI, BadRequestError
 from config import Config
+from cache import TTLCache, SQLiteCache, TieredCache, ByteLRUCache, canonical_json, normalize_whitespace, stable_hash
+from workers import ProcessPool
+from extraction import iter_pdf_pages, iter_docx_text, join_chunks
+from ats_engine import analyze_keywords
+from structured_output import ENVELOPE_FIELDS, LLMCallStats, cached_prompt_tokens, complete_json, json_schema_response_format, parse_json_response, response_format_for, RETRYABLE_OUTPUT_ERRORS
+from prompt_templates import PromptRegistry, ResumeBlockCache
+from resume_parser import parse_resume_text, clean_resume_text, segment_sections, parse_sections, section_confidence
+from jobs import BulkJobStore, JobEvents, unpack_resume_zip, FILE_STATUSES
+from sessions import ResumeSessionStore, MemorySessionBackend, SQLiteSessionBackend, JsonPatchError, SessionNotFoundError, SessionConflictError
+from ranking import rank_resumes
+from skills import get_skill_canonicalizer, canonicalize_skills
+from embeddings import HashedNgramEmbedder, EmbeddingIndex, BULLET_SECTIONS, resume_items, section_bullets
+from job_descriptions import JobDescriptionRegistry, render_job_digest
+from tokens import load_encodings, get_token_counter, input_token_budget, fit_resume_text, fit_job_description, truncate_to_tokens, start_request_usage, add_request_usage
 
 # Validate configuration
 Config.validate_config()
 
+# Shared, pooled HTTP client so concurrent LLM calls reuse connections
+http_config = Config.OPENAI_HTTP
+openai_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=http_config["max_connections"],
+        max_keepalive_connections=http_config["max_keepalive_connections"]
+    ),
+    timeout=http_config["timeout"]
+)
+
 # Initialize OpenAI client
 try:
-    openai_client = OpenAI(api_key=Config.OPENAI_API_KEY)
+    openai_client = AsyncOpenAI(api_key=Config.OPENAI_API_KEY, http_client=openai_http_client)
 except Exception as e:
     print(f"Warning: OpenAI client initialization failed: {e}")
     print("Resume parsing will fall back to regex-based parsing")
@@ -31,6 +66,90 @@ except Exception as e:
 
 app = FastAPI(title="Resume Text Extractor", version="1.0.0")
 
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Reject uploads whose declared size already exceeds the limit, before the body is read."""
+    if request.url.path == "/parse-resume":
+        content_length = request.headers.get("content-length")
+        # Allow some room for the multipart envelope around the file itself
+        if content_length and content_length.isdigit() and int(content_length) > Config.UPLOAD["max_file_size"] + 64 * 1024:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"File too large. Maximum size is {Config.UPLOAD['max_file_size'] // (1024 * 1024)}MB."}
+            )
+    elif request.url.path == "/parse-resumes/jobs":
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > Config.BULK["max_upload_size"]:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"Upload too large. Maximum size is {Config.BULK['max_upload_size'] // (1024 * 1024)}MB."}
+            )
+    return await call_next(request)
+
+@app.middleware("http")
+async def report_token_usage(request: Request, call_next):
+    """Report the LLM tokens a request used in X-Tokens-In/Out/Cached headers."""
+    usage = start_request_usage()
+    response = await call_next(request)
+    if usage["calls"]:
+        response.headers["X-Tokens-In"] = str(usage["prompt_tokens"])
+        response.headers["X-Tokens-Out"] = str(usage["completion_tokens"])
+        response.headers["X-Tokens-Cached"] = str(usage["cached_tokens"])
+    return response
+
+# Parsed resumes keyed by upload hash, parsing model and prompt version
+parse_cache_config = Config.CACHE["parse"]
+parse_cache = TieredCache(
+    TTLCache(parse_cache_config["max_entries"], parse_cache_config["ttl_seconds"]),
+    SQLiteCache(
+        os.path.join(Config.UPLOAD["temp_dir"], parse_cache_config["sqlite_filename"]),
+        parse_cache_config["ttl_seconds"],
+        max_entries=parse_cache_config["sqlite_max_entries"],
+        max_bytes=parse_cache_config["sqlite_max_bytes"],
+        purge_every=parse_cache_config["sqlite_purge_every"]
+    ) if parse_cache_config["sqlite_enabled"] else None
+)
+
+# ATS analyses keyed by canonical resume + normalized job description
+ats_cache_config = Config.CACHE["ats"]
+ats_cache = TTLCache(ats_cache_config["max_entries"], ats_cache_config["ttl_seconds"])
+
+# Rendered PDF/DOCX bytes keyed by canonical resume, format and rendering config
+document_cache = ByteLRUCache(Config.CACHE["documents"]["max_bytes"])
+
+# Process pool for CPU-bound extraction and rendering
+process_pool = ProcessPool(Config.PROCESS_POOL["max_workers"])
+
+@app.on_event("startup")
+def start_process_pool():
+    process_pool.start()
+
+@app.on_event("startup")
+def load_skill_canonicalizer():
+    get_skill_canonicalizer()
+
+@app.on_event("startup")
+def start_loading_token_encodings():
+    """
+    Load tiktoken encodings in a daemon thread: the first load may download BPE files with no timeout,
+    which must not block startup or a request. Token counts are estimated until it finishes.
+    """
+    models = [Config.get_openai_config(functionality)["model"] for functionality in ("parsing", "optimization")]
+    threading.Thread(target=load_encodings, args=(models,), name="load-token-encodings", daemon=True).start()
+
+@app.on_event("shutdown")
+def shutdown_process_pool():
+    process_pool.shutdown()
+
+@app.on_event("shutdown")
+async def close_openai_http_client():
+    """Close pooled connections to the OpenAI API."""
+    await openai_http_client.aclose()
+
+@app.on_event("shutdown")
+def close_parse_cache():
+    parse_cache.close()
+
 # Pydantic models for request/response
 class Experience(BaseModel):
     position: str
@@ -101,11 +220,60 @@ class ParsedResumeResponse(BaseModel):
     success: bool
     data: ResumeData
     message: str
+    resume_id: str = ""  # Session ID; send it instead of resume_data on later calls
+    section_confidence: dict[str, float] = {}  # Local parser confidence per section (fast and hybrid modes)
+    llm_sections: list[str] = []  # Sections re-parsed by ChatGPT in hybrid mode
+
+class BulkJobFile(BaseModel):
+    index: int
+    filename: str
+    status: str  # "queued", "processing", "done" or "failed"
+    resume_id: str = ""  # Session of the parsed resume, once done
+    message: str = ""
+    error: str = ""
+    result: Optional[ParsedResumeResponse] = None  # Only with include_results=true
+
+class BulkJobResponse(BaseModel):
+    success: bool
+    job_id: str
+    mode: str
+    status: str  # "running", "completed" or "interrupted"
+    total: int
+    counts: dict[str, int]  # Files per status
+    files: list[BulkJobFile] = []
+    message: str
+
+class ResumeSessionResponse(BaseModel):
+    success: bool
+    resume_id: str
+    version: int  # Increases on every update; send as If-Match to update only if nobody else has
+    data: ResumeData
+    message: str
 
-class ATSAnalysisRequest(BaseModel):
-    resume_data: ResumeData
+class JobDescriptionRequest(BaseModel):
     job_description: str
 
+class JobDescriptionResponse(BaseModel):
+    success: bool
+    job_description_id: str  # Send as job_description_id instead of the full text
+    title: str
+    seniority: str  # "intern", "junior", "mid", "senior", "lead", "principal", "director" or "unspecified"
+    min_years_experience: Optional[int] = None
+    degree_required: bool
+    requirements: list[str]
+    responsibilities: list[str]
+    required_keywords: list[str]
+    preferred_keywords: list[str]
+    message: str
+
+class ATSAnalysisRequest(BaseModel):
+    resume_data: Optional[ResumeData] = None
+    resume_id: str = ""  # From /parse-resume or POST /resumes; used instead of resume_data
+    job_description: str = ""
+    job_description_id: str = ""  # From POST /job-descriptions; used instead of job_description
+    use_cache: bool = True  # Set to False to force a fresh analysis
+    mode: str = "full"  # "full" asks the LLM; "fast" scores locally without an LLM call
+
 class ATSScore(BaseModel):
     overall_score: int  # 0-100
     keyword_match_score: int  # 0-100
@@ -125,6 +293,12 @@ class ATSRecommendation(BaseModel):
     priority: str  # "high", "medium", "low"
     effort: str  # "easy", "moderate", "complex"
 
+class RequirementMatch(BaseModel):
+    requirement: str
+    evidence: str  # Most similar resume skill or bullet
+    source: str  # "skill", "experience", "projects" or "volunteer_experience"
+    similarity: float  # Cosine similarity of local embeddings, 0-1
+
 class ATSAnalysisResponse(BaseModel):
     success: bool
     score: ATSScore
@@ -136,21 +310,200 @@ class ATSAnalysisResponse(BaseModel):
     strengths: list[str]
     removable_words: list[str]  # Words/phrases that can be removed to improve ATS compatibility
     message: str
+    requirement_matches: list[RequirementMatch] = []  # Job requirements with similar resume evidence
+    unmatched_requirements: list[str] = []  # Job requirements with no similar skill or bullet
+
+class MultiATSAnalysisRequest(BaseModel):
+    resume_data: Optional[ResumeData] = None
+    resume_id: str = ""  # From /parse-resume or POST /resumes; used instead of resume_data
+    job_descriptions: list[str] = []
+    job_description_ids: list[str] = []  # From POST /job-descriptions; analyzed after job_descriptions
+    use_cache: bool = True
+    mode: str = "full"  # "full" asks the LLM; "fast" scores every job locally
+    prefilter: bool = False  # Score locally first and skip the LLM for clearly irrelevant jobs
+    min_keyword_score: Optional[int] = None  # Pre-filter threshold; defaults to Config
+
+class MultiATSAnalysisResult(BaseModel):
+    index: int  # Position in job_descriptions followed by job_description_ids
+    job_description_id: str
+    title: str
+    success: bool
+    skipped: bool = False  # Pre-filtered: analysis is the local score, no LLM call was made
+    analysis: Optional[ATSAnalysisResponse] = None
+    error: str = ""
+
+class MultiATSAnalysisResponse(BaseModel):
+    success: bool
+    results: list[MultiATSAnalysisResult]  # Best overall_score first; failures last
+    message: str
+
+class CandidateRankingRequest(BaseModel):
+    resumes: list[ResumeData] = []
+    resume_ids: list[str] = []  # From /parse-resume or POST /resumes; ranked together with resumes
+    job_description: str = ""
+    job_description_id: str = ""  # From POST /job-descriptions; used instead of job_description
+    top_k: Optional[int] = None  # Best first-pass candidates sent to the full ATS analysis; defaults to Config
+    mode: str = "full"  # "fast" returns the first-pass ranking without LLM calls
+    use_cache: bool = True
+
+class CandidateRankingResult(BaseModel):
+    index: int  # Position in resumes followed by resume_ids
+    resume_id: str = ""
+    name: str
+    first_pass_rank: int  # 1 = best BM25 match
+    first_pass_score: float  # 0-100, relative to the best candidate
+    success: bool = True
+    analysis: Optional[ATSAnalysisResponse] = None  # Only for the top K in full mode
+    error: str = ""
+
+class CandidateRankingResponse(BaseModel):
+    success: bool
+    job_description_id: str
+    results: list[CandidateRankingResult]  # Analyzed candidates by overall_score, then the rest by first-pass rank
+    message: str
 
 # New models for section optimization
 class SectionOptimizationRequest(BaseModel):
-    resume_data: ResumeData
-    job_description: str
+    resume_data: Optional[ResumeData] = None
+    resume_id: str = ""  # From /parse-resume or POST /resumes; used instead of resume_data
+    job_description: str = ""
+    job_description_id: str = ""  # From POST /job-descriptions; used instead of job_description
     section: str  # "summary", "experience", "skills", etc.
     section_data: dict  # The current section data
     custom_prompt: str = ""  # User's custom instructions
 
+class BulletPriority(BaseModel):
+    entry: int  # Position of the entry in the section data
+    bullet: int  # Position of the bullet in the entry's description
+    text: str
+    alignment: float  # Highest similarity to a job requirement, 0-1; lowest is rewritten first
+
 class SectionOptimizationResponse(BaseModel):
     success: bool
     optimized_section: dict
     explanation: str
     changes_made: list[str]
     message: str
+    bullet_priority: list[BulletPriority] = []  # Bullets of the original section data, least aligned with the job first
+
+class SectionBatchItem(BaseModel):
+    section_data: dict  # One item of the section, e.g. {"experience": [entry]}
+    custom_prompt: str = ""  # Overrides the batch-level custom prompt when set
+
+class SectionBatchOptimizationRequest(BaseModel):
+    resume_data: Optional[ResumeData] = None
+    resume_id: str = ""  # From /parse-resume or POST /resumes; used instead of resume_data
+    job_description: str = ""
+    job_description_id: str = ""  # From POST /job-descriptions; used instead of job_description
+    section: str
+    items: list[SectionBatchItem]
+    custom_prompt: str = ""  # Applied to every item without its own prompt
+
+class SectionBatchItemResult(BaseModel):
+    index: int
+    success: bool
+    result: Optional[SectionOptimizationResponse] = None
+    error: str = ""
+
+class SectionBatchOptimizationResponse(BaseModel):
+    success: bool
+    results: list[SectionBatchItemResult]  # Same order as the request items
+    message: str
+
+ATS_MODES = ["full", "fast"]
+
+PARSE_MODES = ["full", "fast", "hybrid"]
+
+# JSON schemas sent as response_format, generated once from the response models
+RESUME_RESPONSE_FORMAT = json_schema_response_format(ResumeData, "resume_data")
+# Semantic requirement matches and bullet priorities are computed locally and added after the call
+ATS_RESPONSE_FORMAT = json_schema_response_format(
+    ATSAnalysisResponse, "ats_analysis", exclude=ENVELOPE_FIELDS + ("requirement_matches", "unmatched_requirements")
+)
+SECTION_OPTIMIZATION_RESPONSE_FORMAT = json_schema_response_format(
+    SectionOptimizationResponse, "section_optimization", exclude=ENVELOPE_FIELDS + ("bullet_priority",)
+)
+JSON_OBJECT_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Calls, retries and repaired responses per LLM operation
+llm_stats = LLMCallStats()
+
+# Versioned prompt templates, compiled once; POST /prompts/reload picks up edits and A/B weights
+prompt_registry = PromptRegistry()
+resume_block_cache = ResumeBlockCache(Config.CACHE["resume_blocks"]["max_entries"], Config.CACHE["resume_blocks"]["ttl_seconds"])
+
+# Resumes stored under an ID so clients can reference them instead of re-sending ResumeData
+session_config = Config.SESSIONS
+resume_sessions = ResumeSessionStore(
+    SQLiteSessionBackend(
+        os.path.join(Config.UPLOAD["temp_dir"], session_config["sqlite_filename"]),
+        session_config["ttl_seconds"]
+    ) if session_config["backend"] == "sqlite" else MemorySessionBackend(session_config["max_entries"], session_config["ttl_seconds"])
+)
+# Validated ResumeData per session version, so repeated calls skip re-validation
+session_resumes = TTLCache(session_config["validated_max_entries"], session_config["ttl_seconds"])
+
+@app.on_event("shutdown")
+def close_resume_sessions():
+    resume_sessions.close()
+
+# Bulk parsing jobs: per-file results persisted in SQLite, progress fanned out to stream subscribers
+bulk_config = Config.BULK
+bulk_jobs = BulkJobStore(
+    os.path.join(Config.UPLOAD["temp_dir"], bulk_config["sqlite_filename"]),
+    bulk_config["ttl_seconds"],
+    bulk_config["stale_after_seconds"]
+)
+bulk_job_events = JobEvents()
+# LLM parses in flight across all bulk jobs, so throughput is bounded by the model rate limit
+bulk_llm_limiter = asyncio.Semaphore(bulk_config["llm_concurrency"])
+bulk_job_tasks = {}  # job_id -> running asyncio.Task, kept referenced until it finishes
+
+async def run_bulk_job_maintenance():
+    """Send this process's heartbeat, interrupt the running jobs of processes that stopped and delete expired jobs."""
+    await asyncio.to_thread(bulk_jobs.heartbeat)
+    await asyncio.to_thread(bulk_jobs.interrupt_stale)
+    await asyncio.to_thread(bulk_jobs.purge_expired)
+
+async def maintain_bulk_jobs():
+    """Run bulk job maintenance on a timer, so a long-running server keeps jobs current and bounded."""
+    while True:
+        await asyncio.sleep(bulk_config["heartbeat_seconds"])
+        try:
+            await run_bulk_job_maintenance()
+        except Exception as e:
+            print(f"Bulk job maintenance error: {e}")
+
+bulk_maintenance_task = None
+
+@app.on_event("startup")
+async def start_bulk_job_maintenance():
+    global bulk_maintenance_task
+    bulk_maintenance_task = asyncio.create_task(maintain_bulk_jobs())
+
+@app.on_event("shutdown")
+def close_bulk_jobs():
+    if bulk_maintenance_task is not None:
+        bulk_maintenance_task.cancel()
+    bulk_jobs.close()
+
+# Preprocessed job descriptions, shared by ATS and optimization calls
+job_registry = JobDescriptionRegistry(Config.CACHE["job_descriptions"]["max_entries"], Config.CACHE["job_descriptions"]["ttl_seconds"])
+
+# Local embeddings; each resume's skills and bullets are embedded once per resume hash
+embedding_config = Config.EMBEDDINGS
+embedder = HashedNgramEmbedder(embedding_config["dimensions"])
+resume_embeddings = TTLCache(embedding_config["index_cache_max_entries"], embedding_config["index_cache_ttl"])
+
+def structured_response_format(response_format: Optional[dict]) -> Optional[dict]:
+    """The response_format to request, or None when structured outputs are turned off."""
+    return response_format if Config.STRUCTURED_OUTPUT["enabled"] else None
+
+VALID_SECTIONS = [
+    "summary", "experience", "skills", "education", "projects", 
+    "publications", "certifications", "volunteer_experience", 
+    "awards", "languages", "references"
+]
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -159,32 +512,285 @@ app.add_middleware(
     allow_credentials=Config.CORS["allow_credentials"],
     allow_methods=Config.CORS["allow_methods"],
     allow_headers=Config.CORS["allow_headers"],
+    expose_headers=Config.CORS["expose_headers"],
 )
 
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file content."""
+PDF_PAGE_SIZES = {
+    "letter": letter,
+    "a4": A4
+}
+
+def fit_prompt(openai_config: dict, operation: str, build_messages, text: str, fit) -> list[dict]:
+    """
+    Build chat messages with text fitted into the prompt token budget of openai_config.
+    The fixed part of the prompt is measured with empty text and the rest of the budget goes to text,
+    trimmed by fit(text, budget, count). Raises 413 when even the fixed part is over budget, instead of
+    making a call that would fail.
+    """
+    counter = get_token_counter(openai_config["model"])
+    available = input_token_budget(openai_config) - counter.count_messages(build_messages(""))
+    if available <= 0:
+        raise HTTPException(status_code=413, detail="Request is too large for the model's context window. Please shorten the resume or job description.")
+    fitted = fit(text, available, counter.count)
+    if fitted != text:
+        llm_stats.record(operation, "truncated")
+        print(f"Trimmed {operation} input to fit a budget of {available} tokens")
+    messages = build_messages(fitted)
+    add_request_usage(estimated_prompt_tokens=counter.count_messages(messages))
+    return messages
+
+def session_resume(resume_id: str, record: Optional[dict]) -> ResumeData:
+    """The ResumeData of a stored session record, validated once per session version; 404 when the session is missing."""
+    if record is None:
+        raise HTTPException(status_code=404, detail="Resume not found or expired. Please upload it again.")
+    cache_key = f"{resume_id}:{record['version']}"
+    resume = session_resumes.get(cache_key)
+    if resume is None:
+        resume = ResumeData.model_validate(record["resume"])
+        session_resumes.set(cache_key, resume)
+    return resume
+
+async def resolve_resume(resume_data: Optional[ResumeData], resume_id: str) -> ResumeData:
+    """
+    Return the request's resume: the stored session for resume_id, otherwise the resume_data sent inline.
+    The session store may be SQLite, so the lookup runs in a thread.
+    """
+    if resume_id:
+        return session_resume(resume_id, await asyncio.to_thread(resume_sessions.get, resume_id))
+    if resume_data is None:
+        raise HTTPException(status_code=400, detail="Resume data is required")
+    return resume_data
+
+async def resolve_resumes(resume_ids: list[str]) -> list[ResumeData]:
+    """The stored resumes of several sessions, looked up together in one thread call."""
+    if not resume_ids:
+        return []
+    records = await asyncio.to_thread(resume_sessions.get_many, resume_ids)
+    return [session_resume(resume_id, record) for resume_id, record in zip(resume_ids, records)]
+
+def resolve_job_description(job_description: str, job_description_id: str) -> tuple[str, dict]:
+    """
+    Return (job description text for prompts, digest) for a request.
+    A registered ID is sent to prompts as its compact digest; raw text is sent as is, and its digest
+    comes from the same registry so keyword extraction still runs once per posting.
+    """
+    if job_description_id:
+        digest = job_registry.get(job_description_id)
+        if digest is None:
+            raise HTTPException(status_code=404, detail="Job description not found or expired. Please register it again.")
+        return render_job_digest(digest), digest
+    if not job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+    return job_description, job_registry.register(job_description)
+
+def parse_cache_key(file_digest: str, mode: str = "full", prompt_version: str = "") -> str:
+    """Build the parse cache key from the upload's SHA-256 and the parser settings and prompt template fingerprint for the mode."""
+    parsing_config = Config.get_openai_config("parsing")
+    if mode == "fast":
+        return f"local:{parsing_config['local_parser_version']}:{file_digest}"
+    template_fingerprint = prompt_registry.fingerprint(prompt_version or None)
+    if mode == "hybrid":
+        return f"hybrid:{parsing_config['model']}:{template_fingerprint}:{parsing_config['local_parser_version']}:{file_digest}"
+    return f"{parsing_config['model']}:{template_fingerprint}:{file_digest}"
+
+def resume_hash(resume: dict) -> str:
+    """Hash of the canonical JSON of a ResumeData dict."""
+    return stable_hash(canonical_json(resume))
+
+def ats_cache_key(resume_data: ResumeData, job_description: str, resume_key: Optional[str] = None) -> str:
+    """Build the ATS cache key from the resume hash, normalized job description, model and prompt template version."""
+    openai_config = Config.get_openai_config("optimization")
+    if resume_key is None:
+        resume_key = ats_resume_context(resume_data)[1]
+    return stable_hash(
+        openai_config["model"],
+        prompt_registry.fingerprint(prompt_registry.select_version(resume_key)),
+        resume_key,
+        normalize_whitespace(job_description)
+    )
+
+def document_cache_key(resume_data: ResumeData, output_format: str) -> str:
+    """Build the rendered-document cache key from the canonical resume JSON, output format and rendering config."""
+    rendering_config = Config.PDF_GENERATION if output_format == "pdf" else Config.DOCX_GENERATION
+    return stable_hash(
+        output_format,
+        canonical_json(rendering_config),
+        canonical_json(resume_data.model_dump())
+    )
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def extract_text_from_pdf(file_content: Union[bytes, str]) -> str:
+    """Extract text from PDF file content, given as bytes or a path to a spilled upload."""
+    extraction_config = Config.EXTRACTION
     try:
+        if isinstance(file_content, str):
+            with open(file_content, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                pdf_reader = PyPDF2.PdfReader(mapped)
+                return join_chunks(iter_pdf_pages(pdf_reader, extraction_config["max_pages"]), extraction_config["max_chars"])
         pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        return join_chunks(iter_pdf_pages(pdf_reader, extraction_config["max_pages"]), extraction_config["max_chars"])
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error extracting text from PDF: {str(e)}")
 
-def extract_text_from_docx(file_content: bytes) -> str:
-    """Extract text from DOCX file content."""
+def extract_text_from_docx(file_content: Union[bytes, str]) -> str:
+    """Extract text from DOCX file content, given as bytes or a path to a spilled upload."""
     try:
-        doc = Document(io.BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+        source = file_content if isinstance(file_content, str) else io.BytesIO(file_content)
+        return join_chunks(iter_docx_text(source), Config.EXTRACTION["max_chars"])
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error extracting text from DOCX: {str(e)}")
 
-def parse_resume_with_chatgpt(text: str) -> ResumeData:
-    """Parse extracted text into structured resume data using ChatGPT."""
+async def read_upload(file: UploadFile, suffix: str = "") -> tuple[Union[bytes, str], str]:
+    """
+    Read an upload in chunks, enforcing Config.UPLOAD["max_file_size"] and hashing as it goes.
+    Returns (content, sha256 hex digest). Content is bytes for small files; larger files are
+    spilled to a temp file under Config.UPLOAD["temp_dir"] and returned as its path, which the
+    caller must remove with discard_upload.
+    """
+    upload_config = Config.UPLOAD
+    digest = hashlib.sha256()
+    size = 0
+    buffer = io.BytesIO()
+    spill_file = None
+    
+    try:
+        while True:
+            chunk = await file.read(upload_config["chunk_size"])
+            if not chunk:
+                break
+            
+            size += len(chunk)
+            if size > upload_config["max_file_size"]:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size is {upload_config['max_file_size'] // (1024 * 1024)}MB."
+                )
+            digest.update(chunk)
+            
+            if spill_file is None and size > upload_config["spill_threshold"]:
+                os.makedirs(upload_config["temp_dir"], exist_ok=True)
+                spill_file = tempfile.NamedTemporaryFile(dir=upload_config["temp_dir"], suffix=suffix, delete=False)
+                spill_file.write(buffer.getvalue())
+                buffer = None
+            
+            if spill_file is not None:
+                spill_file.write(chunk)
+            else:
+                buffer.write(chunk)
+    except BaseException:
+        if spill_file is not None:
+            spill_file.close()
+            os.remove(spill_file.name)
+        raise
+    
+    if spill_file is not None:
+        spill_file.close()
+        return spill_file.name, digest.hexdigest()
+    return buffer.getvalue(), digest.hexdigest()
+
+def discard_upload(file_content: Union[bytes, str]) -> None:
+    """Remove the temp file backing a spilled upload, if any."""
+    if isinstance(file_content, str) and os.path.exists(file_content):
+        os.remove(file_content)
+
+def build_resume_data(parsed_data: dict) -> ResumeData:
+    """Convert a parsed resume dict (from the LLM or the local parser) into structured models."""
+    experience_list = []
+    for exp in parsed_data.get("experience", []):
+        experience_list.append(Experience(
+            position=exp.get("position", ""),
+            company=exp.get("company", ""),
+            duration=exp.get("duration", ""),
+            description=exp.get("description", [])
+        ))
+    
+    education_list = []
+    for edu in parsed_data.get("education", []):
+        education_list.append(Education(
+            degree=edu.get("degree", ""),
+            institution=edu.get("institution", ""),
+            year=edu.get("year", ""),
+            gpa=edu.get("gpa", ""),
+            relevant_coursework=edu.get("relevant_coursework", "")
+        ))
+    
+    projects_list = []
+    for proj in parsed_data.get("projects", []):
+        projects_list.append(Project(
+            name=proj.get("name", ""),
+            description=proj.get("description", []),
+            technologies=proj.get("technologies", ""),
+            url=proj.get("url", ""),
+            duration=proj.get("duration", "")
+        ))
+    
+    publications_list = []
+    for pub in parsed_data.get("publications", []):
+        publications_list.append(Publication(
+            title=pub.get("title", ""),
+            journal=pub.get("journal", ""),
+            year=pub.get("year", ""),
+            authors=pub.get("authors", ""),
+            url=pub.get("url", "")
+        ))
+    
+    certifications_list = []
+    for cert in parsed_data.get("certifications", []):
+        certifications_list.append(Certification(
+            name=cert.get("name", ""),
+            issuer=cert.get("issuer", ""),
+            year=cert.get("year", ""),
+            expiry=cert.get("expiry", "")
+        ))
+    
+    volunteer_list = []
+    for vol in parsed_data.get("volunteer_experience", []):
+        volunteer_list.append(VolunteerExperience(
+            position=vol.get("position", ""),
+            organization=vol.get("organization", ""),
+            duration=vol.get("duration", ""),
+            description=vol.get("description", [])
+        ))
+    
+    references_list = []
+    for ref in parsed_data.get("references", []):
+        references_list.append(Reference(
+            name=ref.get("name", ""),
+            title=ref.get("title", ""),
+            company=ref.get("company", ""),
+            contact=ref.get("contact", "")
+        ))
+    
+    # Validate and create ResumeData object
+    return ResumeData(
+        name=parsed_data.get("name", "Resume Owner"),
+        email=parsed_data.get("email", ""),
+        phone=parsed_data.get("phone", ""),
+        location=parsed_data.get("location", ""),
+        summary=parsed_data.get("summary", "Professional with relevant experience and skills."),
+        github_profile=parsed_data.get("github_profile", ""),
+        linkedin_profile=parsed_data.get("linkedin_profile", ""),
+        website=parsed_data.get("website", ""),
+        experience=experience_list,
+        education=education_list,
+        skills=canonicalize_skills(parsed_data.get("skills", [])),
+        publications=publications_list,
+        projects=projects_list,
+        certifications=certifications_list,
+        languages=parsed_data.get("languages", []),
+        volunteer_experience=volunteer_list,
+        awards=parsed_data.get("awards", []),
+        references=references_list
+    )
+
+async def parse_resume_with_chatgpt(text: str, prompt_version: Optional[str] = None) -> ResumeData:
+    """Parse extracted text into structured resume data using ChatGPT, with the given prompt template version."""
     try:
         # Check if OpenAI client is available
         if openai_client is None:
@@ -193,223 +799,36 @@ def parse_resume_with_chatgpt(text: str) -> ResumeData:
         # Get OpenAI configuration for resume parsing
         openai_config = Config.get_openai_config("parsing")
         
-        # Create the prompt for ChatGPT
-        prompt = f"""
-        Parse the following resume text and extract ALL available information into a JSON format. 
-        Be thorough and accurate in your extraction. If information is not available, use empty strings or empty arrays.
-
-        Required JSON structure:
-        {{
-            "name": "Full name of the person",
-            "email": "Email address",
-            "phone": "Phone number",
-            "location": "City, State/Country (if mentioned)",
-            "summary": "Professional summary or objective (create a concise summary from the content if not explicitly stated)",
-            "github_profile": "GitHub profile URL or username",
-            "linkedin_profile": "LinkedIn profile URL",
-            "website": "Personal website or portfolio URL",
-            "experience": [
-                {{
-                    "position": "Job title",
-                    "company": "Company name",
-                    "duration": "Employment duration (e.g., '2020-2023' or 'Jan 2020 - Present')",
-                    "description": ["Bullet point 1", "Bullet point 2", "Bullet point 3", "Additional bullet points as needed"]
-                }}
-            ],
-            "education": [
-                {{
-                    "degree": "Degree type and field",
-                    "institution": "School/University name",
-                    "year": "Graduation year",
-                    "gpa": "GPA if mentioned",
-                    "relevant_coursework": "Notable coursework if mentioned"
-                }}
-            ],
-            "projects": [
-                {{
-                    "name": "Project name",
-                    "description": ["Bullet point 1", "Bullet point 2", "Additional bullet points as needed"],
-                    "technologies": "Technologies used",
-                    "url": "Project URL if mentioned",
-                    "duration": "Project duration if mentioned"
-                }}
+        # The template keeps the static instructions first as a cacheable prefix; the resume text goes last
+        # and is trimmed by section priority if the prompt would exceed its token budget
+        messages = fit_prompt(
+            openai_config,
+            "parsing",
+            lambda resume_text: [
+                {"role": "system", "content": prompt_registry.render("resume_parsing_system", prompt_version)},
+                {"role": "user", "content": prompt_registry.render("resume_parsing", prompt_version, resume_text=resume_text)}
             ],
-            "publications": [
-                {{
-                    "title": "Publication title",
-                    "journal": "Journal or conference name",
-                    "year": "Publication year",
-                    "authors": "Authors (include the person if they are an author)",
-                    "url": "Publication URL if mentioned"
-                }}
-            ],
-            "certifications": [
-                {{
-                    "name": "Certification name",
-                    "issuer": "Certifying organization",
-                    "year": "Year obtained",
-                    "expiry": "Expiry date if mentioned"
-                }}
-            ],
-            "volunteer_experience": [
-                {{
-                    "position": "Volunteer position",
-                    "organization": "Organization name",
-                    "duration": "Duration of volunteer work",
-                    "description": ["Bullet point 1", "Bullet point 2", "Additional bullet points as needed"]
-                }}
-            ],
-            "awards": ["List of awards, honors, or recognitions"],
-            "languages": ["List of languages and proficiency levels"],
-            "references": [
-                {{
-                    "name": "Reference name",
-                    "title": "Reference title/position",
-                    "company": "Reference company",
-                    "contact": "Contact information if provided"
-                }}
-            ],
-            "skills": ["List of technical and professional skills"]
-        }}
-
-        Resume text:
-        {text}
-
-        IMPORTANT FORMATTING RULES:
-        1. For experience descriptions: ALWAYS break down the job description into AT LEAST 3 separate bullet points as an array. Even if the original text is a single paragraph, analyze the content and create 3+ logical bullet points that capture different aspects of the role (e.g., responsibilities, achievements, technologies used, impact, etc.).
-        2. For projects and volunteer_experience descriptions: Break down descriptions into arrays with at least 2-3 bullet points per project/volunteer role.
-        3. Each bullet point should be a complete, meaningful statement that stands alone.
-        4. Preserve the original meaning and content while making it more readable and structured.
-        5. Use arrays for description fields instead of newline-separated strings.
-
-        IMPORTANT: Extract ALL information that is present. Look for:
-        - Social media profiles (GitHub, LinkedIn, Twitter, etc.)
-        - Personal websites or portfolios
-        - Location information
-        - Projects with descriptions and technologies
-        - Publications, papers, or research
-        - Certifications and licenses
-        - Volunteer work
-        - Awards and honors
-        - Languages spoken
-        - References
-        - Any other relevant professional information
-
-        Return only the JSON object, no additional text or formatting.
-        """
-
-        # Call OpenAI API
-        response = openai_client.chat.completions.create(
+            text,
+            fit_resume_text
+        )
+
+        # Call OpenAI API; invalid JSON is repaired or retried
+        resume_data, _ = await complete_json(
+            openai_client,
+            "parsing",
+            build_resume_data,
+            llm_stats,
+            Config.STRUCTURED_OUTPUT["max_retries"],
+            response_format=structured_response_format(RESUME_RESPONSE_FORMAT),
             model=openai_config["model"],
-            messages=[
-                {"role": "system", "content": "You are an expert resume parser. Extract information accurately and return only valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             max_tokens=openai_config["max_tokens"],
             temperature=openai_config["temperature"]
         )
-
-        # Extract the response content
-        response_text = response.choices[0].message.content.strip()
-        
-        # Clean up the response (remove any markdown formatting)
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        # Parse the JSON response
-        parsed_data = json.loads(response_text)
-        
-        # Convert parsed data to structured models
-        experience_list = []
-        for exp in parsed_data.get("experience", []):
-            experience_list.append(Experience(
-                position=exp.get("position", ""),
-                company=exp.get("company", ""),
-                duration=exp.get("duration", ""),
-                description=exp.get("description", [])
-            ))
-        
-        education_list = []
-        for edu in parsed_data.get("education", []):
-            education_list.append(Education(
-                degree=edu.get("degree", ""),
-                institution=edu.get("institution", ""),
-                year=edu.get("year", ""),
-                gpa=edu.get("gpa", ""),
-                relevant_coursework=edu.get("relevant_coursework", "")
-            ))
-        
-        projects_list = []
-        for proj in parsed_data.get("projects", []):
-            projects_list.append(Project(
-                name=proj.get("name", ""),
-                description=proj.get("description", []),
-                technologies=proj.get("technologies", ""),
-                url=proj.get("url", ""),
-                duration=proj.get("duration", "")
-            ))
-        
-        publications_list = []
-        for pub in parsed_data.get("publications", []):
-            publications_list.append(Publication(
-                title=pub.get("title", ""),
-                journal=pub.get("journal", ""),
-                year=pub.get("year", ""),
-                authors=pub.get("authors", ""),
-                url=pub.get("url", "")
-            ))
-        
-        certifications_list = []
-        for cert in parsed_data.get("certifications", []):
-            certifications_list.append(Certification(
-                name=cert.get("name", ""),
-                issuer=cert.get("issuer", ""),
-                year=cert.get("year", ""),
-                expiry=cert.get("expiry", "")
-            ))
-        
-        volunteer_list = []
-        for vol in parsed_data.get("volunteer_experience", []):
-            volunteer_list.append(VolunteerExperience(
-                position=vol.get("position", ""),
-                organization=vol.get("organization", ""),
-                duration=vol.get("duration", ""),
-                description=vol.get("description", [])
-            ))
-        
-        references_list = []
-        for ref in parsed_data.get("references", []):
-            references_list.append(Reference(
-                name=ref.get("name", ""),
-                title=ref.get("title", ""),
-                company=ref.get("company", ""),
-                contact=ref.get("contact", "")
-            ))
-        
-        # Validate and create ResumeData object
-        return ResumeData(
-            name=parsed_data.get("name", "Resume Owner"),
-            email=parsed_data.get("email", ""),
-            phone=parsed_data.get("phone", ""),
-            location=parsed_data.get("location", ""),
-            summary=parsed_data.get("summary", "Professional with relevant experience and skills."),
-            github_profile=parsed_data.get("github_profile", ""),
-            linkedin_profile=parsed_data.get("linkedin_profile", ""),
-            website=parsed_data.get("website", ""),
-            experience=experience_list,
-            education=education_list,
-            skills=parsed_data.get("skills", []),
-            publications=publications_list,
-            projects=projects_list,
-            certifications=certifications_list,
-            languages=parsed_data.get("languages", []),
-            volunteer_experience=volunteer_list,
-            awards=parsed_data.get("awards", []),
-            references=references_list
-        )
+        return resume_data
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         print(f"JSON parsing error: {e}")
         raise HTTPException(status_code=500, detail="Failed to parse resume with ChatGPT. Please ensure your resume is well-formatted and try again.")
@@ -417,9 +836,356 @@ def parse_resume_with_chatgpt(text: str) -> ResumeData:
         print(f"ChatGPT parsing error: {e}")
         raise HTTPException(status_code=500, detail="Failed to parse resume with ChatGPT. Please check your OpenAI API key and try again.")
 
+SECTION_CONTACT_FIELDS = ["name", "email", "phone", "location", "github_profile", "linkedin_profile", "website"]
+
+# JSON shape and formatting rules for each section hybrid parsing can send to ChatGPT on its own
+SECTION_PARSE_SCHEMAS = {
+    "contact": (
+        '{"name": "Full name", "email": "Email address", "phone": "Phone number", "location": "City, State/Country", '
+        '"github_profile": "GitHub URL or username", "linkedin_profile": "LinkedIn URL", "website": "Personal website URL"}',
+        ""
+    ),
+    "summary": ('{"summary": "Professional summary or objective"}', ""),
+    "experience": (
+        '{"experience": [{"position": "Job title", "company": "Company name", "duration": "Employment duration", '
+        '"description": ["Bullet point 1", "Bullet point 2", "Bullet point 3"]}]}',
+        "Break each job description into AT LEAST 3 separate, self-contained bullet points, preserving the original meaning."
+    ),
+    "education": (
+        '{"education": [{"degree": "Degree type and field", "institution": "School name", "year": "Graduation year", '
+        '"gpa": "GPA if mentioned", "relevant_coursework": "Coursework if mentioned"}]}',
+        ""
+    ),
+    "skills": ('{"skills": ["Skill 1", "Skill 2"]}', ""),
+    "projects": (
+        '{"projects": [{"name": "Project name", "description": ["Bullet point 1", "Bullet point 2"], '
+        '"technologies": "Technologies used", "url": "Project URL", "duration": "Project duration"}]}',
+        "Break each project description into 2-3 bullet points."
+    ),
+    "publications": (
+        '{"publications": [{"title": "Title", "journal": "Journal or conference", "year": "Year", '
+        '"authors": "Authors", "url": "URL"}]}',
+        ""
+    ),
+    "certifications": (
+        '{"certifications": [{"name": "Certification name", "issuer": "Issuer", "year": "Year obtained", "expiry": "Expiry"}]}',
+        ""
+    ),
+    "volunteer_experience": (
+        '{"volunteer_experience": [{"position": "Role", "organization": "Organization", "duration": "Duration", '
+        '"description": ["Bullet point 1", "Bullet point 2"]}]}',
+        "Break each description into 2-3 bullet points."
+    ),
+    "awards": ('{"awards": ["Award 1"]}', ""),
+    "languages": ('{"languages": ["Language and proficiency"]}', ""),
+    "references": (
+        '{"references": [{"name": "Name", "title": "Title", "company": "Company", "contact": "Contact information"}]}',
+        ""
+    )
+}
 
-def analyze_resume_with_ats(resume_data: ResumeData, job_description: str) -> ATSAnalysisResponse:
+async def parse_section_with_chatgpt(section: str, section_text: str, prompt_version: Optional[str] = None, llm_limiter: Optional[asyncio.Semaphore] = None) -> dict:
+    """
+    Parse one resume section with a small, section-specific prompt. Returns the JSON object ChatGPT produced.
+    The call waits on llm_limiter when one is given, so each section takes its own slot.
+    """
+    openai_config = Config.get_openai_config("parsing")
+    schema, rules = SECTION_PARSE_SCHEMAS[section]
+    messages = fit_prompt(
+        openai_config,
+        "section_parsing",
+        lambda text: [
+            {"role": "system", "content": prompt_registry.render("resume_parsing_system", prompt_version)},
+            {"role": "user", "content": prompt_registry.render("section_parsing", prompt_version, rules=rules, schema=schema, section_text=text)}
+        ],
+        section_text,
+        truncate_to_tokens
+    )
+    async with llm_limiter or contextlib.nullcontext():
+        parsed_section, _ = await complete_json(
+            openai_client,
+            "section_parsing",
+            lambda data: data,
+            llm_stats,
+            Config.STRUCTURED_OUTPUT["max_retries"],
+            response_format=structured_response_format(JSON_OBJECT_RESPONSE_FORMAT),
+            model=openai_config["model"],
+            messages=messages,
+            max_tokens=openai_config["max_tokens"],
+            temperature=openai_config["temperature"]
+        )
+    return parsed_section
+
+async def parse_resume_hybrid(extracted_text: str, prompt_version: Optional[str] = None, llm_limiter: Optional[asyncio.Semaphore] = None) -> ParsedResumeResponse:
+    """
+    Parse with the local segmenter and send only the sections below the confidence threshold to ChatGPT,
+    one small prompt per section, concurrently. Sections whose LLM call fails keep their local result.
+    Each section call waits on llm_limiter when one is given.
+    """
+    sections = segment_sections(extracted_text)
+    parsed_data = parse_sections(sections)
+    confidence = section_confidence(sections, parsed_data)
+    threshold = Config.RESUME_PARSING["hybrid_confidence_threshold"]
+    low_confidence = [section for section, score in confidence.items() if score < threshold]
+    
+    llm_sections = []
+    if openai_client is not None and low_confidence:
+        section_texts = {
+            section: "\n".join(sections["header" if section == "contact" else section])
+            for section in low_confidence
+        }
+        results = await asyncio.gather(
+            *(parse_section_with_chatgpt(section, section_texts[section], prompt_version, llm_limiter) for section in low_confidence),
+            return_exceptions=True
+        )
+        for section, result in zip(low_confidence, results):
+            if isinstance(result, Exception) or not isinstance(result, dict):
+                print(f"ChatGPT section parsing error ({section}): {result}")
+                continue
+            if section == "contact":
+                parsed_data.update({key: value for key, value in result.items() if key in SECTION_CONTACT_FIELDS and value})
+            elif section in result:
+                parsed_data[section] = result[section]
+            llm_sections.append(section)
+    
+    if llm_sections:
+        message = f"Resume parsed successfully (hybrid: {', '.join(llm_sections)} parsed by ChatGPT)"
+    elif low_confidence:
+        message = "Resume parsed locally; AI parsing is currently unavailable"
+    else:
+        message = "Resume parsed locally (hybrid: all sections above the confidence threshold)"
+    return ParsedResumeResponse(
+        success=True,
+        data=build_resume_data(parsed_data),
+        message=message,
+        section_confidence=confidence,
+        llm_sections=llm_sections
+    )
+
+
+def ats_resume_dict(resume_data: ResumeData) -> dict:
+    """The resume as a dict with canonical skill names, so aliases ("JS", "Javascript") match and hash alike."""
+    resume = resume_data.model_dump()
+    resume["skills"] = canonicalize_skills(resume["skills"])
+    return resume
+
+def ats_resume_context(resume_data: ResumeData) -> tuple[dict, str]:
+    """The resume as a dict (see ats_resume_dict) and its hash, computed once and shared by every ATS prompt of a request."""
+    resume = ats_resume_dict(resume_data)
+    return resume, resume_hash(resume)
+
+def ats_keyword_analysis(resume: dict, job_description: str, job_digest: Optional[dict] = None) -> dict:
+    """Local keyword analysis; with the job description's digest, its preprocessed keywords are reused."""
+    # Keywords come from the full job description, even if the prompt only gets a trimmed copy or the digest
+    if job_digest is not None:
+        return analyze_keywords(resume, job_digest["text"], keywords=job_digest["keywords"])
+    return analyze_keywords(resume, job_description)
+
+def job_requirement_lines(job_digest: dict) -> list[str]:
+    """The lines resume evidence is matched against: requirements, or responsibilities if none were found."""
+    return job_digest["requirements"] or job_digest["responsibilities"]
+
+def resume_embedding_index(resume_context: tuple[dict, str]) -> EmbeddingIndex:
+    resume, resume_key = resume_context
+    index = resume_embeddings.get(resume_key)
+    if index is None:
+        index = EmbeddingIndex(embedder, resume_items(resume))
+        resume_embeddings.set(resume_key, index)
+    return index
+
+def add_requirement_matches(analysis: ATSAnalysisResponse, resume_context: tuple[dict, str], job_digest: dict) -> ATSAnalysisResponse:
+    """Fill in which job requirements have similar resume skills or bullets, by local embedding similarity."""
+    requirements = job_requirement_lines(job_digest)
+    min_similarity = embedding_config["min_similarity"]
+    matches = []
+    unmatched = []
+    for requirement, best in zip(requirements, resume_embedding_index(resume_context).search(requirements, k=1)):
+        if best and best[0][1] >= min_similarity:
+            item, similarity = best[0]
+            matches.append(RequirementMatch(requirement=requirement, evidence=item["text"], source=item["kind"], similarity=round(similarity, 3)))
+        else:
+            unmatched.append(requirement)
+    analysis.requirement_matches = matches
+    analysis.unmatched_requirements = unmatched
+    return analysis
+
+def bullet_rewrite_priority(section: str, section_data: dict, job_digest: Optional[dict]) -> list[BulletPriority]:
+    """Bullets of the section data ordered by how little they resemble any job requirement, least aligned first."""
+    if job_digest is None or section not in BULLET_SECTIONS:
+        return []
+    bullets = section_bullets(section_data.get(section, []), section)
+    requirements = job_requirement_lines(job_digest)
+    if not bullets or not requirements:
+        return []
+    alignment = EmbeddingIndex(embedder, bullets).best_similarity(requirements)
+    return [
+        BulletPriority(entry=bullet["entry"], bullet=bullet["bullet"], text=bullet["text"], alignment=round(float(score), 3))
+        for bullet, score in sorted(zip(bullets, alignment), key=lambda pair: pair[1])
+    ]
+
+def build_ats_messages(resume_data: ResumeData, job_description: str, job_digest: Optional[dict] = None, resume_context: Optional[tuple[dict, str]] = None, keyword_analysis: Optional[dict] = None) -> list[dict]:
+    """
+    Build the chat messages for an ATS analysis of the resume against the job description.
+    resume_context (from ats_resume_context) and keyword_analysis can be passed in when already computed.
+    """
+    resume, resume_key = resume_context or ats_resume_context(resume_data)
+    prompt_version = prompt_registry.select_version(resume_key)
+    if keyword_analysis is None:
+        keyword_analysis = ats_keyword_analysis(resume, job_description, job_digest)
+    blocks = resume_block_cache.get(resume_key, resume, prompt_registry.fingerprint(prompt_version))
+    
+    # The template keeps the static instructions first as a cacheable prefix; the resume and job description go last
+    return fit_prompt(
+        Config.get_openai_config("optimization"),
+        "ats_analysis",
+        lambda job_description_text: [
+            {"role": "system", "content": prompt_registry.render("ats_analysis_system", prompt_version)},
+            {"role": "user", "content": prompt_registry.render(
+                "ats_analysis",
+                prompt_version,
+                **blocks,
+                job_description=job_description_text,
+                matched_keywords=", ".join(keyword_analysis["matched_keywords"]) or "none",
+                missing_keywords=", ".join(keyword_analysis["missing_keywords"]) or "none",
+                missing_required_keywords=", ".join(keyword_analysis["missing_required_keywords"]) or "none",
+                keyword_match_score=keyword_analysis["keyword_match_score"] if keyword_analysis["has_keywords"] else "n/a (no known keywords in the job description)"
+            )}
+        ],
+        job_description,
+        fit_job_description
+    )
+
+
+def build_ats_analysis(parsed_data: dict) -> ATSAnalysisResponse:
+    """
+    Convert the model's parsed JSON into an ATSAnalysisResponse.
+    Missing lists and text fields default to empty; a missing score raises KeyError so the call is retried.
+    """
+    score_data = parsed_data["score"]
+    overall_score = score_data["overall_score"]
+    
+    # Create response objects
+    score = ATSScore(
+        overall_score=overall_score,
+        keyword_match_score=score_data.get("keyword_match_score", overall_score),
+        experience_relevance=score_data.get("experience_relevance", overall_score),
+        education_fit=score_data.get("education_fit", overall_score),
+        skills_alignment=score_data.get("skills_alignment", overall_score)
+    )
+    
+    insights = [
+        ATSInsight(
+            category=insight.get("category", ""),
+            title=insight.get("title", ""),
+            description=insight.get("description", ""),
+            impact=insight.get("impact", "medium")
+        ) for insight in parsed_data.get("insights", [])
+    ]
+    
+    recommendations = [
+        ATSRecommendation(
+            title=rec.get("title", ""),
+            description=rec.get("description", ""),
+            priority=rec.get("priority", "medium"),
+            effort=rec.get("effort", "medium")
+        ) for rec in parsed_data.get("recommendations", [])
+    ]
+    
+    return ATSAnalysisResponse(
+        success=True,
+        score=score,
+        insights=insights,
+        recommendations=recommendations,
+        matched_keywords=parsed_data.get("matched_keywords", []),
+        missing_keywords=parsed_data.get("missing_keywords", []),
+        experience_gaps=parsed_data.get("experience_gaps", []),
+        strengths=parsed_data.get("strengths", []),
+        removable_words=parsed_data.get("removable_words", []),
+        message="ATS analysis completed successfully"
+    )
+
+
+def build_local_ats_analysis(resume_data: ResumeData, job_description: str, job_digest: Optional[dict] = None, analysis: Optional[dict] = None, resume_context: Optional[tuple[dict, str]] = None) -> ATSAnalysisResponse:
+    """Score the resume against the job description with the local keyword engine and embeddings, without an LLM call."""
+    resume_context = resume_context or ats_resume_context(resume_data)
+    if analysis is None:
+        analysis = ats_keyword_analysis(resume_context[0], job_description, job_digest)
+    matched = analysis["matched_keywords"]
+    missing = analysis["missing_keywords"]
+    missing_required = analysis["missing_required_keywords"]
+    
+    insights = []
+    if not analysis["has_keywords"]:
+        insights.append(ATSInsight(
+            category="suggestion",
+            title="No Keywords Recognized",
+            description="No known skills or technical terms were found in the job description, so the keyword scores are not meaningful; use full mode for an assessment",
+            impact="medium"
+        ))
+    if matched:
+        insights.append(ATSInsight(
+            category="strength",
+            title="Matching Keywords",
+            description=f"Resume mentions {len(matched)} of {len(matched) + len(missing)} job keywords, including {', '.join(matched[:5])}",
+            impact="high" if analysis["keyword_match_score"] >= 70 else "medium"
+        ))
+    if missing_required:
+        insights.append(ATSInsight(
+            category="weakness",
+            title="Missing Required Keywords",
+            description=f"Required keywords not found: {', '.join(missing_required)}",
+            impact="high"
+        ))
+    
+    recommendations = []
+    if missing:
+        recommendations.append(ATSRecommendation(
+            title="Add Missing Keywords",
+            description=f"Where truthful, mention: {', '.join(missing[:10])}",
+            priority="high" if missing_required else "medium",
+            effort="easy"
+        ))
+    if analysis["removable_words"]:
+        recommendations.append(ATSRecommendation(
+            title="Remove Filler Phrases",
+            description=f"Replace generic phrases with concrete achievements: {', '.join(analysis['removable_words'])}",
+            priority="low",
+            effort="easy"
+        ))
+    
+    response = ATSAnalysisResponse(
+        success=True,
+        score=ATSScore(
+            overall_score=analysis["overall_score"],
+            keyword_match_score=analysis["keyword_match_score"],
+            experience_relevance=analysis["experience_relevance"],
+            education_fit=analysis["education_fit"],
+            skills_alignment=analysis["skills_alignment"]
+        ),
+        insights=insights,
+        recommendations=recommendations,
+        matched_keywords=matched,
+        missing_keywords=missing,
+        experience_gaps=missing_required,
+        strengths=[f"Mentions {keyword}" for keyword in matched[:5]],
+        removable_words=analysis["removable_words"],
+        message="ATS analysis completed locally (fast mode)"
+    )
+    if job_digest is not None:
+        add_requirement_matches(response, resume_context, job_digest)
+    return response
+
+
+async def analyze_resume_with_ats(resume_data: ResumeData, job_description: str, use_cache: bool = True, job_digest: Optional[dict] = None, resume_context: Optional[tuple[dict, str]] = None, keyword_analysis: Optional[dict] = None) -> ATSAnalysisResponse:
     """Analyze resume against job description using ChatGPT to simulate ATS analysis."""
+    resume_key = resume_context[1] if resume_context is not None else None
+    cache_key = ats_cache_key(resume_data, job_description, resume_key)
+    if use_cache:
+        cached = ats_cache.get(cache_key)
+        if cached is not None:
+            # A copy, so callers that change the analysis (e.g. adding requirement matches) leave the cache intact
+            return cached.model_copy(deep=True)
+    
     try:
         # Check if OpenAI client is available
         if openai_client is None:
@@ -428,154 +1194,26 @@ def analyze_resume_with_ats(resume_data: ResumeData, job_description: str) -> AT
         # Get OpenAI configuration for resume optimization
         openai_config = Config.get_openai_config("optimization")
         
-        # Create the prompt for ATS analysis
-        prompt = f"""
-        You are an expert ATS (Applicant Tracking System) analyst. Analyze the following resume against the job description and provide a comprehensive assessment similar to what a real ATS would generate.
-
-        Resume Information:
-        Name: {resume_data.name}
-        Email: {resume_data.email}
-        Location: {resume_data.location}
-        Professional Summary: {resume_data.summary}
-        
-        Skills: {', '.join(resume_data.skills)}
-        
-        Experience:
-        {chr(10).join([f"- {exp.position} at {exp.company} ({exp.duration}): {'; '.join(exp.description)}" for exp in resume_data.experience])}
-        
-        Education:
-        {chr(10).join([f"- {edu.degree} from {edu.institution} ({edu.year})" for edu in resume_data.education])}
-        
-        Projects:
-        {chr(10).join([f"- {proj.name}: {'; '.join(proj.description)} (Technologies: {proj.technologies})" for proj in resume_data.projects])}
-        
-        Certifications:
-        {chr(10).join([f"- {cert.name} from {cert.issuer} ({cert.year})" for cert in resume_data.certifications])}
-        
-        Job Description:
-        {job_description}
-
-        IMPORTANT: Be strict and realistic in your analysis. Real ATS systems are unforgiving. Score conservatively and identify real weaknesses.
-
-        Please provide a comprehensive ATS analysis in the following JSON format:
-
-        {{
-            "score": {{
-                "overall_score": 85,
-                "keyword_match_score": 78,
-                "experience_relevance": 90,
-                "education_fit": 88,
-                "skills_alignment": 82
-            }},
-            "insights": [
-                {{
-                    "category": "strength",
-                    "title": "Strong Technical Background",
-                    "description": "Candidate demonstrates excellent technical skills relevant to the position",
-                    "impact": "high"
-                }},
-                {{
-                    "category": "weakness", 
-                    "title": "Limited Industry Experience",
-                    "description": "Candidate lacks specific experience in the target industry",
-                    "impact": "medium"
-                }}
-            ],
-            "recommendations": [
-                {{
-                    "title": "Add Industry-Specific Keywords",
-                    "description": "Include more industry-specific terminology and technologies",
-                    "priority": "high",
-                    "effort": "easy"
-                }}
-            ],
-            "matched_keywords": ["Python", "Machine Learning", "Data Analysis"],
-            "missing_keywords": ["TensorFlow", "AWS", "Docker"],
-            "experience_gaps": ["Cloud computing experience", "Team leadership"],
-            "strengths": ["Strong technical skills", "Relevant education", "Project experience"],
-            "removable_words": ["passionate about", "detail-oriented", "team player", "hard worker", "excellent communication skills"]
-        }}
-
-        Analysis Guidelines:
-        1. Score conservatively (0-100) - real ATS systems are harsh
-        2. Be honest about missing required skills/qualifications
-        3. Identify specific keywords that match and are missing from job description
-        4. Highlight experience gaps that would cause immediate rejection
-        5. Provide actionable recommendations with priority levels
-        6. Focus on exact keyword matches - partial matches score lower
-        7. Consider industry-specific requirements and certifications
-        8. Identify filler words/phrases that add no value and should be removed
-        9. Flag outdated or irrelevant skills/technologies
-        10. Assess if candidate meets minimum requirements (education, experience years)
-        11. Be critical of vague descriptions and generic statements
-        12. Penalize heavily for missing must-have qualifications
-
-        Return only the JSON object, no additional text or formatting.
-        """
-
-        # Call OpenAI API
-        response = openai_client.chat.completions.create(
+        # Call OpenAI API; invalid JSON is repaired or retried
+        analysis, _ = await complete_json(
+            openai_client,
+            "ats_analysis",
+            build_ats_analysis,
+            llm_stats,
+            Config.STRUCTURED_OUTPUT["max_retries"],
+            response_format=structured_response_format(ATS_RESPONSE_FORMAT),
             model=openai_config["model"],
-            messages=[
-                {"role": "system", "content": "You are an expert ATS analyst. Provide detailed, actionable feedback in JSON format. Be specific and practical in your recommendations."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=build_ats_messages(resume_data, job_description, job_digest, resume_context, keyword_analysis),
             max_tokens=openai_config["max_tokens"],
             temperature=openai_config["temperature"]
         )
-
-        # Extract the response content
-        response_text = response.choices[0].message.content.strip()
-        
-        # Clean up the response (remove any markdown formatting)
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        # Parse the JSON response
-        parsed_data = json.loads(response_text)
-        
-        # Create response objects
-        score = ATSScore(
-            overall_score=parsed_data["score"]["overall_score"],
-            keyword_match_score=parsed_data["score"]["keyword_match_score"],
-            experience_relevance=parsed_data["score"]["experience_relevance"],
-            education_fit=parsed_data["score"]["education_fit"],
-            skills_alignment=parsed_data["score"]["skills_alignment"]
-        )
-        
-        insights = [
-            ATSInsight(
-                category=insight["category"],
-                title=insight["title"],
-                description=insight["description"],
-                impact=insight["impact"]
-            ) for insight in parsed_data["insights"]
-        ]
-        
-        recommendations = [
-            ATSRecommendation(
-                title=rec["title"],
-                description=rec["description"],
-                priority=rec["priority"],
-                effort=rec["effort"]
-            ) for rec in parsed_data["recommendations"]
-        ]
-        
-        return ATSAnalysisResponse(
-            success=True,
-            score=score,
-            insights=insights,
-            recommendations=recommendations,
-            matched_keywords=parsed_data["matched_keywords"],
-            missing_keywords=parsed_data["missing_keywords"],
-            experience_gaps=parsed_data["experience_gaps"],
-            strengths=parsed_data["strengths"],
-            removable_words=parsed_data["removable_words"],
-            message="ATS analysis completed successfully"
-        )
+        if job_digest is not None:
+            add_requirement_matches(analysis, resume_context or ats_resume_context(resume_data), job_digest)
+        ats_cache.set(cache_key, analysis.model_copy(deep=True))
+        return analysis
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         print(f"JSON parsing error: {e}")
         raise HTTPException(status_code=500, detail="Failed to parse ATS analysis response")
@@ -584,8 +1222,91 @@ def analyze_resume_with_ats(resume_data: ResumeData, job_description: str) -> AT
         raise HTTPException(status_code=500, detail=f"Error during ATS analysis: {str(e)}")
 
 
-def optimize_section_with_chatgpt(resume_data: ResumeData, job_description: str, section: str, section_data: dict, custom_prompt: str = "") -> SectionOptimizationResponse:
+SECTION_DISPLAY_NAMES = {
+    "summary": "professional summary or objective",
+    "experience": "work experience entries",
+    "skills": "skills list",
+    "education": "education entries",
+    "projects": "project entries",
+    "publications": "publication entries",
+    "certifications": "certification entries",
+    "volunteer_experience": "volunteer experience entries",
+    "awards": "awards and honors",
+    "languages": "languages list",
+    "references": "reference entries"
+}
+
+def build_section_optimization_messages(resume_data: ResumeData, job_description: str, section: str, section_data: dict, custom_prompt: str = "", bullet_priority: Optional[list[BulletPriority]] = None) -> list[dict]:
+    """
+    Build the chat messages for optimizing one resume section against the job description.
+    With bullet_priority (from bullet_rewrite_priority), the least job-aligned bullets are named as the ones to rewrite first.
+    """
+    resume = resume_data.model_dump()
+    resume_key = resume_hash(resume)
+    prompt_version = prompt_registry.select_version(resume_key)
+    blocks = resume_block_cache.get(resume_key, resume, prompt_registry.fingerprint(prompt_version))
+    
+    # Section-specific rules are static per section, so they extend the cached prefix
+    section_template = f"section_optimization_{section}"
+    section_instructions = prompt_registry.render(section_template, prompt_version) if prompt_registry.has(section_template, prompt_version) else ""
+    
+    # Add custom user instructions if provided
+    custom_instructions = ""
+    if custom_prompt.strip():
+        custom_instructions = prompt_registry.render("section_optimization_custom", prompt_version, custom_prompt=custom_prompt)
+    
+    priority_instructions = ""
+    if bullet_priority and len(bullet_priority) > 1:
+        priority_instructions = prompt_registry.render(
+            "section_optimization_bullet_priority",
+            prompt_version,
+            bullets="\n".join(
+                f"- Entry {bullet.entry + 1}, bullet {bullet.bullet + 1}: {bullet.text}"
+                for bullet in bullet_priority[:embedding_config["max_priority_bullets"]]
+            )
+        )
+    
+    section_json = json.dumps(section_data, indent=2)
+    
+    return fit_prompt(
+        Config.get_openai_config("optimization"),
+        "section_optimization",
+        lambda job_description_text: [
+            {"role": "system", "content": prompt_registry.render("section_optimization_system", prompt_version)},
+            {"role": "user", "content": prompt_registry.render(
+                "section_optimization",
+                prompt_version,
+                section_instructions=section_instructions,
+                section_name=SECTION_DISPLAY_NAMES.get(section, section),
+                job_description=job_description_text,
+                name=blocks["name"],
+                summary=blocks["summary"],
+                skills=blocks["skills"],
+                section_label=section.upper(),
+                section_data=section_json,
+                priority_instructions=priority_instructions,
+                custom_instructions=custom_instructions
+            )}
+        ],
+        job_description,
+        fit_job_description
+    )
+
+
+def build_section_optimization(parsed_data: dict) -> SectionOptimizationResponse:
+    """Convert the model's parsed JSON into a SectionOptimizationResponse. A missing optimized_section raises KeyError so the call is retried."""
+    return SectionOptimizationResponse(
+        success=True,
+        optimized_section=parsed_data["optimized_section"],
+        explanation=parsed_data.get("explanation", ""),
+        changes_made=parsed_data.get("changes_made", []),
+        message="Section optimization completed successfully"
+    )
+
+
+async def optimize_section_with_chatgpt(resume_data: ResumeData, job_description: str, section: str, section_data: dict, custom_prompt: str = "", job_digest: Optional[dict] = None) -> SectionOptimizationResponse:
     """Optimize a specific resume section using ChatGPT with custom user instructions."""
+    bullet_priority = bullet_rewrite_priority(section, section_data, job_digest)
     try:
         # Check if OpenAI client is available
         if openai_client is None:
@@ -594,175 +1315,24 @@ def optimize_section_with_chatgpt(resume_data: ResumeData, job_description: str,
         # Get OpenAI configuration for optimization
         openai_config = Config.get_openai_config("optimization")
         
-        # Create section-specific prompts
-        section_prompts = {
-            "summary": "professional summary or objective",
-            "experience": "work experience entries",
-            "skills": "skills list",
-            "education": "education entries",
-            "projects": "project entries",
-            "publications": "publication entries",
-            "certifications": "certification entries",
-            "volunteer_experience": "volunteer experience entries",
-            "awards": "awards and honors",
-            "languages": "languages list",
-            "references": "reference entries"
-        }
-        
-        section_name = section_prompts.get(section, section)
-        
-        # Create the optimization prompt
-        base_prompt = f"""
-        You are an expert resume optimization specialist. Your task is to optimize the {section_name} section of a resume to better match a specific job description.
-
-        JOB DESCRIPTION:
-        {job_description}
-
-        CURRENT RESUME CONTEXT:
-        Name: {resume_data.name}
-        Current Summary: {resume_data.summary}
-        Skills: {', '.join(resume_data.skills)}
-        
-        CURRENT {section.upper()} SECTION DATA:
-        {json.dumps(section_data, indent=2)}
-
-        OPTIMIZATION GUIDELINES:
-        1. Analyze the job description to identify key requirements, skills, and keywords
-        2. Optimize the section to better align with the job requirements
-        3. Maintain authenticity and truthfulness - only enhance what's already there
-        4. Use action verbs and quantifiable achievements where possible
-        5. Ensure the optimized content flows naturally and professionally
-        6. Keep the EXACT SAME structure and format as the original
-        7. Focus on relevance to the specific job posting
-
-        CRITICAL FORMATTING RULES:
-        - PRESERVE the exact data structure (arrays stay arrays, strings stay strings)
-        - Keep the SAME NUMBER of items (bullet points, skills, entries) unless user specifically requests more/less
-        - Do NOT change the presentation format (e.g., if skills are a list, keep them as a list)
-        - If the input has 5 bullet points, the output must have exactly 5 bullet points
-        - If the input is comma-separated values, keep it comma-separated
-        - Only improve the CONTENT and WORDING, not the structure or quantity
-
-        IMPORTANT RULES:
-        - Do NOT add false information or experiences
-        - Do NOT change dates, company names, or other factual details
-        - Do NOT make the content longer than necessary
-        - Do NOT add or remove items unless explicitly requested by the user
-        - Maintain the original tone and style
-        - Only enhance and rephrase existing content for better impact
-        """
-
-        # Add custom user instructions if provided
-        if custom_prompt.strip():
-            base_prompt += f"""
-
-        CUSTOM USER INSTRUCTIONS:
-        {custom_prompt}
-
-        Please incorporate these specific instructions while optimizing the section.
-        """
-
-        # Add section-specific instructions
-        if section == "summary":
-            base_prompt += """
-        
-        For the summary section:
-        - Make it more targeted to the specific job
-        - Highlight the most relevant skills and experiences
-        - Keep it concise (2-3 sentences)
-        - Use keywords from the job description naturally
-        - Maintain the same length and tone as the original
-        """
-        elif section == "experience":
-            base_prompt += """
-        
-        For experience entries:
-        - Keep the EXACT SAME NUMBER of bullet points for each position
-        - Start bullet points with strong action verbs
-        - Quantify achievements with numbers, percentages, or timeframes where possible
-        - Focus on results and impact rather than just responsibilities
-        - Use keywords from the job description naturally
-        - Keep each bullet point concise but impactful
-        - Only improve the wording and relevance of existing bullets, do NOT add or remove any
-        - If there are 3 bullets in the input, there must be exactly 3 bullets in the output
-        """
-        elif section == "skills":
-            base_prompt += """
-        
-        For skills section:
-        - MAINTAIN the exact format (if it's an array/list, keep it as an array/list)
-        - Prioritize skills mentioned in the job description by reordering them
-        - Replace or improve skill names to match job description terminology
-        - Keep the same number of skills unless user asks for more/less
-        - Do NOT convert the list into a paragraph or change the structure
-        - Keep it as a clean, comma-separated list format
-        - Only modify the skill names to be more relevant or precise
-        """
-
-        base_prompt += """
-
-        Please return your response in the following JSON format:
-        {
-            "optimized_section": {
-                // The optimized section data in the EXACT SAME structure as the input
-                // If input has an array with 5 items, output must have array with 5 items
-                // If input is a string, output must be a string
-                // PRESERVE the data types and structure completely
-            },
-            "explanation": "Brief explanation of what was optimized and why (focus on content improvements, not structural changes)",
-            "changes_made": [
-                "Reordered skills to prioritize job-relevant ones",
-                "Enhanced bullet point wording for impact",
-                "Added quantifiable metrics to existing bullet",
-                // List specific content changes, not structural changes
-                // Each change as a separate string
-            ]
-        }
-
-        EXAMPLE - If optimizing skills ["Python", "JavaScript", "C++"] for a Python job:
-        CORRECT: Return ["Python", "Django", "JavaScript"] (same count, better terminology, reordered)
-        WRONG: Return "Proficient in Python, JavaScript, and C++ with expertise in..." (changed format to paragraph)
-        WRONG: Return ["Python", "Django", "Flask", "JavaScript", "React", "C++"] (added items)
-
-        EXAMPLE - If optimizing experience with 4 bullets:
-        CORRECT: Return exactly 4 improved bullets
-        WRONG: Return 6 bullets (added items)
-        WRONG: Return 3 bullets (removed items)
-
-        Return only the JSON object, no additional text or formatting.
-        """
-
-        # Call OpenAI API
-        response = openai_client.chat.completions.create(
+        # Call OpenAI API; invalid JSON is repaired or retried
+        optimization, _ = await complete_json(
+            openai_client,
+            "section_optimization",
+            build_section_optimization,
+            llm_stats,
+            Config.STRUCTURED_OUTPUT["max_retries"],
+            response_format=structured_response_format(SECTION_OPTIMIZATION_RESPONSE_FORMAT),
             model=openai_config["model"],
-            messages=[
-                {"role": "system", "content": "You are an expert resume optimization specialist. Optimize resume sections to better match job requirements while maintaining authenticity and truthfulness."},
-                {"role": "user", "content": base_prompt}
-            ],
+            messages=build_section_optimization_messages(resume_data, job_description, section, section_data, custom_prompt, bullet_priority),
             max_tokens=openai_config["max_tokens"],
             temperature=openai_config["temperature"]
         )
-
-        # Extract the response content
-        response_text = response.choices[0].message.content.strip()
-        
-        # Clean up the response (remove any markdown formatting)
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        # Parse the JSON response
-        parsed_data = json.loads(response_text)
-        
-        return SectionOptimizationResponse(
-            success=True,
-            optimized_section=parsed_data["optimized_section"],
-            explanation=parsed_data["explanation"],
-            changes_made=parsed_data["changes_made"],
-            message="Section optimization completed successfully"
-        )
+        optimization.bullet_priority = bullet_priority
+        return optimization
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         print(f"JSON parsing error: {e}")
         raise HTTPException(status_code=500, detail="Failed to parse optimization response")
@@ -771,89 +1341,122 @@ def optimize_section_with_chatgpt(resume_data: ResumeData, job_description: str,
         raise HTTPException(status_code=500, detail=f"Error during section optimization: {str(e)}")
 
 
+@functools.lru_cache(maxsize=16)
+def get_pdf_styles(page_size: str, title_font: str, header_font: str, body_font: str) -> dict:
+    """
+    Build the ParagraphStyles used by generate_pdf.
+    Cached per font and page-size configuration so each process builds them once.
+    """
+    # Get styles
+    styles = getSampleStyleSheet()
+    
+    # Create custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=20,
+        alignment=1,  # Center alignment
+        fontName=title_font
+    )
+    
+    contact_style = ParagraphStyle(
+        'ContactStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=25,
+        alignment=1,  # Center alignment
+        fontName=body_font
+    )
+    
+    header_style = ParagraphStyle(
+        'CustomHeader',
+        parent=styles['Heading2'],
+        fontSize=12,
+        spaceAfter=4,
+        spaceBefore=15,
+        fontName=header_font,
+        textColor='#000000'
+    )
+    
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=4,
+        fontName=body_font
+    )
+    
+    company_style = ParagraphStyle(
+        'CompanyStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=2,
+        fontName=header_font
+    )
+    
+    position_style = ParagraphStyle(
+        'PositionStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=4,
+        leftIndent=20,
+        fontName=body_font
+    )
+    
+    bullet_style = ParagraphStyle(
+        'BulletStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=2,
+        leftIndent=20,
+        fontName=body_font
+    )
+    
+    return {
+        "page_size": PDF_PAGE_SIZES[page_size],
+        "title": title_style,
+        "contact": contact_style,
+        "header": header_style,
+        "normal": normal_style,
+        "company": company_style,
+        "position": position_style,
+        "bullet": bullet_style
+    }
+
+def pdf_section_header(title: str, styles: dict) -> list:
+    """Section heading followed by a full-width rule."""
+    return [
+        Paragraph(title, styles["header"]),
+        HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0)
+    ]
+
 def generate_pdf(resume_data: ResumeData) -> bytes:
     """Generate PDF from resume data using ReportLab."""
     try:
         pdf_config = Config.PDF_GENERATION
         margins = pdf_config["margins"]
         
+        # Get precompiled styles for the configured fonts and page size
+        fonts = pdf_config["fonts"]
+        styles = get_pdf_styles(pdf_config["page_size"], fonts["title"], fonts["header"], fonts["body"])
+        
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(
             buffer, 
-            pagesize=letter, 
+            pagesize=styles["page_size"], 
             rightMargin=margins["right"],
             leftMargin=margins["left"],
             topMargin=margins["top"],
             bottomMargin=margins["bottom"]
         )
         
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        fonts = pdf_config["fonts"]
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=20,
-            alignment=1,  # Center alignment
-            fontName='Helvetica-Bold'
-        )
-        
-        contact_style = ParagraphStyle(
-            'ContactStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=25,
-            alignment=1,  # Center alignment
-            fontName='Helvetica'
-        )
-        
-        header_style = ParagraphStyle(
-            'CustomHeader',
-            parent=styles['Heading2'],
-            fontSize=12,
-            spaceAfter=4,
-            spaceBefore=15,
-            fontName='Helvetica-Bold',
-            textColor='#000000'
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=4,
-            fontName='Helvetica'
-        )
-        
-        company_style = ParagraphStyle(
-            'CompanyStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=2,
-            fontName='Helvetica-Bold'
-        )
-        
-        position_style = ParagraphStyle(
-            'PositionStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=4,
-            leftIndent=20,
-            fontName='Helvetica'
-        )
-        
-        bullet_style = ParagraphStyle(
-            'BulletStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=2,
-            leftIndent=20,
-            fontName='Helvetica'
-        )
+        title_style = styles["title"]
+        contact_style = styles["contact"]
+        normal_style = styles["normal"]
+        company_style = styles["company"]
+        position_style = styles["position"]
+        bullet_style = styles["bullet"]
         
         # Build content
         story = []
@@ -876,13 +1479,11 @@ def generate_pdf(resume_data: ResumeData) -> bytes:
             story.append(Paragraph(" • ".join(contact_parts), contact_style))
         
         # Professional Summary
-        story.append(Paragraph("SUMMARY", header_style))
-        story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+        story.extend(pdf_section_header("SUMMARY", styles))
         story.append(Paragraph(resume_data.summary, normal_style))
         
         # Skills
-        story.append(Paragraph("SKILLS", header_style))
-        story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+        story.extend(pdf_section_header("SKILLS", styles))
         story.append(Paragraph(f"<b>Skills:</b> {', '.join(resume_data.skills)}", normal_style))
         
         # Add volunteering if exists
@@ -892,8 +1493,7 @@ def generate_pdf(resume_data: ResumeData) -> bytes:
         
         
         # Professional Experience
-        story.append(Paragraph("PROFESSIONAL EXPERIENCE", header_style))
-        story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+        story.extend(pdf_section_header("PROFESSIONAL EXPERIENCE", styles))
         for exp in resume_data.experience:
             # Company, Location, Date format
             story.append(Paragraph(f"{exp.company}, {resume_data.location} ({exp.duration})", company_style))
@@ -904,8 +1504,7 @@ def generate_pdf(resume_data: ResumeData) -> bytes:
                 story.append(Paragraph(f"• {bullet}", bullet_style))
         
         # Education
-        story.append(Paragraph("EDUCATION", header_style))
-        story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+        story.extend(pdf_section_header("EDUCATION", styles))
         for edu in resume_data.education:
             # Institution, Location, Date format
             story.append(Paragraph(f"{edu.institution}, {resume_data.location} ({edu.year})", company_style))
@@ -921,8 +1520,7 @@ def generate_pdf(resume_data: ResumeData) -> bytes:
         
         # Projects (including Publications)
         if resume_data.projects or resume_data.publications:
-            story.append(Paragraph("PROJECTS", header_style))
-            story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+            story.extend(pdf_section_header("PROJECTS", styles))
             
             # Process projects and check for corresponding publications
             for project in resume_data.projects:
@@ -964,8 +1562,7 @@ def generate_pdf(resume_data: ResumeData) -> bytes:
         
         # Certifications
         if resume_data.certifications:
-            story.append(Paragraph("CERTIFICATIONS", header_style))
-            story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+            story.extend(pdf_section_header("CERTIFICATIONS", styles))
             for cert in resume_data.certifications:
                 cert_text = f"<b>{cert.name}</b> - {cert.issuer}"
                 if cert.year:
@@ -977,21 +1574,18 @@ def generate_pdf(resume_data: ResumeData) -> bytes:
         
         # Awards
         if resume_data.awards:
-            story.append(Paragraph("AWARDS & HONORS", header_style))
-            story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+            story.extend(pdf_section_header("AWARDS & HONORS", styles))
             for award in resume_data.awards:
                 story.append(Paragraph(f"• {award}", normal_style))
         
         # Languages
         if resume_data.languages:
-            story.append(Paragraph("LANGUAGES", header_style))
-            story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+            story.extend(pdf_section_header("LANGUAGES", styles))
             story.append(Paragraph(" • ".join(resume_data.languages), normal_style))
         
         # References
         if resume_data.references:
-            story.append(Paragraph("REFERENCES", header_style))
-            story.append(HRFlowable(width="100%", thickness=1, lineCap='round', color=black, spaceAfter=4, spaceBefore=0))
+            story.extend(pdf_section_header("REFERENCES", styles))
             for ref in resume_data.references:
                 ref_text = f"<b>{ref.name}</b>"
                 if ref.title:
@@ -1234,21 +1828,192 @@ def generate_docx(resume_data: ResumeData) -> bytes:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating DOCX: {str(e)}")
 
+def validate_ats_request(request: ATSAnalysisRequest) -> None:
+    """Raise a 400 HTTPException if the ATS analysis request is incomplete."""
+    if request.mode not in ATS_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Must be one of: {', '.join(ATS_MODES)}")
+
+def validate_section_optimization_request(request: SectionOptimizationRequest) -> None:
+    """Raise a 400 HTTPException if the section optimization request is incomplete or invalid."""
+    if not request.section.strip():
+        raise HTTPException(status_code=400, detail="Section name is required")
+    
+    if not request.section_data:
+        raise HTTPException(status_code=400, detail="Section data is required")
+    
+    # Validate section name
+    if request.section not in VALID_SECTIONS:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Invalid section. Must be one of: {', '.join(VALID_SECTIONS)}"
+        )
+
+def sse_event(event: str, data) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_llm_events(openai_config: dict, messages: list[dict], build_result, on_result=None, operation: str = "stream", response_format: Optional[dict] = None):
+    """
+    Stream a chat completion as Server-Sent Events.
+    Emits a "token" event per content delta, then a "result" event carrying the validated
+    response built by build_result, or an "error" event if the call or validation fails.
+    Unusable output is repaired where possible; otherwise a "retry" event is sent and the
+    completion is streamed again, up to the configured retry limit. A final "usage" event reports
+    the tokens used, since headers are already sent by then.
+    """
+    max_retries = Config.STRUCTURED_OUTPUT["max_retries"]
+    attempt = 0
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    try:
+        if openai_client is None:
+            raise Exception("OpenAI client not initialized")
+        
+        while True:
+            llm_stats.record(operation, "calls")
+            request = {
+                "model": openai_config["model"],
+                "messages": messages,
+                "max_tokens": openai_config["max_tokens"],
+                "temperature": openai_config["temperature"],
+                "stream": True,
+                # Ask for a final usage chunk so streamed calls report (cached) token counts too
+                "extra_body": {"stream_options": {"include_usage": True}}
+            }
+            response_format_arg = response_format_for(openai_config["model"], structured_response_format(response_format), llm_stats)
+            if response_format_arg is not None:
+                request["response_format"] = response_format_arg
+            try:
+                stream = await openai_client.chat.completions.create(**request)
+            except BadRequestError as e:
+                if response_format_arg is not None and "response_format" in str(e):
+                    llm_stats.unsupported_models.add(openai_config["model"])
+                    continue
+                raise
+            
+            chunks = []
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    llm_stats.record_usage(operation, chunk.usage)
+                    usage["prompt_tokens"] += chunk.usage.prompt_tokens or 0
+                    usage["completion_tokens"] += chunk.usage.completion_tokens or 0
+                    usage["cached_tokens"] += cached_prompt_tokens(chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    yield sse_event("token", {"content": delta})
+            
+            try:
+                parsed_data, repaired = parse_json_response("".join(chunks))
+                if repaired:
+                    llm_stats.record(operation, "repaired")
+                result = build_result(parsed_data)
+                break
+            except RETRYABLE_OUTPUT_ERRORS as e:
+                if attempt >= max_retries:
+                    llm_stats.record(operation, "failed")
+                    raise
+                attempt += 1
+                llm_stats.record(operation, "retries")
+                print(f"Invalid {operation} response ({e}), retrying ({attempt}/{max_retries})")
+                yield sse_event("retry", {"attempt": attempt})
+        
+        if on_result is not None:
+            on_result(result)
+        yield sse_event("result", result.model_dump())
+        yield sse_event("usage", usage)
+    
+    except json.JSONDecodeError as e:
+        print(f"JSON parsing error: {e}")
+        yield sse_event("error", {"detail": "Failed to parse model response"})
+    except Exception as e:
+        print(f"Streaming error: {e}")
+        yield sse_event("error", {"detail": str(e)})
+
+def event_stream_response(events) -> StreamingResponse:
+    """Wrap an async generator of SSE strings in an unbuffered streaming response."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
     return {"message": "Resume Text Extractor API is running"}
 
+@app.get("/metrics")
+async def metrics():
+    """Cache and runtime statistics. Stores that may be SQLite are read in threads."""
+    parse_cache_stats, resume_session_stats, bulk_job_stats = await asyncio.gather(
+        asyncio.to_thread(parse_cache.stats),
+        asyncio.to_thread(resume_sessions.stats),
+        asyncio.to_thread(bulk_jobs.stats)
+    )
+    return {
+        "parse_cache": parse_cache_stats,
+        "ats_cache": ats_cache.stats(),
+        "document_cache": document_cache.stats(),
+        "process_pool": process_pool.stats(),
+        "llm": llm_stats.stats(),
+        "prompts": prompt_registry.stats(),
+        "resume_block_cache": resume_block_cache.stats(),
+        "job_descriptions": job_registry.stats(),
+        "resume_embeddings": resume_embeddings.stats(),
+        "resume_sessions": resume_session_stats,
+        "bulk_jobs": {**bulk_job_stats, "running_in_process": len(bulk_job_tasks)},
+        "validated_resumes": session_resumes.stats()
+    }
+
+def require_admin(admin_token: Optional[str]) -> None:
+    """Reject the request unless it carries the configured admin token; admin endpoints are off without one."""
+    expected = Config.SERVER["admin_token"]
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled. Set ADMIN_TOKEN to enable them.")
+    if not admin_token or not hmac.compare_digest(admin_token.encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token header")
+
+@app.post("/prompts/reload")
+async def reload_prompts(x_admin_token: Optional[str] = Header(None)):
+    """Reload prompt templates and A/B weights from backend/prompts without restarting the server. Requires X-Admin-Token."""
+    require_admin(x_admin_token)
+    try:
+        prompt_registry.load()
+    except (OSError, ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Failed to reload prompts: {str(e)}")
+    return prompt_registry.stats()
+
+def local_fallback_response(extracted_text: str) -> ParsedResumeResponse:
+    """Parse with the offline parser when ChatGPT is unavailable. Not cached, so a later request can still use the LLM."""
+    print("ChatGPT parsing unavailable, falling back to the local resume parser")
+    return ParsedResumeResponse(
+        success=True,
+        data=build_resume_data(parse_resume_text(extracted_text)),
+        message="Resume parsed locally; AI parsing is currently unavailable"
+    )
+
 @app.post("/parse-resume", response_model=ParsedResumeResponse)
-async def parse_resume(file: UploadFile = File(...)):
+async def parse_resume(file: UploadFile = File(...), mode: str = Form("full")):
     """
     Parse uploaded resume file and return structured data.
-    Supports PDF and DOCX formats.
+    Supports PDF and DOCX formats. Mode "fast" uses the offline parser instead of ChatGPT.
+    The result is also stored as a resume session; its resume_id can be sent instead of resume_data later.
     """
+    response = await parse_resume_upload(file, mode)
+    response.resume_id = (await asyncio.to_thread(resume_sessions.create, response.data.model_dump()))["id"]
+    return response
+
+async def parse_resume_upload(file: UploadFile, mode: str) -> ParsedResumeResponse:
+    """Validate, read, extract and parse an uploaded resume, using the parse cache."""
     # Validate file type
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
+    if mode not in PARSE_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Must be one of: {', '.join(PARSE_MODES)}")
+    
     file_extension = file.filename.lower().split('.')[-1]
     
     if file_extension not in ['pdf', 'docx']:
@@ -1257,27 +2022,91 @@ async def parse_resume(file: UploadFile = File(...)):
             detail="Unsupported file type. Please upload a PDF or DOCX file."
         )
     
-    # Read file content
+    # Read file content in chunks, hashing as we go
     try:
-        file_content = await file.read()
+        file_content, file_digest = await read_upload(file, suffix=f".{file_extension}")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
     
+    return await parse_resume_content(file_content, file_extension, file_digest, mode)
+
+async def parse_resume_content(file_content: Union[bytes, str], file_extension: str, file_digest: str, mode: str, llm_limiter: Optional[asyncio.Semaphore] = None) -> ParsedResumeResponse:
+    """
+    Extract and parse resume content (bytes or a spilled upload path, which is removed afterwards), using the parse cache.
+    LLM calls wait on llm_limiter when one is given, so bulk jobs share a concurrency limit.
+    Parse cache reads and writes may hit SQLite, so they run in a thread to keep the event loop free.
+    """
+    # Return the stored result if this exact file was parsed before
+    # The same file always gets the same prompt version, so A/B variants keep separate cache entries
+    prompt_version = prompt_registry.select_version(file_digest)
+    cache_key = parse_cache_key(file_digest, mode, prompt_version)
+    cached = await asyncio.to_thread(parse_cache.get, cache_key)
+    if cached is not None:
+        discard_upload(file_content)
+        if mode != "full":
+            # Fast and hybrid results are stored with their section confidence
+            return ParsedResumeResponse.model_validate_json(cached)
+        return ParsedResumeResponse(
+            success=True,
+            data=ResumeData.model_validate_json(cached),
+            message="Resume parsed successfully"
+        )
+    
     # Extract text based on file type
     try:
-        if file_extension == 'pdf':
-            extracted_text = extract_text_from_pdf(file_content)
-        elif file_extension == 'docx':
-            extracted_text = extract_text_from_docx(file_content)
+        try:
+            if file_extension == 'pdf':
+                extracted_text = await process_pool.run(extract_text_from_pdf, file_content)
+            elif file_extension == 'docx':
+                extracted_text = await process_pool.run(extract_text_from_docx, file_content)
+        finally:
+            discard_upload(file_content)
+        
+        if mode == "fast":
+            sections = segment_sections(extracted_text)
+            parsed_sections = parse_sections(sections)
+            response = ParsedResumeResponse(
+                success=True,
+                data=build_resume_data(parsed_sections),
+                message="Resume parsed locally (fast mode)",
+                section_confidence=section_confidence(sections, parsed_sections)
+            )
+            await asyncio.to_thread(parse_cache.set, cache_key, response.model_dump_json())
+            return response
+        
+        if mode == "hybrid":
+            response = await parse_resume_hybrid(extracted_text, prompt_version, llm_limiter)
+            # Only cache when every low-confidence section was actually resolved
+            low_confidence = [
+                section for section, score in response.section_confidence.items()
+                if score < Config.RESUME_PARSING["hybrid_confidence_threshold"]
+            ]
+            if set(low_confidence) <= set(response.llm_sections):
+                await asyncio.to_thread(parse_cache.set, cache_key, response.model_dump_json())
+            return response
+        
+        local_fallback = Config.RESUME_PARSING["local_fallback"]
         
         # Parse the extracted text into structured data using ChatGPT
         if openai_client is None:
-            raise HTTPException(
-                status_code=503, 
-                detail="Resume parsing service is currently unavailable. Please ensure OpenAI API key is configured and try again later."
-            )
-        
-        parsed_data = parse_resume_with_chatgpt(extracted_text)
+            if not local_fallback:
+                raise HTTPException(
+                    status_code=503, 
+                    detail="Resume parsing service is currently unavailable. Please ensure OpenAI API key is configured and try again later."
+                )
+            return local_fallback_response(extracted_text)
+        
+        try:
+            # Send the cleaned text: page numbers and running headers/footers only cost tokens
+            async with llm_limiter or contextlib.nullcontext():
+                parsed_data = await parse_resume_with_chatgpt(clean_resume_text(extracted_text), prompt_version)
+        except HTTPException:
+            if not local_fallback:
+                raise
+            return local_fallback_response(extracted_text)
+        await asyncio.to_thread(parse_cache.set, cache_key, parsed_data.model_dump_json())
         
         return ParsedResumeResponse(
             success=True,
@@ -1290,38 +2119,390 @@ async def parse_resume(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
 
-@app.post("/generate-pdf")
-async def generate_pdf_endpoint(resume_data: ResumeData):
+async def stage_upload(file: UploadFile, path: str, max_size: int) -> str:
+    """Copy an upload to path in chunks, enforcing max_size. Returns the sha256 hex digest."""
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as target:
+            while True:
+                chunk = await file.read(Config.UPLOAD["chunk_size"])
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {max_size // (1024 * 1024)}MB.")
+                digest.update(chunk)
+                target.write(chunk)
+    except BaseException:
+        # open() may have failed before the file existed; don't hide the original error
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        raise
+    return digest.hexdigest()
+
+async def stage_bulk_files(files: List[UploadFile], staging_dir: str) -> list[dict]:
+    """
+    Copy a bulk request's resumes to staging_dir so the job can outlive the request.
+    Zips are unpacked in the process pool. Returns one {"filename", "extension", "path", "digest", "error"}
+    entry per resume; unsupported or oversized files get an error instead of failing the whole job.
+    """
+    max_file_size = Config.UPLOAD["max_file_size"]
+    entries = []
+    unpacked_size = 0
+    for file_index, file in enumerate(files):
+        filename = file.filename or f"file-{file_index}"
+        extension = os.path.splitext(filename)[1].lower()
+        if extension == ".zip":
+            zip_dir = os.path.join(staging_dir, f"zip-{file_index}")
+            os.makedirs(zip_dir)
+            zip_path = os.path.join(staging_dir, f"{file_index}.zip")
+            await stage_upload(file, zip_path, bulk_config["max_upload_size"])
+            try:
+                zip_entries = await process_pool.run(
+                    unpack_resume_zip, zip_path, zip_dir, Config.UPLOAD["allowed_extensions"], max_file_size,
+                    bulk_config["max_files"] - len(entries), bulk_config["max_unpacked_size"] - unpacked_size
+                )
+            except HTTPException as e:
+                raise HTTPException(status_code=e.status_code, detail=f"Error reading {filename}: {e.detail}")
+            finally:
+                os.remove(zip_path)
+            entries += zip_entries
+            unpacked_size += sum(entry["size"] for entry in zip_entries)
+            continue
+        
+        if len(entries) >= bulk_config["max_files"]:
+            raise HTTPException(status_code=400, detail=f"Too many files. A job can contain at most {bulk_config['max_files']} files.")
+        entry = {"filename": filename, "extension": extension.lstrip("."), "path": "", "digest": "", "error": ""}
+        entries.append(entry)
+        if extension not in Config.UPLOAD["allowed_extensions"]:
+            entry["error"] = "Unsupported file type. Please upload a PDF or DOCX file."
+            continue
+        path = os.path.join(staging_dir, f"{file_index}{extension}")
+        try:
+            entry["digest"] = await stage_upload(file, path, max_file_size)
+            entry["path"] = path
+        except HTTPException as e:
+            entry["error"] = str(e.detail)
+    return entries
+
+async def parse_bulk_file(job_id: str, index: int, entry: dict, mode: str) -> None:
     """
-    Generate PDF from resume data.
+    Parse one file of a bulk job and persist its result, or its error, as soon as it is known.
+    Store writes commit to SQLite, so they run in a thread to keep the event loop free.
     """
+    await asyncio.to_thread(bulk_jobs.update_file, job_id, index, "processing")
+    resume_id = error = ""
     try:
-        pdf_content = generate_pdf(resume_data)
-        
-        return StreamingResponse(
-            io.BytesIO(pdf_content),
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={resume_data.name.replace(' ', '_')}_resume.pdf"}
+        response = await parse_resume_content(entry["path"], entry["extension"], entry["digest"], mode, llm_limiter=bulk_llm_limiter)
+        resume_id = (await asyncio.to_thread(resume_sessions.create, response.data.model_dump()))["id"]
+        response.resume_id = resume_id
+        await asyncio.to_thread(
+            bulk_jobs.update_file, job_id, index, "done", resume_id=resume_id, message=response.message, result=response.model_dump_json()
         )
+    except HTTPException as e:
+        error = str(e.detail)
+    except Exception as e:
+        error = f"Error parsing resume: {str(e)}"
+    if error:
+        await asyncio.to_thread(bulk_jobs.update_file, job_id, index, "failed", error=error)
+    bulk_job_events.publish(job_id, "file", {
+        "index": index, "filename": entry["filename"], "status": "failed" if error else "done",
+        "resume_id": resume_id, "error": error
+    })
+
+async def run_bulk_parse_job(job_id: str, entries: list[dict], mode: str, staging_dir: str) -> None:
+    """
+    Parse a job's files with a fixed set of workers. There are more workers than LLM slots, so text
+    extraction in the process pool overlaps the LLM calls, which share bulk_llm_limiter.
+    """
+    pending = iter([(index, entry) for index, entry in enumerate(entries) if entry["path"]])
+    
+    async def worker():
+        for index, entry in pending:
+            await parse_bulk_file(job_id, index, entry, mode)
+    
+    worker_count = bulk_config["llm_concurrency"] + max(1, process_pool.max_workers)
+    try:
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        await asyncio.to_thread(bulk_jobs.finish_job, job_id)
+        bulk_job_events.publish(job_id, "done", await asyncio.to_thread(bulk_jobs.get_job, job_id))
+
+def bulk_job_response(job: dict, files: list[dict], message: str) -> BulkJobResponse:
+    return BulkJobResponse(
+        success=True,
+        job_id=job["job_id"],
+        mode=job["mode"],
+        status=job["status"],
+        total=job["total"],
+        counts=job["counts"],
+        files=[BulkJobFile(**file) for file in files],
+        message=message
+    )
+
+BULK_UPLOAD_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "required": ["files"],
+                "properties": {
+                    "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                    "mode": {"type": "string", "enum": PARSE_MODES, "default": "full"}
+                }
+            }
+        }
+    }
+}
+
+@app.post("/parse-resumes/jobs", response_model=BulkJobResponse, status_code=202, openapi_extra={"requestBody": BULK_UPLOAD_REQUEST_BODY})
+async def create_bulk_parse_job(request: Request):
+    """
+    Start parsing many resumes in one request: PDF/DOCX files and/or zips of them.
+    Returns a job_id immediately; poll GET /parse-resumes/jobs/{job_id} or stream
+    /parse-resumes/jobs/{job_id}/events for progress. Each parsed resume is stored as a resume session.
+    """
+    # Parsed here rather than with File(...): Starlette allows only 1000 files per form by default
+    async with request.form(max_files=bulk_config["max_files"]) as form:
+        files = [file for file in form.getlist("files") if not isinstance(file, str)]
+        mode = form.get("mode", "full")
+        if not files:
+            raise HTTPException(status_code=400, detail="No files uploaded")
+        return await start_bulk_parse_job(files, mode)
+
+async def start_bulk_parse_job(files: List[UploadFile], mode: str) -> BulkJobResponse:
+    if mode not in PARSE_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Must be one of: {', '.join(PARSE_MODES)}")
+    
+    jobs_dir = os.path.join(Config.UPLOAD["temp_dir"], "jobs")
+    os.makedirs(jobs_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(dir=jobs_dir)
+    try:
+        entries = await stage_bulk_files(files, staging_dir)
+        if not entries:
+            raise HTTPException(status_code=400, detail="No resumes found in the upload")
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    
+    job_id = await asyncio.to_thread(bulk_jobs.create_job, mode, entries)
+    task = asyncio.create_task(run_bulk_parse_job(job_id, entries, mode, staging_dir))
+    bulk_job_tasks[job_id] = task
+    task.add_done_callback(lambda _: bulk_job_tasks.pop(job_id, None))
+    
+    job = await asyncio.to_thread(bulk_jobs.get_job, job_id)
+    return bulk_job_response(job, [], f"Parsing {job['counts']['queued']} of {job['total']} files")
+
+@app.get("/parse-resumes/jobs/{job_id}", response_model=BulkJobResponse)
+async def get_bulk_parse_job(job_id: str, offset: int = 0, limit: int = 100, status: Optional[str] = None, include_results: bool = False):
+    """
+    Progress of a bulk parsing job, with a page of its files (filter by status, e.g. "failed").
+    Set include_results=true to include each parsed resume.
+    """
+    job = await asyncio.to_thread(bulk_jobs.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    if status is not None and status not in FILE_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {', '.join(FILE_STATUSES)}")
+    files = await asyncio.to_thread(
+        bulk_jobs.list_files, job_id, offset=max(offset, 0), limit=min(max(limit, 1), 1000), include_results=include_results, status=status
+    )
+    return bulk_job_response(job, files, f"{job['counts']['done']} parsed, {job['counts']['failed']} failed of {job['total']} files")
+
+@app.get("/parse-resumes/jobs/{job_id}/events")
+async def stream_bulk_parse_job(job_id: str):
+    """
+    Server-Sent Events for a bulk parsing job: a "progress" event with the file counts (repeated
+    periodically), a "file" event as each file finishes and a final "done" event.
+    """
+    if await asyncio.to_thread(bulk_jobs.get_job, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    async def events():
+        # Subscribe before reading the snapshot, so the "done" event cannot be missed
+        queue = bulk_job_events.subscribe(job_id)
+        try:
+            job = await asyncio.to_thread(bulk_jobs.get_job, job_id)
+            yield sse_event("progress", job)
+            while job["status"] == "running":
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=bulk_config["event_poll_seconds"])
+                except asyncio.TimeoutError:
+                    # Also covers jobs run by another worker process, which publishes no events here
+                    job = await asyncio.to_thread(bulk_jobs.get_job, job_id)
+                    yield sse_event("progress", job)
+                    continue
+                if event == "done":
+                    break
+                yield sse_event(event, data)
+            yield sse_event("done", await asyncio.to_thread(bulk_jobs.get_job, job_id))
+        finally:
+            bulk_job_events.unsubscribe(job_id, queue)
+    
+    return event_stream_response(events())
+
+DOCUMENT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
+async def render_document(resume_data: ResumeData, output_format: str, renderer, if_none_match: Optional[str]):
+    """
+    Render resume_data with renderer, reusing cached bytes for identical input.
+    Responds 304 when the client already holds the current ETag.
+    """
+    cache_key = document_cache_key(resume_data, output_format)
+    etag = f'"{cache_key}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    content = document_cache.get(cache_key)
+    if content is None:
+        content = await process_pool.run(renderer, resume_data)
+        document_cache.set(cache_key, content)
+    
+    return StreamingResponse(
+        io.BytesIO(content),
+        media_type=DOCUMENT_MEDIA_TYPES[output_format],
+        headers={
+            "Content-Disposition": f"attachment; filename={resume_data.name.replace(' ', '_')}_resume.{output_format}",
+            "ETag": etag
+        }
+    )
+
+@app.post("/generate-pdf")
+async def generate_pdf_endpoint(resume_data: Optional[ResumeData] = None, resume_id: str = "", if_none_match: Optional[str] = Header(None)):
+    """
+    Generate PDF from resume data, sent in the body or referenced by the resume_id query parameter.
+    """
+    try:
+        return await render_document(await resolve_resume(resume_data, resume_id), "pdf", generate_pdf, if_none_match)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
 
 @app.post("/generate-docx")
-async def generate_docx_endpoint(resume_data: ResumeData):
+async def generate_docx_endpoint(resume_data: Optional[ResumeData] = None, resume_id: str = "", if_none_match: Optional[str] = Header(None)):
     """
-    Generate DOCX from resume data.
+    Generate DOCX from resume data, sent in the body or referenced by the resume_id query parameter.
     """
     try:
-        docx_content = generate_docx(resume_data)
-        
-        return StreamingResponse(
-            io.BytesIO(docx_content),
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={"Content-Disposition": f"attachment; filename={resume_data.name.replace(' ', '_')}_resume.docx"}
-        )
+        return await render_document(await resolve_resume(resume_data, resume_id), "docx", generate_docx, if_none_match)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating DOCX: {str(e)}")
 
+def resume_session_response(record: dict, message: str) -> ResumeSessionResponse:
+    return ResumeSessionResponse(
+        success=True,
+        resume_id=record["id"],
+        version=record["version"],
+        data=record["resume"],
+        message=message
+    )
+
+def expected_session_version(if_match: Optional[str]) -> Optional[int]:
+    """Parse an If-Match header carrying a session version, e.g. `3` or `"3"`."""
+    if if_match is None:
+        return None
+    value = if_match.strip().strip('"')
+    if not value.isdigit():
+        raise HTTPException(status_code=400, detail="If-Match must be a resume version number")
+    return int(value)
+
+def validate_resume_dict(resume: dict) -> dict:
+    """Validate a patched resume as ResumeData and return it normalized, with defaults filled in."""
+    return ResumeData.model_validate(resume).model_dump()
+
+@app.post("/resumes", response_model=ResumeSessionResponse)
+async def create_resume_session(resume_data: ResumeData):
+    """Store a resume and return its resume_id, accepted by every endpoint in place of resume_data."""
+    return resume_session_response(await asyncio.to_thread(resume_sessions.create, resume_data.model_dump()), "Resume stored successfully")
+
+@app.get("/resumes/{resume_id}", response_model=ResumeSessionResponse)
+async def get_resume_session(resume_id: str):
+    """Return a stored resume and its current version."""
+    record = await asyncio.to_thread(resume_sessions.get, resume_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Resume not found or expired. Please upload it again.")
+    return resume_session_response(record, "Resume found")
+
+@app.put("/resumes/{resume_id}", response_model=ResumeSessionResponse)
+async def replace_resume_session(resume_id: str, resume_data: ResumeData, if_match: Optional[str] = Header(None)):
+    """Replace a stored resume. With If-Match, the update is rejected (412) if the resume changed since that version."""
+    try:
+        record = await asyncio.to_thread(resume_sessions.update, resume_id, resume_data.model_dump(), expected_session_version(if_match))
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Resume not found or expired. Please upload it again.")
+    except SessionConflictError:
+        raise HTTPException(status_code=412, detail="Resume was changed by another request. Fetch it and try again.")
+    return resume_session_response(record, "Resume updated successfully")
+
+@app.patch("/resumes/{resume_id}", response_model=ResumeSessionResponse)
+async def patch_resume_session(resume_id: str, operations: list[dict], if_match: Optional[str] = Header(None)):
+    """
+    Update part of a stored resume with JSON Patch (RFC 6902) operations, e.g.
+    [{"op": "replace", "path": "/experience/0/description/1", "value": "..."}].
+    The patch applies entirely or not at all, and the result must still be valid ResumeData (422 otherwise).
+    """
+    try:
+        record = await asyncio.to_thread(resume_sessions.patch, resume_id, operations, validate_resume_dict, expected_session_version(if_match))
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Resume not found or expired. Please upload it again.")
+    except SessionConflictError:
+        raise HTTPException(status_code=412, detail="Resume was changed by another request. Fetch it and try again.")
+    except JsonPatchError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid patch: {str(e)}")
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Patched resume is invalid: {str(e)}")
+    return resume_session_response(record, "Resume updated successfully")
+
+@app.delete("/resumes/{resume_id}")
+async def delete_resume_session(resume_id: str):
+    """Delete a stored resume."""
+    if not await asyncio.to_thread(resume_sessions.delete, resume_id):
+        raise HTTPException(status_code=404, detail="Resume not found or expired")
+    return {"success": True, "message": "Resume deleted"}
+
+def job_description_response(digest: dict, message: str) -> JobDescriptionResponse:
+    return JobDescriptionResponse(
+        success=True,
+        job_description_id=digest["id"],
+        title=digest["title"],
+        seniority=digest["seniority"],
+        min_years_experience=digest["min_years_experience"],
+        degree_required=digest["degree_required"],
+        requirements=digest["requirements"],
+        responsibilities=digest["responsibilities"],
+        required_keywords=[keyword["keyword"] for keyword in digest["keywords"] if keyword["required"]],
+        preferred_keywords=[keyword["keyword"] for keyword in digest["keywords"] if not keyword["required"]],
+        message=message
+    )
+
+@app.post("/job-descriptions", response_model=JobDescriptionResponse)
+async def register_job_description(request: JobDescriptionRequest):
+    """
+    Register a job description once and get an ID to send as job_description_id to the ATS and
+    optimization endpoints. The posting is normalized and its requirements, keywords and seniority
+    extracted up front; registering the same text again returns the same ID.
+    """
+    if not request.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+    return job_description_response(job_registry.register(request.job_description), "Job description registered successfully")
+
+@app.get("/job-descriptions/{job_description_id}", response_model=JobDescriptionResponse)
+async def get_job_description(job_description_id: str):
+    """Return the digest of a registered job description."""
+    digest = job_registry.get(job_description_id)
+    if digest is None:
+        raise HTTPException(status_code=404, detail="Job description not found or expired. Please register it again.")
+    return job_description_response(digest, "Job description found")
+
 @app.post("/analyze-ats", response_model=ATSAnalysisResponse)
 async def analyze_ats(request: ATSAnalysisRequest):
     """
@@ -1329,14 +2510,20 @@ async def analyze_ats(request: ATSAnalysisRequest):
     Returns comprehensive scoring, insights, and recommendations.
     """
     try:
-        if not request.job_description.strip():
-            raise HTTPException(status_code=400, detail="Job description cannot be empty")
+        validate_ats_request(request)
+        resume_data = await resolve_resume(request.resume_data, request.resume_id)
+        job_description, job_digest = resolve_job_description(request.job_description, request.job_description_id)
         
-        if not request.resume_data:
-            raise HTTPException(status_code=400, detail="Resume data is required")
+        if request.mode == "fast":
+            return build_local_ats_analysis(resume_data, job_description, job_digest)
         
         # Perform ATS analysis
-        analysis_result = analyze_resume_with_ats(request.resume_data, request.job_description)
+        analysis_result = await analyze_resume_with_ats(
+            resume_data,
+            job_description,
+            use_cache=request.use_cache,
+            job_digest=job_digest
+        )
         
         return analysis_result
         
@@ -1345,6 +2532,247 @@ async def analyze_ats(request: ATSAnalysisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error during ATS analysis: {str(e)}")
 
+@app.post("/analyze-ats/stream")
+async def analyze_ats_stream(request: ATSAnalysisRequest):
+    """
+    Streaming variant of /analyze-ats.
+    Sends model tokens as Server-Sent "token" events as they arrive; the final "result"
+    event carries the validated ATSAnalysisResponse.
+    """
+    validate_ats_request(request)
+    resume_data = await resolve_resume(request.resume_data, request.resume_id)
+    job_description, job_digest = resolve_job_description(request.job_description, request.job_description_id)
+    cache_key = ats_cache_key(resume_data, job_description)
+    
+    async def events():
+        if request.mode == "fast":
+            yield sse_event("result", build_local_ats_analysis(resume_data, job_description, job_digest).model_dump())
+            return
+        
+        if request.use_cache:
+            cached = ats_cache.get(cache_key)
+            if cached is not None:
+                yield sse_event("result", cached.model_dump())
+                return
+        
+        try:
+            messages = build_ats_messages(resume_data, job_description, job_digest)
+        except HTTPException as e:
+            yield sse_event("error", {"detail": e.detail})
+            return
+        
+        async for event in stream_llm_events(
+            Config.get_openai_config("optimization"),
+            messages,
+            lambda parsed_data: add_requirement_matches(build_ats_analysis(parsed_data), ats_resume_context(resume_data), job_digest),
+            on_result=lambda analysis: ats_cache.set(cache_key, analysis.model_copy(deep=True)),
+            operation="ats_analysis",
+            response_format=ATS_RESPONSE_FORMAT
+        ):
+            yield event
+    
+    return event_stream_response(events())
+
+@app.post("/analyze-ats/multi", response_model=MultiATSAnalysisResponse)
+async def analyze_ats_multi(request: MultiATSAnalysisRequest):
+    """
+    Analyze one resume against several job descriptions and rank them by overall_score.
+    The resume is hashed and rendered into prompt blocks once; the analyses run concurrently
+    (bounded by Config). With prefilter, jobs whose local keyword match is below the threshold
+    get the local score instead of an LLM call.
+    """
+    optimization_config = Config.get_openai_config("optimization")
+    if request.mode not in ATS_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Must be one of: {', '.join(ATS_MODES)}")
+    job_count = len(request.job_descriptions) + len(request.job_description_ids)
+    if not job_count:
+        raise HTTPException(status_code=400, detail="At least one job description is required")
+    if job_count > optimization_config["max_multi_ats_jobs"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many job descriptions. A request can contain at most {optimization_config['max_multi_ats_jobs']}."
+        )
+    
+    resume_data = await resolve_resume(request.resume_data, request.resume_id)
+    jobs = [resolve_job_description(text, "") for text in request.job_descriptions]
+    jobs += [resolve_job_description("", job_id) for job_id in request.job_description_ids]
+    
+    resume_context = ats_resume_context(resume_data)
+    if request.mode == "full":
+        # Render the resume blocks before the analyses start, so they all reuse one rendering
+        resume_block_cache.get(resume_context[1], resume_context[0], prompt_registry.fingerprint(prompt_registry.select_version(resume_context[1])))
+    min_keyword_score = request.min_keyword_score if request.min_keyword_score is not None else optimization_config["ats_prefilter_min_score"]
+    semaphore = asyncio.Semaphore(optimization_config["batch_concurrency"])
+    
+    async def analyze_job(index: int, job_description: str, job_digest: dict) -> MultiATSAnalysisResult:
+        result = MultiATSAnalysisResult(index=index, job_description_id=job_digest["id"], title=job_digest["title"], success=False)
+        keyword_analysis = ats_keyword_analysis(resume_context[0], job_description, job_digest)
+        # A job description without known keywords can't be judged locally, so it is never skipped
+        skip = request.prefilter and keyword_analysis["has_keywords"] and keyword_analysis["keyword_match_score"] < min_keyword_score
+        if request.mode == "fast" or skip:
+            result.analysis = build_local_ats_analysis(resume_data, job_description, job_digest, keyword_analysis, resume_context)
+            result.skipped = request.mode == "full"
+            result.success = True
+            return result
+        async with semaphore:
+            try:
+                result.analysis = await analyze_resume_with_ats(
+                    resume_data,
+                    job_description,
+                    use_cache=request.use_cache,
+                    job_digest=job_digest,
+                    resume_context=resume_context,
+                    keyword_analysis=keyword_analysis
+                )
+                result.success = True
+            except HTTPException as e:
+                result.error = str(e.detail)
+            except Exception as e:
+                result.error = str(e)
+        return result
+    
+    results = await asyncio.gather(*(analyze_job(i, text, digest) for i, (text, digest) in enumerate(jobs)))
+    results.sort(key=lambda result: (not result.success, -(result.analysis.score.overall_score if result.analysis else 0), result.index))
+    failed = sum(1 for result in results if not result.success)
+    skipped = sum(1 for result in results if result.skipped)
+    message = f"Analyzed {len(results) - failed} of {len(results)} job descriptions"
+    if skipped:
+        message += f" ({skipped} scored locally by the pre-filter)"
+    
+    return MultiATSAnalysisResponse(success=failed < len(results), results=results, message=message)
+
+async def prepare_candidate_ranking(request: CandidateRankingRequest) -> tuple[list[CandidateRankingResult], list[ResumeData], str, dict, int]:
+    """
+    Validate a ranking request and run the first pass over every candidate.
+    Returns (first-pass results best first, resumes by index, job description, digest, top K).
+    """
+    ranking_config = Config.RANKING
+    if request.mode not in ATS_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Must be one of: {', '.join(ATS_MODES)}")
+    candidate_count = len(request.resumes) + len(request.resume_ids)
+    if not candidate_count:
+        raise HTTPException(status_code=400, detail="At least one resume is required")
+    if candidate_count > ranking_config["max_candidates"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many resumes. A ranking can contain at most {ranking_config['max_candidates']}."
+        )
+    top_k = request.top_k if request.top_k is not None else ranking_config["top_k"]
+    if not 0 <= top_k <= ranking_config["max_top_k"]:
+        raise HTTPException(status_code=400, detail=f"top_k must be between 0 and {ranking_config['max_top_k']}")
+    
+    job_description, job_digest = resolve_job_description(request.job_description, request.job_description_id)
+    resumes = list(request.resumes) + await resolve_resumes(request.resume_ids)
+    resume_ids = [""] * len(request.resumes) + list(request.resume_ids)
+    
+    ranking = rank_resumes(
+        [ats_resume_dict(resume) for resume in resumes],
+        job_digest["text"],
+        job_digest["keywords"],
+        ranking_config["field_weights"]
+    )
+    results = [
+        CandidateRankingResult(
+            index=index,
+            resume_id=resume_ids[index],
+            name=resumes[index].name,
+            first_pass_rank=rank,
+            first_pass_score=score
+        )
+        for rank, (index, score) in enumerate(ranking, start=1)
+    ]
+    return results, resumes, job_description, job_digest, top_k if request.mode == "full" else 0
+
+async def analyze_top_candidates(results: list[CandidateRankingResult], resumes: list[ResumeData], job_description: str, job_digest: dict, use_cache: bool):
+    """
+    Run the full ATS analysis for the given first-pass results concurrently (bounded by Config),
+    yielding each result as soon as its analysis finishes. Analyses still running are cancelled
+    if the caller stops early, e.g. when a stream's client disconnects.
+    """
+    semaphore = asyncio.Semaphore(Config.RANKING["llm_concurrency"])
+    
+    async def analyze(result: CandidateRankingResult) -> CandidateRankingResult:
+        resume_data = resumes[result.index]
+        async with semaphore:
+            try:
+                result.analysis = await analyze_resume_with_ats(
+                    resume_data,
+                    job_description,
+                    use_cache=use_cache,
+                    job_digest=job_digest,
+                    resume_context=ats_resume_context(resume_data)
+                )
+            except HTTPException as e:
+                result.success = False
+                result.error = str(e.detail)
+            except Exception as e:
+                result.success = False
+                result.error = str(e)
+        return result
+    
+    tasks = [asyncio.create_task(analyze(result)) for result in results]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def order_ranked_candidates(results: list[CandidateRankingResult]) -> list[CandidateRankingResult]:
+    """Analyzed candidates by overall_score, then the rest (including failed analyses) by first-pass rank."""
+    return sorted(results, key=lambda result: (
+        result.analysis is None,
+        -(result.analysis.score.overall_score if result.analysis else 0),
+        result.first_pass_rank
+    ))
+
+def candidate_ranking_message(results: list[CandidateRankingResult], top_k: int) -> str:
+    if top_k == 0:
+        return f"Ranked {len(results)} candidates by first-pass score"
+    analyzed = sum(1 for result in results[:top_k] if result.success)
+    return f"Ranked {len(results)} candidates; {analyzed} of the top {min(top_k, len(results))} analyzed in full"
+
+@app.post("/rank-candidates", response_model=CandidateRankingResponse)
+async def rank_candidates(request: CandidateRankingRequest):
+    """
+    Rank many resumes against one job description.
+    Every candidate is scored locally with BM25 over the resume fields; only the top_k go through
+    the full ATS analysis, concurrently. Use /rank-candidates/stream to get analyses as they finish.
+    """
+    results, resumes, job_description, job_digest, top_k = await prepare_candidate_ranking(request)
+    async for _ in analyze_top_candidates(results[:top_k], resumes, job_description, job_digest, request.use_cache):
+        pass
+    return CandidateRankingResponse(
+        success=top_k == 0 or any(result.success for result in results[:top_k]),
+        job_description_id=job_digest["id"],
+        results=order_ranked_candidates(results),
+        message=candidate_ranking_message(results, top_k)
+    )
+
+@app.post("/rank-candidates/stream")
+async def rank_candidates_stream(request: CandidateRankingRequest):
+    """
+    Streaming variant of /rank-candidates.
+    Sends a "ranking" event with the first-pass results for every candidate, a "result" event per
+    top-K candidate as its analysis finishes, and a final "done" event with the indexes in final order.
+    """
+    results, resumes, job_description, job_digest, top_k = await prepare_candidate_ranking(request)
+    
+    async def events():
+        yield sse_event("ranking", {
+            "job_description_id": job_digest["id"],
+            "top_k": top_k,
+            "results": [result.model_dump() for result in results]
+        })
+        async for result in analyze_top_candidates(results[:top_k], resumes, job_description, job_digest, request.use_cache):
+            yield sse_event("result", result.model_dump())
+        yield sse_event("done", {
+            "order": [result.index for result in order_ranked_candidates(results)],
+            "message": candidate_ranking_message(results, top_k)
+        })
+    
+    return event_stream_response(events())
+
 @app.post("/optimize-section", response_model=SectionOptimizationResponse)
 async def optimize_section(request: SectionOptimizationRequest):
     """
@@ -1352,38 +2780,18 @@ async def optimize_section(request: SectionOptimizationRequest):
     Supports chatbot-style optimization with custom prompts.
     """
     try:
-        if not request.job_description.strip():
-            raise HTTPException(status_code=400, detail="Job description cannot be empty")
-        
-        if not request.resume_data:
-            raise HTTPException(status_code=400, detail="Resume data is required")
-        
-        if not request.section.strip():
-            raise HTTPException(status_code=400, detail="Section name is required")
-        
-        if not request.section_data:
-            raise HTTPException(status_code=400, detail="Section data is required")
-        
-        # Validate section name
-        valid_sections = [
-            "summary", "experience", "skills", "education", "projects", 
-            "publications", "certifications", "volunteer_experience", 
-            "awards", "languages", "references"
-        ]
-        
-        if request.section not in valid_sections:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid section. Must be one of: {', '.join(valid_sections)}"
-            )
+        validate_section_optimization_request(request)
+        resume_data = await resolve_resume(request.resume_data, request.resume_id)
+        job_description, job_digest = resolve_job_description(request.job_description, request.job_description_id)
         
         # Perform section optimization
-        optimization_result = optimize_section_with_chatgpt(
-            request.resume_data,
-            request.job_description,
+        optimization_result = await optimize_section_with_chatgpt(
+            resume_data,
+            job_description,
             request.section,
             request.section_data,
-            request.custom_prompt
+            request.custom_prompt,
+            job_digest
         )
         
         return optimization_result
@@ -1393,6 +2801,94 @@ async def optimize_section(request: SectionOptimizationRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error during section optimization: {str(e)}")
 
+@app.post("/optimize-section/stream")
+async def optimize_section_stream(request: SectionOptimizationRequest):
+    """
+    Streaming variant of /optimize-section.
+    Sends model tokens as Server-Sent "token" events as they arrive; the final "result"
+    event carries the validated SectionOptimizationResponse.
+    """
+    validate_section_optimization_request(request)
+    resume_data = await resolve_resume(request.resume_data, request.resume_id)
+    job_description, job_digest = resolve_job_description(request.job_description, request.job_description_id)
+    bullet_priority = bullet_rewrite_priority(request.section, request.section_data, job_digest)
+    
+    def build_result(parsed_data: dict) -> SectionOptimizationResponse:
+        optimization = build_section_optimization(parsed_data)
+        optimization.bullet_priority = bullet_priority
+        return optimization
+    
+    return event_stream_response(stream_llm_events(
+        Config.get_openai_config("optimization"),
+        build_section_optimization_messages(
+            resume_data,
+            job_description,
+            request.section,
+            request.section_data,
+            request.custom_prompt,
+            bullet_priority
+        ),
+        build_result,
+        operation="section_optimization",
+        response_format=SECTION_OPTIMIZATION_RESPONSE_FORMAT
+    ))
+
+@app.post("/optimize-sections/batch", response_model=SectionBatchOptimizationResponse)
+async def optimize_sections_batch(request: SectionBatchOptimizationRequest):
+    """
+    Optimize several items of one resume section in a single request.
+    Items are optimized concurrently (bounded by Config) and returned in request order,
+    with per-item errors instead of failing the whole batch.
+    """
+    optimization_config = Config.get_openai_config("optimization")
+    resume_data = await resolve_resume(request.resume_data, request.resume_id)
+    job_description, job_digest = resolve_job_description(request.job_description, request.job_description_id)
+    
+    if request.section not in VALID_SECTIONS:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Invalid section. Must be one of: {', '.join(VALID_SECTIONS)}"
+        )
+    
+    if not request.items:
+        raise HTTPException(status_code=400, detail="At least one item is required")
+    
+    if len(request.items) > optimization_config["max_batch_items"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items. A batch can contain at most {optimization_config['max_batch_items']} items."
+        )
+    
+    semaphore = asyncio.Semaphore(optimization_config["batch_concurrency"])
+    
+    async def optimize_item(index: int, item: SectionBatchItem) -> SectionBatchItemResult:
+        if not item.section_data:
+            return SectionBatchItemResult(index=index, success=False, error="Section data is required")
+        async with semaphore:
+            try:
+                result = await optimize_section_with_chatgpt(
+                    resume_data,
+                    job_description,
+                    request.section,
+                    item.section_data,
+                    item.custom_prompt or request.custom_prompt,
+                    job_digest
+                )
+                return SectionBatchItemResult(index=index, success=True, result=result)
+            except HTTPException as e:
+                return SectionBatchItemResult(index=index, success=False, error=str(e.detail))
+            except Exception as e:
+                return SectionBatchItemResult(index=index, success=False, error=str(e))
+    
+    results = await asyncio.gather(*(optimize_item(i, item) for i, item in enumerate(request.items)))
+    failed = sum(1 for result in results if not result.success)
+    
+    return SectionBatchOptimizationResponse(
+        success=failed < len(results),
+        results=results,
+        message=f"Optimized {len(results) - failed} of {len(results)} items"
+    )
+
 if __name__ == "__main__":
     import uvicorn
     server_config = Config.SERVER
@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Optional
+from cache import TTLCache
+
+PROMPTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
+
+# $name or ${name} placeholders; $$ is a literal dollar sign. JSON braces need no escaping.
+PLACEHOLDER_PATTERN = re.compile(r"\$(?:(\$)|([A-Za-z_][A-Za-z0-9_]*)|\{([A-Za-z_][A-Za-z0-9_]*)\})")
+
+
+class PromptTemplate:
+    """A prompt template compiled once into literal text and placeholder segments."""
+
+    def __init__(self, name: str, version: str, text: str):
+        self.name = name
+        self.version = version
+        self.segments = []  # (is_placeholder, literal text or placeholder name)
+        position = 0
+        literal = []
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            literal.append(text[position:match.start()])
+            position = match.end()
+            if match.group(1):
+                literal.append("$")
+                continue
+            self.segments.append((False, "".join(literal)))
+            self.segments.append((True, match.group(2) or match.group(3)))
+            literal = []
+        literal.append(text[position:])
+        self.segments.append((False, "".join(literal)))
+        self.placeholders = {value for is_placeholder, value in self.segments if is_placeholder}
+        # Text before the first placeholder is identical on every render: the cacheable prompt prefix
+        self.static_prefix = self.segments[0][1]
+
+    def render(self, **values) -> str:
+        """Fill in the placeholders. Missing values raise KeyError; extra values are ignored."""
+        return "".join(str(values[value]) if is_placeholder else value for is_placeholder, value in self.segments)
+
+
+class PromptRegistry:
+    """
+    Versioned prompt templates loaded from prompts/<version>/<name>.txt and compiled once.
+    prompts/manifest.json names the active version and optional A/B variant weights, e.g.
+    {"active": "v1", "variants": {"v1": 90, "v2": 10}}. Calling load() again picks up edited
+    files and weights without a redeploy.
+    """
+
+    def __init__(self, directory: str = PROMPTS_DIRECTORY):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.templates = {}  # version -> name -> PromptTemplate
+        self.active = ""
+        self.variants = {}  # version -> weight
+        self.fingerprints = {}  # version -> "<version>:<digest of its template files>"
+        self.loaded_at = 0.0
+        self._render_stats = {}  # (version, name) -> [renders, total seconds]
+        self.load()
+
+    def load(self) -> None:
+        """(Re)load the manifest and every template version, replacing the current set only if all are valid."""
+        with open(os.path.join(self.directory, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        templates = {}
+        fingerprints = {}
+        for version in sorted(os.listdir(self.directory)):
+            version_directory = os.path.join(self.directory, version)
+            if not os.path.isdir(version_directory):
+                continue
+            templates[version] = {}
+            digest = hashlib.sha256()
+            for filename in sorted(os.listdir(version_directory)):
+                if filename.endswith(".txt"):
+                    name = filename[:-4]
+                    with open(os.path.join(version_directory, filename), encoding="utf-8") as f:
+                        text = f.read()
+                    templates[version][name] = PromptTemplate(name, version, text)
+                    digest.update(f"{name}\0{text}\0".encode("utf-8"))
+            fingerprints[version] = f"{version}:{digest.hexdigest()[:16]}"
+
+        active = manifest["active"]
+        variants = {version: weight for version, weight in manifest.get("variants", {}).items() if weight > 0}
+        for version in [active, *variants]:
+            if version not in templates:
+                raise ValueError(f"Prompt version {version!r} has no directory under {self.directory}")
+            missing = set(templates[active]) - set(templates[version])
+            if missing:
+                raise ValueError(f"Prompt version {version!r} is missing templates: {', '.join(sorted(missing))}")
+
+        with self._lock:
+            self.templates = templates
+            self.fingerprints = fingerprints
+            self.active = active
+            self.variants = variants
+            self.loaded_at = time.time()
+
+    def select_version(self, routing_key: str = "") -> str:
+        """
+        Pick the prompt version for a request. With A/B variants configured, the routing key
+        (e.g. a resume hash) is hashed into a weighted bucket, so the same input always gets the
+        same version and its cache entries stay valid.
+        """
+        variants = self.variants
+        if not variants:
+            return self.active
+        total = sum(variants.values())
+        bucket = int(hashlib.sha256(routing_key.encode("utf-8")).hexdigest()[:8], 16) % total
+        for version, weight in sorted(variants.items()):
+            if bucket < weight:
+                return version
+            bucket -= weight
+        return self.active
+
+    def fingerprint(self, version: Optional[str] = None) -> str:
+        """
+        The version plus a digest of its template files, for cache keys: a reload that edits a
+        version's files changes its fingerprint, so entries built from the old text are not reused.
+        """
+        return self.fingerprints[version or self.active]
+
+    def get(self, name: str, version: Optional[str] = None) -> PromptTemplate:
+        return self.templates[version or self.active][name]
+
+    def has(self, name: str, version: Optional[str] = None) -> bool:
+        return name in self.templates.get(version or self.active, {})
+
+    def render(self, template_name: str, version: Optional[str] = None, /, **values) -> str:
+        """Render a template and record how long it took."""
+        template = self.get(template_name, version)
+        start = time.perf_counter()
+        text = template.render(**values)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats = self._render_stats.setdefault((template.version, template_name), [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+        return text
+
+    def stats(self) -> dict:
+        with self._lock:
+            renders = {
+                f"{version}/{name}": {"renders": count, "avg_render_us": round(1e6 * total / count, 1)}
+                for (version, name), (count, total) in sorted(self._render_stats.items())
+            }
+        return {
+            "active": self.active,
+            "variants": self.variants,
+            "versions": sorted(self.templates),
+            "fingerprints": dict(self.fingerprints),
+            "loaded_at": self.loaded_at,
+            "renders": renders
+        }
+
+
+def render_resume_blocks(resume: dict) -> dict[str, str]:
+    """Render the ResumeData (as a dict) fields the prompt templates use into text blocks."""
+    return {
+        "name": resume.get("name", ""),
+        "email": resume.get("email", ""),
+        "location": resume.get("location", ""),
+        "summary": resume.get("summary", ""),
+        "skills": ", ".join(resume.get("skills", [])),
+        "experience": "\n".join(
+            f"- {exp['position']} at {exp['company']} ({exp['duration']}): {'; '.join(exp['description'])}"
+            for exp in resume.get("experience", [])
+        ),
+        "education": "\n".join(
+            f"- {edu['degree']} from {edu['institution']} ({edu['year']})" for edu in resume.get("education", [])
+        ),
+        "projects": "\n".join(
+            f"- {proj['name']}: {'; '.join(proj['description'])} (Technologies: {proj.get('technologies', '')})"
+            for proj in resume.get("projects", [])
+        ),
+        "certifications": "\n".join(
+            f"- {cert['name']} from {cert['issuer']} ({cert.get('year', '')})" for cert in resume.get("certifications", [])
+        )
+    }
+
+
+class ResumeBlockCache:
+    """
+    Memoizes render_resume_blocks per resume hash and template fingerprint (PromptRegistry.fingerprint),
+    so repeated prompts for one resume render it once, and a reload or A/B variant gets its own blocks.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = TTLCache(max_entries, ttl_seconds)
+
+    def get(self, resume_hash: str, resume: dict, template_fingerprint: str) -> dict[str, str]:
+        key = f"{template_fingerprint}:{resume_hash}"
+        blocks = self._cache.get(key)
+        if blocks is None:
+            blocks = render_resume_blocks(resume)
+            self._cache.set(key, blocks)
+        return blocks
+
+    def stats(self) -> dict:
+        return self._cache.stats()
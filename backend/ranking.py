@@ -0,0 +1,83 @@
+import numpy as np
+from ats_engine import tokenize, resume_text_fields
+
+# Words too common in job postings to say anything about a candidate
+STOPWORDS = frozenset(
+    "a about an and are as at be by can do for from have in into is it of on or our that the their this to "
+    "we will with you your who what work working team teams role strong ability experience years year plus "
+    "including such other using use new well across etc".split()
+)
+
+# Query term weights: plain job description words, lexicon/extracted keywords, and required keywords
+QUERY_WORD_WEIGHT = 1.0
+KEYWORD_WEIGHT = 2.0
+REQUIRED_KEYWORD_WEIGHT = 3.0
+
+BM25_K1 = 1.2  # Term frequency saturation
+BM25_B = 0.75  # Resume length normalization
+
+
+def job_query_weights(job_description: str, keywords: list[dict]) -> dict[str, float]:
+    """Lowercased query terms of a job description with their weights; keyword tokens outweigh other words."""
+    weights = {}
+    for token in tokenize(job_description):
+        token = token.lower()
+        if token not in STOPWORDS and len(token) > 1:
+            weights[token] = QUERY_WORD_WEIGHT
+    for keyword in keywords:
+        weight = REQUIRED_KEYWORD_WEIGHT if keyword["required"] else KEYWORD_WEIGHT
+        for token in tokenize(keyword["keyword"]):
+            token = token.lower()
+            weights[token] = max(weights.get(token, 0.0), weight)
+    return weights
+
+
+def bm25_scores(resumes: list[dict], query_weights: dict[str, float], field_weights: dict[str, float]) -> np.ndarray:
+    """
+    BM25 score of each resume (ResumeData as a dict) for the weighted query, as a float32 array.
+    Term counts come from the resume_text_fields groups, each occurrence counted with its field's weight,
+    so a skill listed under skills outweighs a passing mention. Scoring is one vectorized pass over a
+    candidates x query terms matrix.
+    """
+    terms = list(query_weights)
+    n_docs, n_terms = len(resumes), len(terms)
+    if not n_docs or not n_terms:
+        return np.zeros(n_docs, dtype=np.float32)
+    vocabulary = {term: column for column, term in enumerate(terms)}
+
+    cells = []  # Flat (resume, term) index of every query term occurrence
+    cell_weights = []
+    lengths = np.zeros(n_docs, dtype=np.float32)
+    for row, resume in enumerate(resumes):
+        for field, text in resume_text_fields(resume).items():
+            weight = field_weights.get(field, 1.0)
+            tokens = tokenize(text)
+            lengths[row] += weight * len(tokens)
+            offset = row * n_terms
+            for token in tokens:
+                column = vocabulary.get(token.lower())
+                if column is not None:
+                    cells.append(offset + column)
+                    cell_weights.append(weight)
+    term_counts = np.bincount(
+        np.asarray(cells, dtype=np.int64), weights=np.asarray(cell_weights, dtype=np.float64), minlength=n_docs * n_terms
+    ).astype(np.float32).reshape(n_docs, n_terms)
+
+    document_frequency = np.count_nonzero(term_counts, axis=0)
+    idf = np.log1p((n_docs - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+    average_length = float(lengths.mean()) or 1.0
+    length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+    saturated = term_counts * (BM25_K1 + 1) / (term_counts + length_norm[:, None])
+    query = np.fromiter((query_weights[term] for term in terms), dtype=np.float32, count=n_terms)
+    return saturated @ (idf * query)
+
+
+def rank_resumes(resumes: list[dict], job_description: str, keywords: list[dict], field_weights: dict[str, float]) -> list[tuple[int, float]]:
+    """
+    Rank resumes for a job description by BM25. Returns (resume index, score) best first, with scores
+    scaled to 0-100 relative to the best candidate; ties keep the input order.
+    """
+    scores = bm25_scores(resumes, job_query_weights(job_description, keywords), field_weights)
+    order = np.argsort(-scores, kind="stable")
+    best = float(scores[order[0]]) if len(order) else 0.0
+    return [(int(index), round(100 * float(scores[index]) / best, 1) if best > 0 else 0.0) for index in order]
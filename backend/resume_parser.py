@@ -0,0 +1,467 @@
+import re
+from collections import Counter
+from typing import Optional
+
+# Section headings, matched against the whole line after normalization (lowercase, "&" -> "and", no punctuation)
+SECTION_HEADINGS = {
+    "summary": [
+        "summary", "professional summary", "career summary", "profile", "professional profile", "objective",
+        "career objective", "about me", "about"
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience", "employment",
+        "employment history", "work history", "career history", "professional background"
+    ],
+    "education": ["education", "academic background", "education and training", "academics", "academic history"],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills", "core competencies", "competencies",
+        "technologies", "skills and tools", "tools and technologies", "skills and technologies", "technical proficiencies"
+    ],
+    "projects": ["projects", "personal projects", "selected projects", "key projects", "academic projects", "side projects"],
+    "certifications": [
+        "certifications", "certificates", "licenses", "licenses and certifications", "certifications and licenses",
+        "professional certifications"
+    ],
+    "publications": ["publications", "selected publications", "papers", "research"],
+    "volunteer_experience": [
+        "volunteer experience", "volunteering", "volunteer work", "community involvement", "community service"
+    ],
+    "awards": ["awards", "honors", "awards and honors", "honors and awards", "achievements", "awards and achievements"],
+    "languages": ["languages", "spoken languages"],
+    "references": ["references"]
+}
+HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# North American numbers with an optional country code, or any "+<country code>" number in 2-6 digit groups
+PHONE_PATTERN = re.compile(
+    r"(?<![\w/])(?:(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{3}\)|\d{3})[\s.-]?\d{3}[\s.-]?\d{4}|\+\d{1,3}(?:[ .-]?\(?\d{1,5}\)?){2,6})(?![\w/])"
+)
+URL_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}(?:/[^\s|,;]*)?")
+# "San Francisco, CA", "London, UK", "São Paulo, SP" or "Remote"
+LOCATION_PATTERN = re.compile(r"\b[A-ZÀ-Þ][A-Za-zÀ-ÿ.'-]+(?: [A-ZÀ-Þ][A-Za-zÀ-ÿ.'-]+){0,2},\s*[A-Z]{2}\b|\bRemote\b")
+
+MONTH = (
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|"
+    r"Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?"
+)
+DATE = rf"(?:{MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|(?:19|20)\d{{2}})"
+DATE_RANGE_PATTERN = re.compile(
+    rf"\(?{DATE}\s*(?:-|–|—|to)\s*(?:{DATE}|Present|Current|Now|Today)\)?", re.IGNORECASE
+)
+SINGLE_DATE_PATTERN = re.compile(rf"\(?(?:Expected\s+)?{DATE}\)?", re.IGNORECASE)
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+BULLET_PATTERN = re.compile(r"^\s*(?:[•●▪■◦‣∙·*\-–—>]|\d{1,2}[.)])\s+")
+# Separators between the parts of an entry header such as "Engineer | Acme Corp | 2020 - 2022"
+PART_SEPARATOR_PATTERN = re.compile(r"\s+[|•·–—-]\s+|\s*\|\s*|\t+|\s{3,}|,\s+(?=[A-Z])")
+# "Engineer at Acme Corp" also separates the parts of a role header
+ROLE_SEPARATOR_PATTERN = re.compile(rf"{PART_SEPARATOR_PATTERN.pattern}|\s+at\s+|\s+@\s+")
+PAGE_NUMBER_PATTERN = re.compile(r"^(?:page\s+)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$", re.IGNORECASE)
+
+POSITION_WORDS = re.compile(
+    r"\b(engineer|developer|manager|analyst|intern|designer|scientist|lead|director|consultant|specialist|"
+    r"architect|administrator|coordinator|assistant|associate|officer|head|president|founder|co-founder|"
+    r"programmer|researcher|technician|representative|supervisor|executive|tutor|teacher|instructor|"
+    r"volunteer|mentor|organizer|member|chair|captain|fellow|contractor|freelancer|sre|devops)\b",
+    re.IGNORECASE
+)
+INSTITUTION_WORDS = re.compile(r"\b(university|college|institute|school|academy|polytechnic|conservatory)\b", re.IGNORECASE)
+DEGREE_WORDS = re.compile(
+    r"\b(bachelor|master|doctor|ph\.?d|mba|associate|diploma|certificate|b\.?s\.?c?|m\.?s\.?c?|b\.?a|m\.?a|"
+    r"b\.?eng|m\.?eng|b\.?tech|m\.?tech)\b",
+    re.IGNORECASE
+)
+GPA_PATTERN = re.compile(r"\bGPA\s*[:\-]?\s*([0-9](?:\.[0-9]{1,2})?(?:\s*/\s*[0-9](?:\.[0-9]{1,2})?)?)", re.IGNORECASE)
+COURSEWORK_PATTERN = re.compile(r"^(?:relevant\s+)?coursework\s*[:\-]\s*(.+)$", re.IGNORECASE)
+TECHNOLOGIES_PATTERN = re.compile(r"^(?:technologies|tech stack|tech|tools|built with|stack)\s*[:\-]\s*(.+)$", re.IGNORECASE)
+SKILL_SEPARATOR_PATTERN = re.compile(r"\s*[,;|•·]\s*")
+
+
+def clean_resume_text(text: str) -> str:
+    """
+    Normalize extracted resume text: collapse runs of spaces, drop blank lines and page numbers, and
+    drop short lines repeated on every page (running headers and footers).
+    """
+    lines = [re.sub(r"[  ]{2,}", "   ", line).strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not PAGE_NUMBER_PATTERN.match(line)]
+    counts = Counter(lines)
+    repeated = {line for line, count in counts.items() if count >= 3 and len(line) <= 60 and not BULLET_PATTERN.match(line)}
+    return "\n".join(line for line in lines if line not in repeated)
+
+
+def heading_section(line: str) -> Optional[str]:
+    """Return the section a heading line introduces, or None if the line is not a heading."""
+    if len(line) > 40 or BULLET_PATTERN.match(line):
+        return None
+    normalized = line.lower().replace("&", " and ")
+    normalized = re.sub(r"[^a-z ]", " ", normalized)
+    normalized = " ".join(normalized.split())
+    return HEADING_LOOKUP.get(normalized)
+
+
+def segment_sections(text: str) -> dict[str, list[str]]:
+    """Split cleaned resume text into sections by heading; lines before the first heading go to "header"."""
+    sections = {"header": []}
+    current = "header"
+    for line in clean_resume_text(text).splitlines():
+        section = heading_section(line)
+        if section is not None:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return sections
+
+
+def strip_bullet(line: str) -> str:
+    return BULLET_PATTERN.sub("", line, count=1).strip()
+
+
+def split_parts(text: str, separator: re.Pattern = PART_SEPARATOR_PATTERN) -> list[str]:
+    """Split an entry header line into its parts, e.g. position, company and location."""
+    return [part.strip(" ,|()") for part in separator.split(text) if part.strip(" ,|()")]
+
+
+def find_date(text: str) -> tuple[str, str]:
+    """Return (date text, text with the date removed), preferring a date range over a single date."""
+    match = DATE_RANGE_PATTERN.search(text) or SINGLE_DATE_PATTERN.search(text)
+    if not match:
+        return "", text
+    date = match.group(0).strip("() ")
+    return date, (text[:match.start()] + "   " + text[match.end():]).strip()
+
+
+def split_entries(lines: list[str]) -> list[dict]:
+    """
+    Group a section's lines into entries of header lines and bullet points.
+    A new entry starts at a non-bullet line once the current entry has bullets, or when a second
+    dated line appears. Lines after a bullet that do not start with a capital are wrapped continuations.
+    """
+    entries = []
+    current = None
+    for line in lines:
+        if BULLET_PATTERN.match(line):
+            if current is None:
+                current = {"header": [], "bullets": [], "paragraph": False}
+                entries.append(current)
+            current["bullets"].append(strip_bullet(line))
+            continue
+        has_date = bool(DATE_RANGE_PATTERN.search(line))
+        if current is not None and current["bullets"] and not line[:1].isupper() and not has_date:
+            current["bullets"][-1] += " " + line
+            continue
+        header_has_date = current is not None and any(DATE_RANGE_PATTERN.search(h) for h in current["header"])
+        if current is None or current["bullets"] or (has_date and header_has_date):
+            current = {"header": [], "bullets": [], "paragraph": False}
+            entries.append(current)
+        # Long sentences right after the header are a paragraph-style description
+        if current["header"] and (len(line) > 90 or line.endswith(".")):
+            current["bullets"].append(line)
+            current["paragraph"] = True
+        else:
+            current["header"].append(line)
+    return entries
+
+
+def split_sentences(text: str) -> list[str]:
+    return [sentence.strip() for sentence in re.split(r"(?<=[.!?])\s+(?=[A-Z])", text) if sentence.strip()]
+
+
+def entry_title_parts(header: list[str], separator: re.Pattern = PART_SEPARATOR_PATTERN) -> tuple[str, list[str]]:
+    """Return (date, parts) for an entry header, with locations dropped."""
+    date = ""
+    parts = []
+    for line in header:
+        if not date:
+            line_date, line = find_date(line)
+            date = line_date
+        parts.extend(split_parts(LOCATION_PATTERN.sub("   ", line), separator))
+    return date, parts
+
+
+def parse_role_entry(entry: dict, organization_key: str) -> dict:
+    """Parse an experience or volunteer entry into position, organization, duration and description."""
+    duration, parts = entry_title_parts(entry["header"], ROLE_SEPARATOR_PATTERN)
+    position, organization = "", ""
+    position_parts = [part for part in parts if POSITION_WORDS.search(part)]
+    if position_parts:
+        position = position_parts[0]
+        others = [part for part in parts if part != position]
+        organization = others[0] if others else ""
+    elif parts:
+        position = parts[0]
+        organization = parts[1] if len(parts) > 1 else ""
+    description = []
+    for bullet in entry["bullets"]:
+        description.extend(split_sentences(bullet) if len(bullet) > 200 else [bullet])
+    return {"position": position, organization_key: organization, "duration": duration, "description": description}
+
+
+def parse_contact(lines: list[str]) -> dict:
+    """Pull name, email, phone, profile links and location out of the header lines."""
+    contact = {
+        "name": "", "email": "", "phone": "", "location": "",
+        "github_profile": "", "linkedin_profile": "", "website": ""
+    }
+    text = "\n".join(lines)
+    email = EMAIL_PATTERN.search(text)
+    if email:
+        contact["email"] = email.group(0)
+    phone = PHONE_PATTERN.search(text)
+    if phone:
+        contact["phone"] = phone.group(0).strip()
+    for url in URL_PATTERN.findall(EMAIL_PATTERN.sub(" ", text)):
+        lowered = url.lower()
+        if "linkedin.com" in lowered and not contact["linkedin_profile"]:
+            contact["linkedin_profile"] = url
+        elif "github.com" in lowered and not contact["github_profile"]:
+            contact["github_profile"] = url
+        elif not contact["website"] and not re.fullmatch(r"[\d.]+", url):
+            contact["website"] = url
+    location = LOCATION_PATTERN.search(EMAIL_PATTERN.sub(" ", text))
+    if location:
+        contact["location"] = location.group(0)
+    for line in lines:
+        candidate = line.strip()
+        if (
+            candidate and not EMAIL_PATTERN.search(candidate) and not PHONE_PATTERN.search(candidate)
+            and not URL_PATTERN.fullmatch(candidate) and len(candidate.split()) <= 5 and not any(c.isdigit() for c in candidate)
+        ):
+            contact["name"] = split_parts(candidate)[0] if split_parts(candidate) else candidate
+            break
+    return contact
+
+
+def parse_skills(lines: list[str]) -> list[str]:
+    skills = []
+    for line in lines:
+        line = strip_bullet(line)
+        # "Languages: Python, Go" -> "Python, Go"
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for skill in SKILL_SEPARATOR_PATTERN.split(line):
+            skill = skill.strip(" .")
+            if skill and len(skill) <= 50 and skill not in skills:
+                skills.append(skill)
+    return skills
+
+
+def parse_education(lines: list[str]) -> list[dict]:
+    education = []
+    for entry in split_entries(lines):
+        degree = institution = year = gpa = coursework = ""
+        for line in entry["header"] + entry["bullets"]:
+            coursework_match = COURSEWORK_PATTERN.match(line)
+            if coursework_match:
+                coursework = coursework_match.group(1).strip()
+                continue
+            gpa_match = GPA_PATTERN.search(line)
+            if gpa_match and not gpa:
+                gpa = gpa_match.group(1).replace(" ", "")
+                line = GPA_PATTERN.sub("", line)
+            years = YEAR_PATTERN.findall(line)
+            if years and not year:
+                year = years[-1]
+            _, line = find_date(line)
+            for part in split_parts(LOCATION_PATTERN.sub("   ", line)):
+                if INSTITUTION_WORDS.search(part) and not institution:
+                    institution = part
+                elif DEGREE_WORDS.search(part) and not degree:
+                    degree = part
+        if degree or institution:
+            education.append({
+                "degree": degree, "institution": institution, "year": year, "gpa": gpa,
+                "relevant_coursework": coursework
+            })
+    return education
+
+
+def parse_projects(lines: list[str]) -> list[dict]:
+    projects = []
+    for entry in split_entries(lines):
+        duration, parts = entry_title_parts(entry["header"])
+        url = technologies = ""
+        name_parts = []
+        for part in parts:
+            technologies_match = TECHNOLOGIES_PATTERN.match(part)
+            if technologies_match:
+                technologies = technologies_match.group(1)
+            elif URL_PATTERN.fullmatch(part) and "." in part:
+                url = url or part
+            else:
+                name_parts.append(part)
+        description = []
+        for bullet in entry["bullets"]:
+            technologies_match = TECHNOLOGIES_PATTERN.match(bullet)
+            if technologies_match:
+                technologies = technologies_match.group(1)
+            else:
+                description.append(bullet)
+        if name_parts and not technologies and len(name_parts) > 1:
+            technologies = ", ".join(name_parts[1:])
+        if name_parts:
+            projects.append({
+                "name": name_parts[0], "description": description, "technologies": technologies,
+                "url": url, "duration": duration
+            })
+    return projects
+
+
+def parse_certifications(lines: list[str]) -> list[dict]:
+    certifications = []
+    for line in lines:
+        date, line = find_date(strip_bullet(line))
+        parts = split_parts(line)
+        if parts:
+            certifications.append({
+                "name": parts[0], "issuer": parts[1] if len(parts) > 1 else "",
+                "year": date, "expiry": ""
+            })
+    return certifications
+
+
+def parse_publications(lines: list[str]) -> list[dict]:
+    publications = []
+    for entry in split_entries(lines):
+        text = " ".join(entry["header"] + entry["bullets"])
+        url_match = re.search(r"https?://\S+", text)
+        quoted = re.search(r"[\"“]([^\"”]+)[\"”]", text)
+        years = YEAR_PATTERN.findall(text)
+        if quoted:
+            title = quoted.group(1).strip(" .,")
+            journal = text[quoted.end():].strip(" .,")
+            authors = text[:quoted.start()].strip(" .,")
+        else:
+            parts = [part.strip() for part in re.split(r"\.\s+", text) if part.strip()]
+            title = parts[0] if parts else text
+            journal = parts[1] if len(parts) > 1 else ""
+            authors = ""
+        journal = YEAR_PATTERN.sub("", journal).strip(" .,()") if journal else ""
+        publications.append({
+            "title": title, "journal": journal, "year": years[-1] if years else "",
+            "authors": authors, "url": url_match.group(0) if url_match else ""
+        })
+    return publications
+
+
+def parse_references(lines: list[str]) -> list[dict]:
+    references = []
+    for entry in split_entries(lines):
+        text = " ".join(entry["header"])
+        if "request" in text.lower():
+            continue
+        parts = split_parts(text)
+        contact = [part for part in parts if EMAIL_PATTERN.search(part) or PHONE_PATTERN.search(part)]
+        others = [part for part in parts if part not in contact]
+        if others:
+            references.append({
+                "name": others[0], "title": others[1] if len(others) > 1 else "",
+                "company": others[2] if len(others) > 2 else "", "contact": ", ".join(contact)
+            })
+    return references
+
+
+def parse_list(lines: list[str], split_commas: bool = False) -> list[str]:
+    items = []
+    for line in lines:
+        line = strip_bullet(line)
+        items.extend(SKILL_SEPARATOR_PATTERN.split(line) if split_commas else [line])
+    return [item.strip() for item in items if item.strip()]
+
+
+def parse_sections(sections: dict[str, list[str]]) -> dict:
+    """Parse segmented resume sections (see segment_sections) into a ResumeData-shaped dict."""
+    contact = parse_contact(sections.get("header", [])[:8])
+    summary_lines = sections.get("summary", [])
+    return {
+        **contact,
+        "summary": " ".join(strip_bullet(line) for line in summary_lines),
+        "experience": [
+            parse_role_entry(entry, "company") for entry in split_entries(sections.get("experience", []))
+            if entry["header"]
+        ],
+        "education": parse_education(sections.get("education", [])),
+        "skills": parse_skills(sections.get("skills", [])),
+        "projects": parse_projects(sections.get("projects", [])),
+        "publications": parse_publications(sections.get("publications", [])),
+        "certifications": parse_certifications(sections.get("certifications", [])),
+        "volunteer_experience": [
+            parse_role_entry(entry, "organization") for entry in split_entries(sections.get("volunteer_experience", []))
+            if entry["header"]
+        ],
+        "awards": parse_list(sections.get("awards", [])),
+        "languages": parse_list(sections.get("languages", []), split_commas=True),
+        "references": parse_references(sections.get("references", []))
+    }
+
+
+def parse_resume_text(text: str) -> dict:
+    """
+    Parse extracted resume text into a ResumeData-shaped dict with regexes and heuristics, without an LLM.
+    Sections are found by heading, entries by dates and bullets, and contact details by pattern.
+    """
+    return parse_sections(segment_sections(text))
+
+
+def role_confidence(lines: list[str], organization_key: str, parsed: list[dict]) -> float:
+    """Share of the role fields found in the weakest entry; paragraph descriptions and stray bullets count against it."""
+    entries = split_entries(lines)
+    if not entries or not parsed:
+        return 0.0
+    scores = []
+    for entry, role in zip([entry for entry in entries if entry["header"]], parsed):
+        score = sum(0.25 for field in ["position", organization_key, "duration"] if role[field])
+        if role["description"] and not entry["paragraph"] and all(len(bullet) <= 300 for bullet in role["description"]):
+            score += 0.25
+        scores.append(score)
+    # The weakest entry decides: one garbled role is enough to make the section worth a second look
+    if any(not entry["header"] for entry in entries):
+        scores.append(0.0)
+    return round(min(scores), 2)
+
+
+def section_confidence(sections: dict[str, list[str]], parsed: dict) -> dict[str, float]:
+    """
+    Estimate, per section, how complete the heuristic parse is (0.0-1.0).
+    "contact" covers the header; other keys are the ResumeData fields of the sections found in the text.
+    """
+    confidence = {
+        "contact": round(0.4 * bool(parsed["name"]) + 0.3 * bool(parsed["email"]) + 0.3 * bool(parsed["phone"]), 2)
+    }
+    for section, lines in sections.items():
+        if section == "header":
+            continue
+        if not lines:
+            confidence[section] = 1.0
+        elif section in ("experience", "volunteer_experience"):
+            organization_key = "company" if section == "experience" else "organization"
+            confidence[section] = role_confidence(lines, organization_key, parsed[section])
+        elif section == "education":
+            entries = parsed["education"]
+            found = sum(bool(entry[field]) for entry in entries for field in ["degree", "institution", "year"])
+            confidence[section] = round(found / (3 * len(entries)), 2) if entries else 0.0
+        elif section == "skills":
+            skills = parsed["skills"]
+            confidence[section] = 1.0 if len(skills) >= 2 and all(len(skill) <= 40 for skill in skills) else 0.5 if skills else 0.0
+        elif section == "projects":
+            projects = parsed["projects"]
+            confidence[section] = round(
+                sum(0.5 + 0.5 * bool(project["description"]) for project in projects) / len(projects), 2
+            ) if projects else 0.0
+        elif section == "certifications":
+            certifications = parsed["certifications"]
+            confidence[section] = round(
+                sum(0.7 + 0.3 * bool(certification["issuer"]) for certification in certifications) / len(certifications), 2
+            ) if certifications else 0.0
+        elif section == "publications":
+            publications = parsed["publications"]
+            confidence[section] = round(
+                sum(0.4 + 0.3 * bool(publication["journal"]) + 0.3 * bool(publication["year"]) for publication in publications)
+                / len(publications), 2
+            ) if publications else 0.0
+        elif section == "references":
+            confidence[section] = 1.0 if parsed["references"] or "request" in " ".join(lines).lower() else 0.0
+        else:
+            confidence[section] = 1.0 if parsed[section] else 0.0
+    return confidence
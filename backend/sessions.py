@@ -0,0 +1,326 @@
+import os
+import copy
+import json
+import time
+import secrets
+import sqlite3
+import threading
+from typing import Callable, Optional
+from cache import TTLCache
+
+
+class JsonPatchError(ValueError):
+    """A JSON Patch operation is malformed or does not apply to the document."""
+
+
+class SessionNotFoundError(KeyError):
+    """No session with this ID, or it has expired."""
+
+
+class SessionConflictError(Exception):
+    """The session changed since the version the client last read."""
+
+
+JSON_PATCH_OPS = ("add", "remove", "replace", "move", "copy", "test")
+
+# IDs per batched SQLite lookup, below the default limit on bound parameters of older SQLite builds (999)
+SQLITE_MAX_PARAMETERS = 500
+
+
+def parse_json_pointer(pointer: str) -> list[str]:
+    """Split an RFC 6901 JSON Pointer ("/experience/0/position") into unescaped reference tokens."""
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"JSON pointer must be a string: {pointer!r}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer[1:].split("/")]
+
+
+def _list_index(container: list, part: str, allow_end: bool) -> int:
+    if allow_end and part == "-":
+        return len(container)
+    if not part.isdigit() or (len(part) > 1 and part.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {part!r}")
+    index = int(part)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _child(container, part: str):
+    if isinstance(container, dict):
+        if part not in container:
+            raise JsonPatchError(f"Path not found: {part!r}")
+        return container[part]
+    if isinstance(container, list):
+        return container[_list_index(container, part, allow_end=False)]
+    raise JsonPatchError(f"Cannot descend into a {type(container).__name__} at {part!r}")
+
+
+def _get(document, parts: list[str]):
+    for part in parts:
+        document = _child(document, part)
+    return document
+
+
+def _add(document, parts: list[str], value):
+    if not parts:
+        return value
+    container = _get(document, parts[:-1])
+    key = parts[-1]
+    if isinstance(container, dict):
+        container[key] = value
+    elif isinstance(container, list):
+        container.insert(_list_index(container, key, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a {type(container).__name__}")
+    return document
+
+
+def _remove(document, parts: list[str]):
+    if not parts:
+        raise JsonPatchError("Cannot remove the whole document")
+    container = _get(document, parts[:-1])
+    key = parts[-1]
+    if isinstance(container, dict):
+        if key not in container:
+            raise JsonPatchError(f"Path not found: {key!r}")
+        return container.pop(key)
+    if isinstance(container, list):
+        return container.pop(_list_index(container, key, allow_end=False))
+    raise JsonPatchError(f"Cannot remove from a {type(container).__name__}")
+
+
+def validate_json_patch(operations) -> None:
+    """Check that operations is a list of well-formed operations before any is applied. Raises JsonPatchError."""
+    if not isinstance(operations, list):
+        raise JsonPatchError("A patch must be a list of operations")
+    for operation in operations:
+        if not isinstance(operation, dict) or "op" not in operation or "path" not in operation:
+            raise JsonPatchError(f"Each operation needs \"op\" and \"path\": {operation!r}")
+        op = operation["op"]
+        if not isinstance(op, str) or op not in JSON_PATCH_OPS:
+            raise JsonPatchError(f"Unknown operation: {op!r}")
+        if not isinstance(operation["path"], str):
+            raise JsonPatchError(f"\"path\" must be a string: {operation['path']!r}")
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"\"{op}\" needs a \"value\"")
+        if op in ("move", "copy"):
+            if "from" not in operation:
+                raise JsonPatchError(f"\"{op}\" needs a \"from\"")
+            if not isinstance(operation["from"], str):
+                raise JsonPatchError(f"\"from\" must be a string: {operation['from']!r}")
+
+
+def apply_json_patch(document, operations: list[dict]):
+    """
+    Apply RFC 6902 JSON Patch operations (add, remove, replace, move, copy, test) to a copy of document.
+    The patch applies as a whole or not at all; raises JsonPatchError if it is malformed or an operation fails.
+    """
+    validate_json_patch(operations)
+    document = copy.deepcopy(document)
+    for operation in operations:
+        op = operation["op"]
+        parts = parse_json_pointer(operation["path"])
+
+        if op == "add":
+            document = _add(document, parts, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(document, parts)
+        elif op == "replace":
+            if parts:
+                _get(document, parts)  # The target must already exist
+                _remove(document, parts)
+            document = _add(document, parts, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            source = parse_json_pointer(operation["from"])
+            if parts[:len(source)] == source and len(parts) > len(source):
+                raise JsonPatchError("Cannot move a value into one of its own children")
+            document = _add(document, parts, _remove(document, source))
+        elif op == "copy":
+            document = _add(document, parts, copy.deepcopy(_get(document, parse_json_pointer(operation["from"]))))
+        elif op == "test":
+            if _get(document, parts) != operation["value"]:
+                raise JsonPatchError(f"Test failed at {operation['path']!r}")
+    return document
+
+
+class MemorySessionBackend:
+    """Sessions in a bounded in-process LRU. Lost on restart and not shared between worker processes."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = TTLCache(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[dict]:
+        return self._cache.get(session_id)
+
+    def load_many(self, session_ids: list[str]) -> dict[str, dict]:
+        """The stored records of the given IDs that exist, by ID."""
+        records = {}
+        for session_id in session_ids:
+            record = self._cache.get(session_id)
+            if record is not None:
+                records[session_id] = record
+        return records
+
+    def save(self, session_id: str, record: dict, expected_version: Optional[int] = None) -> bool:
+        """Store record; with expected_version, only if the stored version still matches. Returns False on a conflict."""
+        with self._lock:
+            if expected_version is not None:
+                current = self._cache.get(session_id)
+                if current is None or current["version"] != expected_version:
+                    return False
+            self._cache.set(session_id, record)
+            return True
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._cache.delete(session_id)
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class SQLiteSessionBackend:
+    """Sessions in SQLite, so they survive restarts and are shared by worker processes on one host."""
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(id TEXT PRIMARY KEY, version INTEGER NOT NULL, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, data FROM sessions WHERE id = ? AND expires_at >= ?", (session_id, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return {"version": row[0], "resume": json.loads(row[1])}
+
+    def load_many(self, session_ids: list[str]) -> dict[str, dict]:
+        """The stored records of the given IDs that exist, by ID, read in a few queries rather than one per ID."""
+        unique_ids = list(dict.fromkeys(session_ids))
+        records = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(unique_ids), SQLITE_MAX_PARAMETERS):
+                chunk = unique_ids[start:start + SQLITE_MAX_PARAMETERS]
+                rows = self._conn.execute(
+                    f"SELECT id, version, data FROM sessions WHERE id IN ({', '.join('?' * len(chunk))}) AND expires_at >= ?",
+                    (*chunk, now)
+                ).fetchall()
+                for session_id, version, data in rows:
+                    records[session_id] = {"version": version, "resume": json.loads(data)}
+        return records
+
+    def save(self, session_id: str, record: dict, expected_version: Optional[int] = None) -> bool:
+        """Store record; with expected_version, only if the stored version still matches. Returns False on a conflict."""
+        data = json.dumps(record["resume"], separators=(",", ":"), ensure_ascii=False)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            if expected_version is None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (id, version, data, expires_at) VALUES (?, ?, ?, ?)",
+                    (session_id, record["version"], data, expires_at)
+                )
+                saved = True
+            else:
+                # Compare-and-set, so concurrent updates from other processes are not lost
+                cursor = self._conn.execute(
+                    "UPDATE sessions SET version = ?, data = ?, expires_at = ? WHERE id = ? AND version = ? AND expires_at >= ?",
+                    (record["version"], data, expires_at, session_id, expected_version, time.time())
+                )
+                saved = cursor.rowcount == 1
+            self._conn.commit()
+        return saved
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM sessions WHERE expires_at >= ?", (time.time(),)).fetchone()[0]
+        return {"backend": "sqlite", "path": self.path, "entries": entries, "ttl_seconds": self.ttl_seconds}
+
+
+class ResumeSessionStore:
+    """
+    Resumes (ResumeData as dicts) stored under an ID, with a version that increases on every update.
+    Records are {"id", "version", "resume"} and must not be mutated by callers.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def create(self, resume: dict) -> dict:
+        session_id = secrets.token_hex(16)
+        record = {"version": 1, "resume": resume}
+        self.backend.save(session_id, record)
+        return {"id": session_id, **record}
+
+    def get(self, session_id: str) -> Optional[dict]:
+        record = self.backend.load(session_id)
+        return {"id": session_id, **record} if record is not None else None
+
+    def get_many(self, session_ids: list[str]) -> list[Optional[dict]]:
+        """Records for several IDs in one backend lookup, in the order given; None where a session is missing."""
+        records = self.backend.load_many(session_ids)
+        return [{"id": session_id, **records[session_id]} if session_id in records else None for session_id in session_ids]
+
+    def update(self, session_id: str, resume: dict, expected_version: Optional[int] = None) -> dict:
+        """Replace the stored resume. Raises SessionNotFoundError, or SessionConflictError if expected_version is stale."""
+        current = self.get(session_id)
+        if current is None:
+            raise SessionNotFoundError(session_id)
+        if expected_version is not None and expected_version != current["version"]:
+            raise SessionConflictError(session_id)
+        record = {"version": current["version"] + 1, "resume": resume}
+        if not self.backend.save(session_id, record, expected_version=current["version"]):
+            raise SessionConflictError(session_id)
+        return {"id": session_id, **record}
+
+    def patch(self, session_id: str, operations: list[dict], validate: Callable[[dict], dict], expected_version: Optional[int] = None) -> dict:
+        """
+        Apply JSON Patch operations to the stored resume and store the result after validate(),
+        which returns the normalized resume or raises. Raises JsonPatchError, SessionNotFoundError or SessionConflictError.
+        """
+        current = self.get(session_id)
+        if current is None:
+            raise SessionNotFoundError(session_id)
+        if expected_version is not None and expected_version != current["version"]:
+            raise SessionConflictError(session_id)
+        resume = validate(apply_json_patch(current["resume"], operations))
+        return self.update(session_id, resume, expected_version=current["version"])
+
+    def delete(self, session_id: str) -> bool:
+        return self.backend.delete(session_id)
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def stats(self) -> dict:
+        return self.backend.stats()
@@ -0,0 +1,96 @@
+import re
+import json
+import functools
+from typing import Optional
+from ats_engine import SKILLS_LEXICON_PATH
+
+# What is left of a skill after a known name when it only names a version: "Python 3.11", "Vue3", "Angular v17"
+VERSION_SUFFIX_PATTERN = re.compile(r"v?\d[\dx]*\+?")
+NON_KEY_CHARACTERS = re.compile(r"[^\w+#]|_")
+
+
+def skill_key(text: str) -> str:
+    """
+    Lookup key of a skill name: lowercase letters, digits, "+" and "#" only, so spacing,
+    dots and dashes do not matter ("React.js", "react js", "ReactJS" -> "reactjs").
+    """
+    return NON_KEY_CHARACTERS.sub("", text.lower())
+
+
+class SkillCanonicalizer:
+    """
+    Maps skill names and their aliases to canonical names. Exact keys are one hash lookup; other keys
+    walk a character trie once, O(length) whatever the number of aliases, to find the longest known
+    name followed only by a version ("Python 3.11").
+    """
+
+    def __init__(self, skills: dict[str, list[str]]):
+        self._exact = {}  # skill key -> canonical name
+        self._children = [{}]  # state -> {character: next state}
+        self._values = [None]  # state -> canonical name for keys ending here
+        for canonical, aliases in skills.items():
+            for alias in [canonical, *aliases]:
+                self._add(skill_key(alias), canonical)
+
+    def _add(self, key: str, canonical: str) -> None:
+        if not key:
+            return
+        state = 0
+        for char in key:
+            next_state = self._children[state].get(char)
+            if next_state is None:
+                next_state = len(self._children)
+                self._children[state][char] = next_state
+                self._children.append({})
+                self._values.append(None)
+            state = next_state
+        # The first skill to claim a key keeps it
+        if self._values[state] is None:
+            self._values[state] = canonical
+            self._exact[key] = canonical
+
+    def lookup(self, skill: str) -> Optional[str]:
+        """The canonical name for skill, or None if it is not a known skill or alias."""
+        key = skill_key(skill)
+        canonical = self._exact.get(key)
+        if canonical is not None:
+            return canonical
+        state = 0
+        longest = None  # (canonical, key length) of the longest known name that prefixes the key
+        for position, char in enumerate(key):
+            state = self._children[state].get(char)
+            if state is None:
+                break
+            if self._values[state] is not None:
+                longest = (self._values[state], position + 1)
+        if longest is not None and VERSION_SUFFIX_PATTERN.fullmatch(key, longest[1]):
+            return longest[0]
+        return None
+
+    def canonicalize(self, skill: str) -> str:
+        """The canonical name for skill; unknown skills are returned with their whitespace collapsed."""
+        return self.lookup(skill) or " ".join(skill.split())
+
+    def canonicalize_list(self, skills: list[str]) -> list[str]:
+        """Canonicalize skills, dropping empty entries and duplicates (first occurrence wins)."""
+        result = []
+        seen = set()
+        for skill in skills:
+            canonical = self.canonicalize(skill)
+            key = skill_key(canonical) or canonical.lower()
+            if canonical and key not in seen:
+                seen.add(key)
+                result.append(canonical)
+        return result
+
+
+@functools.lru_cache(maxsize=1)
+def get_skill_canonicalizer() -> SkillCanonicalizer:
+    """Build the canonicalizer from the skills lexicon once per process."""
+    with open(SKILLS_LEXICON_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    return SkillCanonicalizer(data["skills"])
+
+
+def canonicalize_skills(skills: list[str]) -> list[str]:
+    return get_skill_canonicalizer().canonicalize_list(skills)
@@ -0,0 +1,285 @@
+import re
+import json
+import copy
+import threading
+from typing import Callable, Optional, Type
+from openai import BadRequestError
+from pydantic import BaseModel, ValidationError
+from tokens import add_request_usage
+
+# Response fields the server fills in itself rather than asking the model for
+ENVELOPE_FIELDS = ("success", "message")
+
+# Errors that mean the model's output was unusable and the call is worth repeating
+RETRYABLE_OUTPUT_ERRORS = (json.JSONDecodeError, ValidationError, KeyError, TypeError, ValueError)
+
+# A scalar cut off mid-token after a key or in an array: `tr`, `nul`, `-`, `1.`, `2e`
+TRUNCATED_SCALAR_PATTERN = re.compile(r"(?<=[:\[,])\s*(?:[a-z]+|-|-?\d+\.|-?\d+(?:\.\d+)?[eE][+-]?)$")
+
+
+def clean_json_response(response_text: str) -> str:
+    """Strip whitespace and markdown code fences from a model's JSON response."""
+    response_text = response_text.strip()
+    if response_text.startswith("```json"):
+        response_text = response_text[7:]
+    elif response_text.startswith("```"):
+        response_text = response_text[3:]
+    if response_text.endswith("```"):
+        response_text = response_text[:-3]
+    return response_text.strip()
+
+
+def _strictify(schema: dict) -> bool:
+    """
+    Rewrite a JSON schema in place for OpenAI strict mode: every object lists all of its properties
+    as required and forbids extra ones, and defaults/titles are dropped.
+    Returns False if the schema has a free-form object, which strict mode cannot express.
+    """
+    strict = True
+    schema.pop("title", None)
+    schema.pop("default", None)
+    if schema.get("type") == "object" or "properties" in schema:
+        properties = schema.get("properties")
+        if not properties:
+            return False
+        schema["required"] = list(properties)
+        schema["additionalProperties"] = False
+        for value in properties.values():
+            strict = _strictify(value) and strict
+    if isinstance(schema.get("items"), dict):
+        strict = _strictify(schema["items"]) and strict
+    for key in ("anyOf", "allOf", "oneOf"):
+        for value in schema.get(key, []):
+            strict = _strictify(value) and strict
+    for value in schema.get("$defs", {}).values():
+        strict = _strictify(value) and strict
+    return strict
+
+
+def json_schema_response_format(model: Type[BaseModel], name: str, exclude: tuple = ENVELOPE_FIELDS) -> dict:
+    """
+    Build a `response_format` that asks the model for JSON matching a Pydantic model's schema.
+    Envelope fields, and any other fields the server fills in (exclude), are left out along with
+    the definitions only they used, and strict mode is used whenever the schema allows it.
+    """
+    schema = copy.deepcopy(model.model_json_schema())
+    for field in exclude:
+        schema.get("properties", {}).pop(field, None)
+    definitions = schema.get("$defs", {})
+    while True:
+        text = json.dumps(schema)
+        unused = [name for name in definitions if f'"#/$defs/{name}"' not in text]
+        if not unused:
+            break
+        for name in unused:
+            del definitions[name]
+    if "$defs" in schema and not definitions:
+        del schema["$defs"]
+    strict = _strictify(schema)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": strict}
+    }
+
+
+def repair_json(text: str) -> str:
+    """
+    Make a best-effort repair of almost-valid JSON from a model, in one pass over the text.
+    Leading/trailing prose and code fences are dropped, trailing commas removed, and output that was
+    cut off (e.g. by max_tokens) is closed: the open string is terminated, a half-written literal or
+    number, dangling key or separator is dropped, and open arrays/objects are closed in order.
+    """
+    text = clean_json_response(text)
+    start = min((i for i in (text.find("{"), text.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        return text
+    text = text[start:]
+
+    output = []
+    stack = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            output.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            # Drop a trailing comma before the closing bracket
+            while output and output[-1] in " \n\r\t,":
+                output.pop()
+            if stack:
+                stack.pop()
+            output.append(char)
+            if not stack:
+                break
+            continue
+        output.append(char)
+
+    if not stack:
+        return "".join(output)
+
+    # Truncated output: close what is still open
+    if in_string:
+        if escaped:
+            output.pop()
+        output.append('"')
+    repaired = "".join(output).rstrip()
+    while True:
+        stripped = repaired.rstrip(" \n\r\t")
+        truncated_scalar = TRUNCATED_SCALAR_PATTERN.search(stripped)
+        if stripped.endswith((",", ":")):
+            repaired = stripped[:-1]
+        elif truncated_scalar and truncated_scalar.group(0).strip() not in ("true", "false", "null"):
+            repaired = stripped[:truncated_scalar.start()]
+        elif stack and stack[-1] == "}" and stripped.endswith('"') and _ends_with_dangling_key(stripped):
+            repaired = stripped[:stripped.rstrip('"').rfind('"')]
+        else:
+            repaired = stripped
+            break
+    return repaired + "".join(reversed(stack))
+
+
+def _ends_with_dangling_key(text: str) -> bool:
+    """True if text ends with an object key that has no value yet, e.g. `{"a": 1, "b"`."""
+    body = text[:-1]
+    key_start = body.rfind('"')
+    while key_start > 0 and body[key_start - 1] == "\\":
+        key_start = body.rfind('"', 0, key_start - 1)
+    if key_start < 0:
+        return False
+    before = body[:key_start].rstrip()
+    return before.endswith((",", "{"))
+
+
+def parse_json_response(text: str) -> tuple[dict, bool]:
+    """
+    Parse a model's JSON object response, repairing it if needed.
+    Returns (data, whether repair was needed); raises ValueError if the result is not an object.
+    """
+    try:
+        data, repaired = json.loads(clean_json_response(text)), False
+    except json.JSONDecodeError:
+        data, repaired = json.loads(repair_json(text)), True
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    return data, repaired
+
+
+def cached_prompt_tokens(usage) -> int:
+    """Read usage.prompt_tokens_details.cached_tokens, which older SDK versions expose only as an extra dict field."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is None:
+        return 0
+    if isinstance(details, dict):
+        return details.get("cached_tokens") or 0
+    return getattr(details, "cached_tokens", 0) or 0
+
+
+class LLMCallStats:
+    """Per-operation counters for LLM calls: calls, retries, repaired and failed responses, trimmed inputs and token usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+        self.unsupported_models = set()  # Models that rejected json_schema response_format
+
+    def record(self, operation: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            counters = self._operations.setdefault(
+                operation, {
+                    "calls": 0, "retries": 0, "repaired": 0, "failed": 0, "truncated": 0,
+                    "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0
+                }
+            )
+            counters[counter] += amount
+
+    def record_usage(self, operation: str, usage) -> None:
+        """
+        Add a response's token usage, including prompt tokens served from the provider's prompt cache,
+        to the operation's counters and to the current request's usage.
+        """
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        cached_tokens = cached_prompt_tokens(usage)
+        self.record(operation, "prompt_tokens", prompt_tokens)
+        self.record(operation, "completion_tokens", completion_tokens)
+        self.record(operation, "cached_tokens", cached_tokens)
+        add_request_usage(calls=1, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cached_tokens=cached_tokens)
+
+    def stats(self) -> dict:
+        with self._lock:
+            prompt_tokens = sum(counters["prompt_tokens"] for counters in self._operations.values())
+            cached_tokens = sum(counters["cached_tokens"] for counters in self._operations.values())
+            return {
+                "operations": {operation: dict(counters) for operation, counters in self._operations.items()},
+                "retries": sum(counters["retries"] for counters in self._operations.values()),
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "cached_token_ratio": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else 0.0,
+                "unsupported_response_format_models": sorted(self.unsupported_models)
+            }
+
+
+def response_format_for(model_name: str, response_format: Optional[dict], stats: LLMCallStats) -> Optional[dict]:
+    """The response_format to send, or None once the model has rejected structured outputs."""
+    if response_format is None or model_name in stats.unsupported_models:
+        return None
+    return response_format
+
+
+async def complete_json(
+    client,
+    operation: str,
+    build_result: Callable[[dict], object],
+    stats: LLMCallStats,
+    max_retries: int,
+    response_format: Optional[dict] = None,
+    **request
+):
+    """
+    Run a chat completion that must return JSON and convert it with build_result.
+    Unparseable or invalid output is repaired where possible and otherwise retried, up to max_retries
+    extra calls. A model that rejects the response_format is remembered and called without it.
+    Returns (result, response) so callers can read usage; raises the last error once retries run out.
+    """
+    attempt = 0
+    while True:
+        stats.record(operation, "calls")
+        response_format_arg = response_format_for(request["model"], response_format, stats)
+        try:
+            if response_format_arg is not None:
+                response = await client.chat.completions.create(response_format=response_format_arg, **request)
+            else:
+                response = await client.chat.completions.create(**request)
+        except BadRequestError as e:
+            if response_format_arg is not None and "response_format" in str(e):
+                print(f"Model {request['model']} does not support structured outputs, retrying without them")
+                stats.unsupported_models.add(request["model"])
+                continue
+            raise
+
+        stats.record_usage(operation, getattr(response, "usage", None))
+        try:
+            data, repaired = parse_json_response(response.choices[0].message.content or "")
+            if repaired:
+                stats.record(operation, "repaired")
+            return build_result(data), response
+        except RETRYABLE_OUTPUT_ERRORS as e:
+            if attempt >= max_retries:
+                stats.record(operation, "failed")
+                raise
+            attempt += 1
+            stats.record(operation, "retries")
+            print(f"Invalid {operation} response ({e}), retrying ({attempt}/{max_retries})")
@@ -0,0 +1,244 @@
+import re
+import math
+import functools
+from contextvars import ContextVar
+from typing import Callable, Optional
+from resume_parser import segment_sections
+from job_descriptions import classify_job_lines
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Offline model table: (model name prefix, tokenizer encoding, context window in tokens).
+# Longest matching prefix wins, so "gpt-4.1-mini" is not mistaken for "gpt-4".
+MODEL_TOKEN_TABLE = [
+    ("gpt-4.1", "o200k_base", 1047576),
+    ("gpt-4o", "o200k_base", 128000),
+    ("o1", "o200k_base", 200000),
+    ("o3", "o200k_base", 200000),
+    ("o4", "o200k_base", 200000),
+    ("gpt-4-turbo", "cl100k_base", 128000),
+    ("gpt-4-32k", "cl100k_base", 32768),
+    ("gpt-4", "cl100k_base", 8192),
+    ("gpt-3.5-turbo", "cl100k_base", 16385)
+]
+DEFAULT_MODEL_TOKENS = ("cl100k_base", 8192)
+
+# Chat format overhead: tokens added per message and to prime the reply
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Approximates BPE pre-tokenization when tiktoken or its encoding files are unavailable:
+# words with their leading space, numbers in groups of up to 3 digits, punctuation runs, newlines
+ESTIMATE_PATTERN = re.compile(r" ?[A-Za-z]+| ?\d{1,3}| ?[^\sA-Za-z\d]+|\s+")
+CHARS_PER_TOKEN = 4  # Long words split into pieces of roughly this many characters
+
+# Resume sections in the order they are kept when a resume is over its token budget
+RESUME_SECTION_PRIORITY = [
+    "header", "experience", "education", "skills", "summary", "projects", "certifications",
+    "publications", "volunteer_experience", "awards", "languages", "references"
+]
+
+SECTION_OPENING_LINES = 3  # Lines of each section kept ahead of the rest of any section
+
+# Order in which job description lines are kept, by classify_job_lines label
+JOB_LINE_RANKS = {"requirement": 0, "responsibility": 1, "skill": 1, "other": 2, "boilerplate": 3}
+
+
+def model_token_info(model: str) -> tuple[str, int]:
+    """Return (encoding name, context window) for a model from the offline table."""
+    matches = [entry for entry in MODEL_TOKEN_TABLE if model.startswith(entry[0])]
+    if not matches:
+        return DEFAULT_MODEL_TOKENS
+    _, encoding, context_window = max(matches, key=lambda entry: len(entry[0]))
+    return encoding, context_window
+
+
+# tiktoken encodings loaded by load_encodings; names missing here are estimated
+_encodings = {}
+
+
+def load_encodings(models: list[str]) -> None:
+    """
+    Load the tiktoken encodings the models use. Blocking: tiktoken downloads a BPE file the first time
+    (into TIKTOKEN_CACHE_DIR when set), with no timeout, so call this at startup in a background thread,
+    never from a request. Encodings that fail to load stay estimated.
+    """
+    if tiktoken is None:
+        return
+    for encoding_name in sorted({model_token_info(model)[0] for model in models}):
+        if encoding_name in _encodings:
+            continue
+        try:
+            _encodings[encoding_name] = tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            print(f"tiktoken encoding {encoding_name} unavailable ({e}), estimating token counts")
+
+
+def get_encoding(encoding_name: str):
+    """The loaded tiktoken encoding, or None to use the estimator. Never loads, so it is safe on the event loop."""
+    return _encodings.get(encoding_name)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of text without a tokenizer."""
+    return sum(max(1, math.ceil(len(piece.strip() or piece) / CHARS_PER_TOKEN)) for piece in ESTIMATE_PATTERN.findall(text))
+
+
+class TokenCounter:
+    """Counts tokens for one model with tiktoken when available and the estimator otherwise."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.encoding_name, self.context_window = model_token_info(model)
+
+    @property
+    def encoding(self):
+        # Looked up per use, so counters created before load_encodings finishes switch to exact counts
+        return get_encoding(self.encoding_name)
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = self.encoding
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def count_messages(self, messages: list[dict]) -> int:
+        return sum(TOKENS_PER_MESSAGE + self.count(message["content"]) for message in messages) + TOKENS_PER_REPLY
+
+
+@functools.lru_cache(maxsize=16)
+def get_token_counter(model: str) -> TokenCounter:
+    return TokenCounter(model)
+
+
+def input_token_budget(openai_config: dict) -> int:
+    """
+    Prompt tokens allowed for a call: the configured max_input_tokens, capped so the prompt plus
+    max_tokens of output fits the model's context window.
+    """
+    _, context_window = model_token_info(openai_config["model"])
+    available = context_window - openai_config["max_tokens"]
+    configured = openai_config.get("max_input_tokens")
+    return min(configured, available) if configured else available
+
+
+def fit_lines(lines: list[str], budget: int, count: Callable[[str], int], rank: Callable[[int], tuple]) -> list[str]:
+    """
+    Keep the best-ranked lines (lowest rank(index) first, ties by position) whose combined token count
+    fits the budget, in their original order. Budget left over is filled with the start of the
+    best-ranked line that did not fit, so a single over-long line is shortened rather than dropped.
+    """
+    costs = [count(line) + 1 for line in lines]  # +1 for the joining newline
+    if sum(costs) <= budget:
+        return lines
+    ranked = sorted(range(len(lines)), key=lambda index: (rank(index), index))
+    kept = {}
+    used = 0
+    skipped = None
+    for index in ranked:
+        if used + costs[index] <= budget:
+            kept[index] = lines[index]
+            used += costs[index]
+        elif skipped is None:
+            skipped = index
+    if skipped is not None and budget - used > 1:
+        cut = truncate_to_tokens(lines[skipped], budget - used - 1, count)
+        if cut:
+            kept[skipped] = cut
+    return [kept[index] for index in sorted(kept)]
+
+
+def truncate_to_tokens(text: str, budget: int, count: Callable[[str], int]) -> str:
+    """Cut text to at most budget tokens, at a line boundary where possible."""
+    if budget <= 0:
+        return ""
+    if count(text) <= budget:
+        return text
+    lines = text.splitlines()
+    kept = []
+    used = 0
+    for line in lines:
+        cost = count(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    if kept:
+        return "\n".join(kept)
+    # A single over-long line: cut by characters, assuming a typical characters-per-token ratio,
+    # then shrink in proportion to the overshoot until dense text (numbers, symbols, non-Latin script) fits
+    cut = text[:budget * CHARS_PER_TOKEN]
+    tokens = count(cut)
+    while tokens > budget:
+        cut = cut[:min(len(cut) - 1, len(cut) * budget // tokens)]
+        tokens = count(cut)
+    return cut
+
+
+def section_priority(section: str) -> int:
+    return RESUME_SECTION_PRIORITY.index(section) if section in RESUME_SECTION_PRIORITY else len(RESUME_SECTION_PRIORITY) - 1
+
+
+def fit_resume_text(text: str, budget: int, count: Callable[[str], int]) -> str:
+    """
+    Fit resume text into a token budget, keeping the sections that matter most for parsing.
+    The contact header and the first lines of every section are kept first; the remaining lines
+    follow in RESUME_SECTION_PRIORITY order, each section trimmed from its end, so an over-long resume
+    loses its references and the trailing bullets of old roles before anything else.
+    """
+    if count(text) <= budget:
+        return text
+    sections = segment_sections(text)
+    lines = []
+    priorities = []
+    for section, section_lines in sections.items():
+        if section != "header" and section_lines:
+            lines.append(section.replace("_", " ").upper())
+            priorities.append((0, section_priority(section), 0))
+        for position, line in enumerate(section_lines, start=1):
+            opening = section == "header" or position <= SECTION_OPENING_LINES
+            lines.append(line)
+            priorities.append((0 if opening else 1, section_priority(section), position))
+    kept = fit_lines(lines, budget, count, lambda index: priorities[index])
+    return "\n".join(kept)
+
+
+def fit_job_description(job_description: str, budget: int, count: Callable[[str], int]) -> str:
+    """
+    Fit a job description into a token budget, keeping the lines the ATS prompt needs.
+    Requirement lines come first, then responsibilities and lines naming skills, then the rest of the
+    posting in order; boilerplate (benefits, EEO statements, company blurbs, how to apply) is dropped first.
+    """
+    if count(job_description) <= budget:
+        return job_description
+    lines = [line.strip() for line in job_description.splitlines() if line.strip()]
+    ranks = [JOB_LINE_RANKS[kind] for kind in classify_job_lines(lines)]
+    return "\n".join(fit_lines(lines, budget, count, lambda index: ranks[index]))
+
+
+# Token usage of the current HTTP request, shared by every LLM call made while serving it
+request_token_usage: ContextVar[Optional[dict]] = ContextVar("request_token_usage", default=None)
+
+
+def start_request_usage() -> dict:
+    """Begin collecting token usage for the current request; returns the dict that calls add to."""
+    usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "estimated_prompt_tokens": 0}
+    request_token_usage.set(usage)
+    return usage
+
+
+def add_request_usage(**counts: int) -> None:
+    """Add token counts to the current request's usage, if one is being collected."""
+    usage = request_token_usage.get()
+    if usage is not None:
+        for key, value in counts.items():
+            usage[key] += value
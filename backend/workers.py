@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from fastapi import HTTPException
+
+
+class WorkerError(Exception):
+    """Picklable carrier for an error raised inside a worker process."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _call_in_worker(fn, args):
+    """Run fn in the worker, converting errors into something that survives pickling."""
+    try:
+        return fn(*args)
+    except HTTPException as e:
+        raise WorkerError(e.status_code, str(e.detail))
+    except Exception as e:
+        raise WorkerError(500, str(e))
+
+
+class ProcessPool:
+    """ProcessPoolExecutor wrapper for CPU-bound document work, with queue-depth metrics.
+
+    A pool size of 0 disables the pool and runs work inline on the calling thread.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None and self.max_workers > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def shutdown(self) -> None:
+        """Stop accepting work, cancel queued tasks and wait for running ones to finish."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    async def run(self, fn, *args):
+        """Run fn(*args) in a worker process and return its result.
+
+        HTTPExceptions raised by fn are re-raised in the caller with the same status and detail.
+        """
+        self.start()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self._executor is None:
+                result = _call_in_worker(fn, args)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._executor, _call_in_worker, fn, args)
+            self.completed += 1
+            return result
+        except WorkerError as e:
+            self.failed += 1
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.max_workers),
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "failed": self.failed
+        }
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the per-request PDF styling overhead.
+Compares building the ReportLab stylesheet on every request (the old behavior)
+with the per-process cached styles used by generate_pdf, and reports the
+end-to-end generate_pdf time for context.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from config import Config
+
+ITERATIONS = 2000
+
+RESUME_DATA = main.ResumeData(
+    name="John Doe",
+    email="john.doe@email.com",
+    phone="555-1234",
+    location="San Francisco, CA",
+    summary="Experienced software engineer with 5 years of experience in web development.",
+    skills=["Python", "JavaScript", "React", "Node.js"],
+    experience=[
+        main.Experience(
+            position="Software Engineer",
+            company="Tech Corp",
+            duration="2020-2023",
+            description=[
+                "Developed web applications using React and Node.js",
+                "Collaborated with cross-functional teams",
+                "Improved application performance by 30%"
+            ]
+        )
+    ],
+    education=[
+        main.Education(
+            degree="Bachelor of Science in Computer Science",
+            institution="University of California",
+            year="2020"
+        )
+    ],
+    awards=["Dean's List"],
+    languages=["English", "Spanish"]
+)
+
+SECTIONS = ["SUMMARY", "SKILLS", "PROFESSIONAL EXPERIENCE", "EDUCATION", "AWARDS & HONORS", "LANGUAGES"]
+
+
+def styling_overhead(get_styles):
+    """Time the style lookup plus section header construction for one document."""
+    fonts = Config.PDF_GENERATION["fonts"]
+    page_size = Config.PDF_GENERATION["page_size"]
+
+    def per_request():
+        styles = get_styles(page_size, fonts["title"], fonts["header"], fonts["body"])
+        for title in SECTIONS:
+            main.pdf_section_header(title, styles)
+
+    return timeit.timeit(per_request, number=ITERATIONS) / ITERATIONS
+
+
+def benchmark_pdf_styles():
+    uncached = styling_overhead(main.get_pdf_styles.__wrapped__)
+    cached = styling_overhead(main.get_pdf_styles)
+    full_render = timeit.timeit(lambda: main.generate_pdf(RESUME_DATA), number=200) / 200
+
+    print(f"Styling overhead per request, rebuilt each time: {uncached * 1e6:8.1f} µs")
+    print(f"Styling overhead per request, cached styles:     {cached * 1e6:8.1f} µs")
+    print(f"Speedup: {uncached / cached:.1f}x")
+    print(f"Full generate_pdf per request (cached styles):   {full_render * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_pdf_styles()
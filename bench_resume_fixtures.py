@@ -0,0 +1,420 @@
+"""
+Held-out resumes for bench_resume_parser.py, written by hand rather than generated,
+so they do not follow the layouts the heuristic parser was built around: labeled and
+international contact details, uncommon headings, company-first entries, and date
+styles such as "Sept. 2018 to Aug. 2020", "2019–Present" or "03.2019 - 11.2021".
+
+Each fixture is {"text", "expected"}. Only the fields listed in expected are scored;
+experience entries give the bullet count, not the bullet text.
+"""
+
+HELD_OUT_RESUMES = [
+    {
+        "text": """Oliver Bennett
+Phone: +44 20 7946 0958 | Email: oliver.bennett@example.co.uk
+London, UK | linkedin.com/in/oliverbennett
+
+Profile
+Backend engineer focused on payments infrastructure.
+
+Employment History
+Monzo Bank — London
+Senior Backend Engineer, Sept. 2018 to Aug. 2020
+- Rebuilt the card authorisation service in Go
+- Cut p99 latency from 180ms to 40ms
+
+Education
+BSc Computer Science, University of Manchester, 2014
+
+Skills
+Go, PostgreSQL, Kafka, Kubernetes""",
+        "expected": {
+            "name": "Oliver Bennett",
+            "email": "oliver.bennett@example.co.uk",
+            "phone": "+44 20 7946 0958",
+            "location": "London, UK",
+            "linkedin_profile": "linkedin.com/in/oliverbennett",
+            "experience": [{"position": "Senior Backend Engineer", "company": "Monzo Bank", "duration": "Sept. 2018 to Aug. 2020", "bullets": 2}],
+            "education": [{"degree": "BSc Computer Science", "institution": "University of Manchester", "year": "2014"}],
+            "skills": ["Go", "PostgreSQL", "Kafka", "Kubernetes"]
+        }
+    },
+    {
+        "text": """PRIYA RAGHAVAN
+priya.r@example.in  ·  +91 98765 43210  ·  Bengaluru, KA
+
+WORK EXPERIENCE
+Data Scientist — Flipkart — 2019–Present
+• Built demand forecasting models for 12,000 SKUs
+• Owned the experimentation platform's metrics layer
+Data Analyst — Infosys — 2016–2019
+• Automated weekly reporting with Python and Airflow
+
+EDUCATION
+Indian Institute of Technology Madras — M.Tech, Data Science — 2016
+
+TECHNICAL SKILLS
+Python; SQL; Spark; Airflow; scikit-learn""",
+        "expected": {
+            "name": "PRIYA RAGHAVAN",
+            "email": "priya.r@example.in",
+            "phone": "+91 98765 43210",
+            "location": "Bengaluru, KA",
+            "experience": [
+                {"position": "Data Scientist", "company": "Flipkart", "duration": "2019–Present", "bullets": 2},
+                {"position": "Data Analyst", "company": "Infosys", "duration": "2016–2019", "bullets": 1}
+            ],
+            "education": [{"degree": "M.Tech, Data Science", "institution": "Indian Institute of Technology Madras", "year": "2016"}],
+            "skills": ["Python", "SQL", "Spark", "Airflow", "scikit-learn"]
+        }
+    },
+    {
+        "text": """Lukas Schneider
+Tel.: +49 30 1234567
+E-Mail: lukas.schneider@example.de
+Berlin, DE
+github.com/lschneider
+
+Berufserfahrung / Experience
+Software Developer
+SAP SE, Walldorf
+03.2019 - 11.2021
+- Maintained the ABAP to Java migration tooling
+- Mentored four working students
+
+Education
+Karlsruhe Institute of Technology
+M.Sc. Informatik, 2018
+
+Skills
+Java, Kotlin, Spring, Docker""",
+        "expected": {
+            "name": "Lukas Schneider",
+            "email": "lukas.schneider@example.de",
+            "phone": "+49 30 1234567",
+            "location": "Berlin, DE",
+            "github_profile": "github.com/lschneider",
+            "experience": [{"position": "Software Developer", "company": "SAP SE", "duration": "03.2019 - 11.2021", "bullets": 2}],
+            "education": [{"degree": "M.Sc. Informatik", "institution": "Karlsruhe Institute of Technology", "year": "2018"}],
+            "skills": ["Java", "Kotlin", "Spring", "Docker"]
+        }
+    },
+    {
+        "text": """Maria Gonzalez, PMP
+Austin, TX 78701 | (512) 555-0147 | maria.gonzalez@example.com
+
+Summary of Qualifications
+Program manager with ten years of delivery experience in healthcare IT.
+
+Professional Experience
+Dell Technologies, Round Rock, TX
+Senior Program Manager (Jan 2017 – Present)
+- Ran a 40-person release train across three product lines
+- Introduced quarterly planning and cut slipped milestones by half
+
+Accenture, Austin, TX
+Consultant (Jun 2012 – Dec 2016)
+- Led EHR integration projects for regional hospitals
+
+Education
+The University of Texas at Austin
+Bachelor of Business Administration, May 2012
+
+Certifications
+PMP, Project Management Institute, 2015
+
+Core Skills
+Program Management • Agile • Jira • Stakeholder Management""",
+        "expected": {
+            "name": "Maria Gonzalez",
+            "email": "maria.gonzalez@example.com",
+            "phone": "(512) 555-0147",
+            "location": "Austin, TX",
+            "experience": [
+                {"position": "Senior Program Manager", "company": "Dell Technologies", "duration": "Jan 2017 – Present", "bullets": 2},
+                {"position": "Consultant", "company": "Accenture", "duration": "Jun 2012 – Dec 2016", "bullets": 1}
+            ],
+            "education": [{"degree": "Bachelor of Business Administration", "institution": "The University of Texas at Austin", "year": "2012"}],
+            "skills": ["Program Management", "Agile", "Jira", "Stakeholder Management"]
+        }
+    },
+    {
+        "text": """Chen Wei
+Mobile: +86 138 0013 8000
+Email: chen.wei@example.cn
+Shanghai, CN | chenwei.dev
+
+Experience
+2020/03 – 2022/11  Frontend Engineer, ByteDance
+* Built the creator analytics dashboard in React and TypeScript
+* Reduced bundle size by 35%
+2018/07 – 2020/02  Junior Developer, Ctrip
+* Maintained the hotel booking flow
+
+Education
+Fudan University, B.Eng. Software Engineering, 2018
+
+Skills
+React | TypeScript | Node.js | Webpack""",
+        "expected": {
+            "name": "Chen Wei",
+            "email": "chen.wei@example.cn",
+            "phone": "+86 138 0013 8000",
+            "location": "Shanghai, CN",
+            "website": "chenwei.dev",
+            "experience": [
+                {"position": "Frontend Engineer", "company": "ByteDance", "duration": "2020/03 – 2022/11", "bullets": 2},
+                {"position": "Junior Developer", "company": "Ctrip", "duration": "2018/07 – 2020/02", "bullets": 1}
+            ],
+            "education": [{"degree": "B.Eng. Software Engineering", "institution": "Fudan University", "year": "2018"}],
+            "skills": ["React", "TypeScript", "Node.js", "Webpack"]
+        }
+    },
+    {
+        "text": """Samuel Okoye
+samuel.okoye@example.com
++234 803 123 4567
+Lagos, NG
+
+About Me
+Mobile engineer who enjoys shipping to low-bandwidth markets.
+
+Relevant Experience
+Android Engineer at Paystack
+Summer 2021 - Present
+- Shipped the offline-first merchant app to 200k users
+- Wrote the Kotlin coroutine migration guide
+
+Android Intern at Andela
+Summer 2020
+- Built an image compression module
+
+Education
+University of Lagos — B.Sc. Computer Science (2021)
+
+Technologies
+Kotlin, Java, Android, Firebase""",
+        "expected": {
+            "name": "Samuel Okoye",
+            "email": "samuel.okoye@example.com",
+            "phone": "+234 803 123 4567",
+            "location": "Lagos, NG",
+            "summary": "Mobile engineer who enjoys shipping to low-bandwidth markets.",
+            "experience": [
+                {"position": "Android Engineer", "company": "Paystack", "duration": "Summer 2021 - Present", "bullets": 2},
+                {"position": "Android Intern", "company": "Andela", "duration": "Summer 2020", "bullets": 1}
+            ],
+            "education": [{"degree": "B.Sc. Computer Science", "institution": "University of Lagos", "year": "2021"}],
+            "skills": ["Kotlin", "Java", "Android", "Firebase"]
+        }
+    },
+    {
+        "text": """Emily Carter
+1-800-555-0199 • emily.carter@example.org • Portland, OR
+https://www.linkedin.com/in/emily-carter-rn
+
+CAREER HISTORY
+Registered Nurse
+Providence Portland Medical Center | 2015 to present
+- Charge nurse for a 32-bed medical-surgical unit
+- Precepted 20 new graduate nurses
+
+EDUCATION
+Oregon Health & Science University
+Bachelor of Science in Nursing, 2015
+
+LICENSES & CERTIFICATIONS
+Registered Nurse, Oregon State Board of Nursing
+BLS, American Heart Association, 2023
+
+KEY SKILLS
+Patient Assessment, Epic Charting, Wound Care, IV Therapy""",
+        "expected": {
+            "name": "Emily Carter",
+            "email": "emily.carter@example.org",
+            "phone": "1-800-555-0199",
+            "location": "Portland, OR",
+            "linkedin_profile": "https://www.linkedin.com/in/emily-carter-rn",
+            "experience": [{"position": "Registered Nurse", "company": "Providence Portland Medical Center", "duration": "2015 to present", "bullets": 2}],
+            "education": [{"degree": "Bachelor of Science in Nursing", "institution": "Oregon Health & Science University", "year": "2015"}],
+            "skills": ["Patient Assessment", "Epic Charting", "Wound Care", "IV Therapy"]
+        }
+    },
+    {
+        "text": """Jonas Lindqvist
+jonas@lindqvist.example | +46 70 123 45 67 | Stockholm, SE
+
+Experience
+Spotify
+Site Reliability Engineer
+Oct 2019 – Mar 2023
+Owned the incident process for the playback platform and ran the on-call rotation for twelve teams. Reduced paging volume by 60% through alert consolidation.
+
+Klarna
+DevOps Engineer
+Aug 2016 – Sep 2019
+- Migrated CI from Jenkins to GitLab
+- Built Terraform modules for AWS accounts
+
+Education
+KTH Royal Institute of Technology, MSc, 2016
+
+Skills
+Terraform, AWS, Prometheus, Python, Linux""",
+        "expected": {
+            "name": "Jonas Lindqvist",
+            "email": "jonas@lindqvist.example",
+            "phone": "+46 70 123 45 67",
+            "location": "Stockholm, SE",
+            "experience": [
+                {"position": "Site Reliability Engineer", "company": "Spotify", "duration": "Oct 2019 – Mar 2023", "bullets": 2},
+                {"position": "DevOps Engineer", "company": "Klarna", "duration": "Aug 2016 – Sep 2019", "bullets": 2}
+            ],
+            "education": [{"degree": "MSc", "institution": "KTH Royal Institute of Technology", "year": "2016"}],
+            "skills": ["Terraform", "AWS", "Prometheus", "Python", "Linux"]
+        }
+    },
+    {
+        "text": """AISHA RAHMAN
+Toronto, ON · 416 555 0123 · aisha.rahman@example.ca · github.com/aisharahman
+
+Objective
+Graduating software engineering student seeking a new-grad backend role.
+
+Education
+University of Waterloo
+Candidate for BASc Software Engineering, Expected April 2025
+GPA: 3.8/4.0
+
+Work Experience
+Software Engineering Intern, Shopify (May 2023 - Aug 2023)
+- Added rate limiting to the storefront GraphQL API
+- Wrote load tests with k6
+
+Backend Developer Intern, Wealthsimple (Sep 2022 - Dec 2022)
+- Built reconciliation jobs for transfers
+
+Projects
+Campus Eats — Django, PostgreSQL
+- Food ordering app used by 3 campus cafeterias
+
+Skills
+Python, Ruby, GraphQL, PostgreSQL, Django""",
+        "expected": {
+            "name": "AISHA RAHMAN",
+            "email": "aisha.rahman@example.ca",
+            "phone": "416 555 0123",
+            "location": "Toronto, ON",
+            "github_profile": "github.com/aisharahman",
+            "summary": "Graduating software engineering student seeking a new-grad backend role.",
+            "experience": [
+                {"position": "Software Engineering Intern", "company": "Shopify", "duration": "May 2023 - Aug 2023", "bullets": 2},
+                {"position": "Backend Developer Intern", "company": "Wealthsimple", "duration": "Sep 2022 - Dec 2022", "bullets": 1}
+            ],
+            "education": [{"degree": "Candidate for BASc Software Engineering", "institution": "University of Waterloo", "year": "2025"}],
+            "skills": ["Python", "Ruby", "GraphQL", "PostgreSQL", "Django"]
+        }
+    },
+    {
+        "text": """Daniel Kim
+Seattle, WA
+daniel.kim@example.com
++1 (206) 555-0182
+www.danielkim.example
+
+Highlights
+Staff engineer with a track record of scaling search infrastructure.
+
+Experience
+AMAZON WEB SERVICES                                   Seattle, WA
+Staff Software Engineer                               2018 – 2023
+▪ Designed the sharding layer for OpenSearch Serverless
+▪ Chaired the storage design review board
+MICROSOFT                                             Redmond, WA
+Software Engineer II                                  2013 – 2018
+▪ Worked on Bing indexing pipelines
+
+Education
+Carnegie Mellon University
+M.S. Computer Science                                 2013
+
+Skills
+Java, C++, Distributed Systems, Lucene""",
+        "expected": {
+            "name": "Daniel Kim",
+            "email": "daniel.kim@example.com",
+            "phone": "+1 (206) 555-0182",
+            "location": "Seattle, WA",
+            "website": "www.danielkim.example",
+            "experience": [
+                {"position": "Staff Software Engineer", "company": "AMAZON WEB SERVICES", "duration": "2018 – 2023", "bullets": 2},
+                {"position": "Software Engineer II", "company": "MICROSOFT", "duration": "2013 – 2018", "bullets": 1}
+            ],
+            "education": [{"degree": "M.S. Computer Science", "institution": "Carnegie Mellon University", "year": "2013"}],
+            "skills": ["Java", "C++", "Distributed Systems", "Lucene"]
+        }
+    },
+    {
+        "text": """Sophie Martin
+sophie.martin@example.fr
++33 6 12 34 56 78
+Paris, FR
+
+Expérience professionnelle / Professional Experience
+UX Designer | Doctolib | 2020 - 2023
+- Redesigned the appointment booking flow, lifting completion by 14%
+- Ran 30 usability studies with patients and practitioners
+Product Designer | BlaBlaCar | 2017 - 2020
+- Owned the design system's component library
+
+Education
+Master Design d'interaction, Strate School of Design, 2017
+
+Tools
+Figma; Sketch; Principle; Maze""",
+        "expected": {
+            "name": "Sophie Martin",
+            "email": "sophie.martin@example.fr",
+            "phone": "+33 6 12 34 56 78",
+            "location": "Paris, FR",
+            "experience": [
+                {"position": "UX Designer", "company": "Doctolib", "duration": "2020 - 2023", "bullets": 2},
+                {"position": "Product Designer", "company": "BlaBlaCar", "duration": "2017 - 2020", "bullets": 1}
+            ],
+            "education": [{"degree": "Master Design d'interaction", "institution": "Strate School of Design", "year": "2017"}],
+            "skills": ["Figma", "Sketch", "Principle", "Maze"]
+        }
+    },
+    {
+        "text": """Ricardo Alves
+ricardo.alves@example.com.br | +55 11 91234-5678 | São Paulo, SP
+
+Resumo / Summary
+Full-stack developer working mostly on e-commerce platforms.
+
+Experience
+Nubank · Software Engineer · Feb/2021 – Present
+• Built the Clojure service that issues virtual cards
+• Reduced card issuance errors by 80%
+Mercado Livre · Developer · Jan/2018 – Jan/2021
+• Maintained the checkout frontend
+
+Education
+Universidade de São Paulo — Bachelor of Computer Science — 2017
+
+Skills
+Clojure, Kotlin, React, AWS""",
+        "expected": {
+            "name": "Ricardo Alves",
+            "email": "ricardo.alves@example.com.br",
+            "phone": "+55 11 91234-5678",
+            "location": "São Paulo, SP",
+            "experience": [
+                {"position": "Software Engineer", "company": "Nubank", "duration": "Feb/2021 – Present", "bullets": 2},
+                {"position": "Developer", "company": "Mercado Livre", "duration": "Jan/2018 – Jan/2021", "bullets": 1}
+            ],
+            "education": [{"degree": "Bachelor of Computer Science", "institution": "Universidade de São Paulo", "year": "2017"}],
+            "skills": ["Clojure", "Kotlin", "React", "AWS"]
+        }
+    }
+]
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Accuracy and latency benchmark for the offline resume parser.
+Accuracy is measured on hand-written held-out resumes (bench_resume_fixtures.py)
+with varied headings, contact formats and date styles, and reported per field.
+Latency (p50/p95) is measured on a generated corpus of synthetic resumes in
+several common layouts; those follow the layouts the parser was written for,
+so they are not scored for accuracy.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from resume_parser import parse_resume_text
+from bench_resume_fixtures import HELD_OUT_RESUMES
+
+CORPUS_SIZE = 500
+SEED = 7
+
+FIRST_NAMES = ["Jane", "Carlos", "Priya", "Wei", "Amara", "Liam", "Sofia", "Noah", "Fatima", "Mateo", "Yuki", "Olivia"]
+LAST_NAMES = ["Smith", "Garcia", "Patel", "Chen", "Okafor", "Murphy", "Rossi", "Kim", "Haddad", "Silva", "Tanaka", "Nguyen"]
+CITIES = ["San Francisco, CA", "Austin, TX", "New York, NY", "Seattle, WA", "Boston, MA", "Chicago, IL", "Denver, CO"]
+COMPANIES = [
+    "Acme Corp", "Globex Inc", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli",
+    "Vandelay Industries", "Soylent Systems", "Cyberdyne", "Aperture Science", "Tyrell Corporation"
+]
+POSITIONS = [
+    "Software Engineer", "Senior Software Engineer", "Data Analyst", "Product Manager", "Backend Developer",
+    "Machine Learning Engineer", "DevOps Engineer", "Frontend Developer", "Data Scientist", "Engineering Manager"
+]
+SCHOOLS = [
+    "University of Washington", "Stanford University", "Georgia Institute of Technology", "Boston College",
+    "University of Texas at Austin", "Massachusetts Institute of Technology"
+]
+DEGREES = [
+    "B.S. in Computer Science", "Bachelor of Arts in Economics", "M.S. in Data Science",
+    "Master of Business Administration", "B.Eng. in Electrical Engineering"
+]
+SKILLS = [
+    "Python", "Java", "Go", "SQL", "JavaScript", "TypeScript", "React", "Docker", "Kubernetes", "AWS", "GCP",
+    "PostgreSQL", "Redis", "Kafka", "Terraform", "Spark", "Pandas", "FastAPI", "GraphQL", "Linux"
+]
+BULLETS = [
+    "Reduced API latency by {n}% by introducing caching and connection pooling",
+    "Led a team of {n} engineers delivering the billing platform rewrite",
+    "Built data pipelines processing {n}M events per day",
+    "Automated deployments with CI/CD, cutting release time by {n}%",
+    "Designed dashboards used by {n} internal stakeholders",
+    "Migrated {n} services from a monolith to containers",
+    "Improved test coverage from {n}% to 90%"
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+FULL_MONTHS = [
+    "January", "February", "March", "April", "May", "June", "July", "August", "September", "October",
+    "November", "December"
+]
+
+HEADING_STYLES = [
+    {"summary": "SUMMARY", "experience": "EXPERIENCE", "education": "EDUCATION", "skills": "SKILLS"},
+    {"summary": "Professional Summary", "experience": "Work Experience", "education": "Education", "skills": "Technical Skills"},
+    {"summary": "Profile:", "experience": "Professional Experience:", "education": "Education:", "skills": "Core Competencies:"},
+    {"summary": "OBJECTIVE", "experience": "EMPLOYMENT HISTORY", "education": "ACADEMIC BACKGROUND", "skills": "SKILLS & TOOLS"}
+]
+BULLET_CHARS = ["•", "-", "*", "▪"]
+
+
+def random_date_range(rng):
+    start = rng.randint(2010, 2021)
+    end = start + rng.randint(1, 3)
+    style = rng.randint(0, 3)
+    end_text = "Present" if rng.random() < 0.3 else None
+    if style == 0:
+        return f"{rng.choice(MONTHS)} {start} - {end_text or rng.choice(MONTHS) + ' ' + str(end)}"
+    if style == 1:
+        return f"{rng.choice(FULL_MONTHS)} {start} – {end_text or rng.choice(FULL_MONTHS) + ' ' + str(end)}"
+    if style == 2:
+        return f"{rng.randint(1, 12):02d}/{start} - {end_text or f'{rng.randint(1, 12):02d}/{end}'}"
+    return f"{start} - {end_text or end}"
+
+
+def random_phone(rng):
+    area, prefix, line = rng.randint(200, 989), rng.randint(200, 989), rng.randint(1000, 9999)
+    return rng.choice([f"({area}) {prefix}-{line}", f"{area}-{prefix}-{line}", f"+1 {area} {prefix} {line}", f"{area}.{prefix}.{line}"])
+
+
+def build_resume(rng):
+    """Return the text of one synthetic resume."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    name = f"{first} {last}"
+    email = f"{first.lower()}.{last.lower()}@example.com"
+    phone = random_phone(rng)
+    location = rng.choice(CITIES)
+    linkedin = f"linkedin.com/in/{first.lower()}{last.lower()}"
+    github = f"github.com/{first[0].lower()}{last.lower()}"
+    headings = rng.choice(HEADING_STYLES)
+    bullet = rng.choice(BULLET_CHARS)
+
+    contact_parts = [location, email, phone]
+    rng.shuffle(contact_parts)
+    lines = [name, rng.choice([" | ", " • ", "  "]).join(contact_parts), f"{linkedin} | {github}", ""]
+
+    summary = f"{rng.choice(POSITIONS)} with {rng.randint(2, 12)} years of experience building reliable systems."
+    lines += [headings["summary"], summary, ""]
+
+    lines.append(headings["experience"])
+    for company in rng.sample(COMPANIES, rng.randint(1, 4)):
+        position = rng.choice(POSITIONS)
+        duration = random_date_range(rng)
+        layout = rng.randint(0, 3)
+        if layout == 0:
+            lines.append(f"{position} | {company} | {duration}")
+        elif layout == 1:
+            lines += [company, f"{position}    {duration}"]
+        elif layout == 2:
+            lines += [f"{position}, {company}", duration]
+        else:
+            lines.append(f"{position} at {company} ({duration})")
+        descriptions = [template.format(n=rng.randint(2, 60)) for template in rng.sample(BULLETS, rng.randint(2, 4))]
+        lines += [f"{bullet} {description}" for description in descriptions]
+    lines.append("")
+
+    school, degree, year = rng.choice(SCHOOLS), rng.choice(DEGREES), str(rng.randint(2005, 2020))
+    lines.append(headings["education"])
+    if rng.random() < 0.5:
+        lines.append(f"{degree}, {school}, {year}")
+    else:
+        lines += [school, f"{degree}    May {year}"]
+    lines.append("")
+
+    skills = rng.sample(SKILLS, rng.randint(5, 10))
+    lines.append(headings["skills"])
+    if rng.random() < 0.5:
+        lines.append(", ".join(skills))
+    else:
+        half = len(skills) // 2
+        lines += [f"Languages: {', '.join(skills[:half])}", f"Tools: {', '.join(skills[half:])}"]
+    return "\n".join(lines)
+
+
+def score(parsed, expected, totals):
+    """Add one held-out resume's per-field correctness to totals (field -> [correct, total]); only labeled fields count."""
+    def check(field, correct):
+        totals.setdefault(field, [0, 0])
+        totals[field][0] += int(bool(correct))
+        totals[field][1] += 1
+
+    for field in ["name", "email", "phone", "location", "linkedin_profile", "github_profile", "website", "summary"]:
+        if field in expected:
+            check(field, parsed[field] == expected[field])
+
+    if "experience" in expected:
+        check("experience count", len(parsed["experience"]) == len(expected["experience"]))
+        for index, entry in enumerate(expected["experience"]):
+            got = parsed["experience"][index] if index < len(parsed["experience"]) else None
+            check("experience position", got and got["position"] == entry["position"])
+            check("experience company", got and got["company"] == entry["company"])
+            check("experience duration", got and got["duration"] == entry["duration"])
+            check("experience bullets", got and len(got["description"]) == entry["bullets"])
+
+    if "education" in expected:
+        for index, entry in enumerate(expected["education"]):
+            got = parsed["education"][index] if index < len(parsed["education"]) else {}
+            for field in ["institution", "degree", "year"]:
+                check(f"education {field}", got.get(field) == entry[field])
+
+    if "skills" in expected:
+        check("skills (exact set)", set(parsed["skills"]) == set(expected["skills"]))
+
+
+def benchmark_resume_parser():
+    totals = {}
+    for fixture in HELD_OUT_RESUMES:
+        score(parse_resume_text(fixture["text"]), fixture["expected"], totals)
+
+    print(f"Accuracy: {len(HELD_OUT_RESUMES)} hand-written held-out resumes (bench_resume_fixtures.py)\n")
+    print(f"{'Field':<24} {'Accuracy':>9} {'Checks':>7}")
+    correct_total = checks_total = 0
+    for field, (correct, total) in totals.items():
+        correct_total += correct
+        checks_total += total
+        print(f"{field:<24} {100 * correct / total:8.1f}% {total:>7}")
+    print(f"{'overall':<24} {100 * correct_total / checks_total:8.1f}% {checks_total:>7}\n")
+
+    # The synthetic corpus follows the layouts the parser was written for, so it is only used for timing
+    rng = random.Random(SEED)
+    corpus = [build_resume(rng) for _ in range(CORPUS_SIZE)]
+    latencies = []
+    for text in corpus:
+        start = time.perf_counter()
+        parse_resume_text(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    print(f"Latency: {CORPUS_SIZE} synthetic resumes, {len(HEADING_STYLES)} heading styles, 4 entry layouts")
+    print(f"Latency p50: {statistics.median(latencies):.2f} ms")
+    print(f"Latency p95: {latencies[int(len(latencies) * 0.95)]:.2f} ms")
+    print(f"Latency max: {latencies[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_resume_parser()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Throughput and accuracy benchmark for skill canonicalization.
+Generates 100k free-form skill strings the way an LLM returns them (aliases,
+odd casing and spacing, dotted names, version suffixes, unknown skills),
+canonicalizes them with SkillCanonicalizer (exact-key table plus trie) and
+compares it with a linear scan over every alias, the straightforward approach
+it replaces, and with a plain dict of alias keys (exact keys only, no version
+suffixes).
+"""
+
+import os
+import json
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from ats_engine import SKILLS_LEXICON_PATH
+from skills import SkillCanonicalizer, skill_key
+
+CORPUS_SIZE = 100_000
+LINEAR_SAMPLE_SIZE = 2_000  # The linear scan is too slow to run over the whole corpus
+UNKNOWN_SHARE = 0.15
+SEED = 11
+
+UNKNOWN_SKILLS = [
+    "Underwater Basket Weaving", "Stakeholder Alignment", "Quarterly Planning", "Forklift Certification",
+    "Event Photography", "Grant Writing", "Conflict Resolution", "Inventory Auditing", "Spanish Tutoring"
+]
+
+
+def vary(alias: str, rng: random.Random) -> str:
+    """Write alias the way it might come back from the model."""
+    choice = rng.random()
+    if choice < 0.25:
+        text = alias.lower()
+    elif choice < 0.45:
+        text = alias.upper()
+    elif choice < 0.6:
+        text = alias.title()
+    else:
+        text = alias
+    if rng.random() < 0.15:
+        text = text.replace(" ", "") if " " in text else text.replace(".", " ")
+    if rng.random() < 0.1:
+        text += rng.choice([" 3", " 2.7", " v17", "3", " 11"])
+    if rng.random() < 0.1:
+        text = f"  {text} "
+    return text
+
+
+def build_corpus(skills: dict[str, list[str]], rng: random.Random) -> list[tuple[str, str]]:
+    """(skill string, expected canonical name or the cleaned string for unknown skills)."""
+    aliases = [(alias, canonical) for canonical, names in skills.items() for alias in [canonical, *names]]
+    corpus = []
+    for _ in range(CORPUS_SIZE):
+        if rng.random() < UNKNOWN_SHARE:
+            unknown = rng.choice(UNKNOWN_SKILLS)
+            corpus.append((unknown, unknown))
+        else:
+            alias, canonical = rng.choice(aliases)
+            corpus.append((vary(alias, rng), canonical))
+    return corpus
+
+
+def linear_canonicalize(skill: str, aliases: list[tuple[str, str]]) -> str:
+    """Compare the normalized skill with every alias in turn."""
+    key = skill_key(skill)
+    for alias_key, canonical in aliases:
+        if key == alias_key:
+            return canonical
+    return " ".join(skill.split())
+
+
+def benchmark_skills():
+    with open(SKILLS_LEXICON_PATH, encoding="utf-8") as f:
+        skills = json.load(f)["skills"]
+    rng = random.Random(SEED)
+    corpus = build_corpus(skills, rng)
+
+    start = time.perf_counter()
+    canonicalizer = SkillCanonicalizer(skills)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    results = [canonicalizer.canonicalize(text) for text, _ in corpus]
+    trie_seconds = time.perf_counter() - start
+
+    batch_latencies = []
+    for offset in range(0, CORPUS_SIZE, 1000):
+        batch = [text for text, _ in corpus[offset:offset + 1000]]
+        start = time.perf_counter()
+        canonicalizer.canonicalize_list(batch)
+        batch_latencies.append((time.perf_counter() - start) * 1000)
+
+    alias_keys = [(skill_key(alias), canonical) for canonical, names in skills.items() for alias in [canonical, *names]]
+    sample = corpus[:LINEAR_SAMPLE_SIZE]
+    start = time.perf_counter()
+    for text, _ in sample:
+        linear_canonicalize(text, alias_keys)
+    linear_per_skill = (time.perf_counter() - start) / LINEAR_SAMPLE_SIZE
+
+    alias_table = {}
+    for alias_key, canonical in alias_keys:
+        alias_table.setdefault(alias_key, canonical)
+    start = time.perf_counter()
+    for text, _ in corpus:
+        alias_table.get(skill_key(text)) or " ".join(text.split())
+    dict_per_skill = (time.perf_counter() - start) / CORPUS_SIZE
+
+    correct = sum(1 for result, (_, expected) in zip(results, corpus) if result == expected)
+    known = [(result, expected) for result, (_, expected) in zip(results, corpus) if expected not in UNKNOWN_SKILLS]
+    distinct_before = len({text for text, _ in corpus})
+    distinct_after = len(set(results))
+    trie_per_skill = trie_seconds / CORPUS_SIZE
+
+    print(f"Corpus: {CORPUS_SIZE} skill strings, {len(skills)} canonical skills, {len(alias_keys)} names and aliases\n")
+    print(f"Build (once at startup):           {build_ms:8.2f} ms")
+    print(f"Canonicalizer, whole corpus:       {trie_seconds * 1000:8.1f} ms ({trie_per_skill * 1e6:.2f} µs per skill)")
+    print(f"Linear alias scan, {LINEAR_SAMPLE_SIZE} sample:   {linear_per_skill * LINEAR_SAMPLE_SIZE * 1000:8.1f} ms ({linear_per_skill * 1e6:.2f} µs per skill)")
+    print(f"Dict of alias keys, whole corpus:  {dict_per_skill * CORPUS_SIZE * 1000:8.1f} ms ({dict_per_skill * 1e6:.2f} µs per skill)")
+    print(f"Speedup over the linear scan: {linear_per_skill / trie_per_skill:.1f}x")
+    print(f"canonicalize_list per 1000 skills: p50 {statistics.median(batch_latencies):.2f} ms, max {max(batch_latencies):.2f} ms\n")
+    print(f"Accuracy: {100 * correct / CORPUS_SIZE:.1f}% overall, {100 * sum(1 for r, e in known if r == e) / len(known):.1f}% on known skills")
+    print(f"Distinct strings: {distinct_before} before, {distinct_after} after canonicalization")
+
+
+if __name__ == "__main__":
+    benchmark_skills()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PDF/DOCX text extraction on long documents.
+Builds a synthetic 300-page PDF and a 5,000-paragraph DOCX, then compares
+the old string-concatenation loops (over the python-docx object model for
+DOCX) with the streaming extractors, with and without the page cap and
+character budget.
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import PyPDF2
+from docx import Document
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from extraction import iter_pdf_pages, iter_docx_text, join_chunks
+
+PAGES = 300
+PARAGRAPHS = 5000
+LINES_PER_PAGE = 45
+
+
+def build_synthetic_pdf() -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(PAGES):
+        for line in range(LINES_PER_PAGE):
+            pdf.drawString(
+                54, 750 - line * 16,
+                f"[{page + 1}.{line + 1}] J. Doe et al. Scalable inference for structured models. Proc. Conf. {2000 + line}."
+            )
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def build_synthetic_docx() -> bytes:
+    doc = Document()
+    for i in range(PARAGRAPHS):
+        doc.add_paragraph(f"Publication {i + 1}: Scalable inference for structured models, with applications to resumes.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def concat_pdf(content: bytes) -> str:
+    """The previous implementation: repeated string concatenation per page."""
+    text = ""
+    for page in PyPDF2.PdfReader(io.BytesIO(content)).pages:
+        text += page.extract_text() + "\n"
+    return text.strip()
+
+
+def concat_docx(content: bytes) -> str:
+    text = ""
+    for paragraph in Document(io.BytesIO(content)).paragraphs:
+        text += paragraph.text + "\n"
+    return text.strip()
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<48} {elapsed * 1000:9.1f} ms  {len(result):>9,} chars")
+    return result
+
+
+def benchmark_text_extraction():
+    pdf_content = build_synthetic_pdf()
+    docx_content = build_synthetic_docx()
+    print(f"Synthetic PDF: {PAGES} pages, {len(pdf_content):,} bytes")
+    print(f"Synthetic DOCX: {PARAGRAPHS} paragraphs, {len(docx_content):,} bytes\n")
+
+    old_pdf = timed("PDF, string concatenation", concat_pdf, pdf_content)
+    new_pdf = timed(
+        "PDF, generator + single join",
+        lambda c: join_chunks(iter_pdf_pages(PyPDF2.PdfReader(io.BytesIO(c)))),
+        pdf_content
+    )
+    assert old_pdf == new_pdf, "Generator-based PDF extraction changed the output"
+    timed(
+        "PDF, 100,000 char budget",
+        lambda c: join_chunks(iter_pdf_pages(PyPDF2.PdfReader(io.BytesIO(c))), 100_000),
+        pdf_content
+    )
+    timed(
+        "PDF, 20 page cap",
+        lambda c: join_chunks(iter_pdf_pages(PyPDF2.PdfReader(io.BytesIO(c)), 20)),
+        pdf_content
+    )
+    print()
+
+    old_docx = timed("DOCX, python-docx + string concatenation", concat_docx, docx_content)
+    new_docx = timed(
+        "DOCX, streaming XML walker + single join",
+        lambda c: join_chunks(iter_docx_text(io.BytesIO(c))),
+        docx_content
+    )
+    assert old_docx == new_docx, "Streaming DOCX extraction changed the output"
+    timed(
+        "DOCX, 100,000 char budget",
+        lambda c: join_chunks(iter_docx_text(io.BytesIO(c)), 100_000),
+        docx_content
+    )
+
+
+if __name__ == "__main__":
+    benchmark_text_extraction()
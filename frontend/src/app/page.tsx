@@ -6,6 +6,9 @@ import { Upload, FileText, Download, Target, Edit2, Save, X, Info, Trash2 } from
 // API URL configuration - reads from environment variable or defaults to localhost
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+// Largest batch /optimize-sections/batch accepts (OPTIMIZATION max_batch_items in backend/config.py)
+const OPTIMIZATION_BATCH_SIZE = 50;
+
 interface ResumeData {
   name: string;
   email: string;
@@ -107,6 +110,17 @@ interface SectionOptimizationResponse {
   message: string;
 }
 
+interface SectionBatchOptimizationResponse {
+  success: boolean;
+  results: {
+    index: number;
+    success: boolean;
+    result: SectionOptimizationResponse | null;
+    error: string;
+  }[];
+  message: string;
+}
+
 // Specific types for each editing section
 type EditingDataType = 
   | { type: 'summary'; data: string }
@@ -546,58 +560,49 @@ export default function Home() {
     const allChanges: string[] = [];
 
     try {
-      for (let i = 0; i < totalItems; i++) {
-        setBulkOptimizationProgress({ current: i + 1, total: totalItems });
-        
-        let sectionData: Record<string, unknown>;
-        switch (optimizingSection) {
-          case 'experience':
-            sectionData = { experience: [sectionArray[i]] };
-            break;
-          case 'education':
-            sectionData = { education: [sectionArray[i]] };
-            break;
-          case 'projects':
-            sectionData = { projects: [sectionArray[i]] };
-            break;
-          case 'publications':
-            sectionData = { publications: [sectionArray[i]] };
-            break;
-          case 'certifications':
-            sectionData = { certifications: [sectionArray[i]] };
-            break;
-          case 'volunteer_experience':
-            sectionData = { volunteer_experience: [sectionArray[i]] };
-            break;
-          case 'references':
-            sectionData = { references: [sectionArray[i]] };
-            break;
-          default:
-            continue;
-        }
+      setBulkOptimizationProgress({ current: 0, total: totalItems });
 
-        const response = await fetch(`${API_URL}/optimize-section`, {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            resume_data: resumeData,
-            job_description: jobDescription,
-            section: optimizingSection,
-            section_data: sectionData,
-            custom_prompt: customPrompt,
-          }),
-        });
+      // Optimize the items in batches the backend accepts; it runs each batch's items concurrently
+      for (let start = 0; start < totalItems; start += OPTIMIZATION_BATCH_SIZE) {
+        const chunk = sectionArray.slice(start, start + OPTIMIZATION_BATCH_SIZE);
+        let batchResult: SectionBatchOptimizationResponse | null = null;
+        try {
+          const response = await fetch(`${API_URL}/optimize-sections/batch`, {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+              resume_data: resumeData,
+              job_description: jobDescription,
+              section: optimizingSection,
+              items: chunk.map((item) => ({ section_data: { [optimizingSection]: [item] } })),
+              custom_prompt: customPrompt,
+            }),
+          });
+
+          if (!response.ok) {
+            throw new Error('Failed to optimize section');
+          }
 
-        if (response.ok) {
-          const result = await response.json();
-          const optimizedItem = result.optimized_section[optimizingSection][0];
-          optimizedItems.push(optimizedItem);
-          allChanges.push(...result.changes_made.map((change: string) => `Item ${i + 1}: ${change}`));
-        } else {
-          optimizedItems.push(sectionArray[i]); // Keep original on error
+          batchResult = await response.json();
+        } catch (error) {
+          // Keep this batch's original items and carry on with the next batch
+          console.error(`Error optimizing items ${start + 1}-${start + chunk.length}:`, error);
         }
+
+        chunk.forEach((item, i) => {
+          const index = start + i;
+          const itemResult = batchResult?.results[i];
+          if (itemResult?.success && itemResult.result) {
+            const optimizedItem = (itemResult.result.optimized_section[optimizingSection] as unknown[])[0];
+            optimizedItems.push(optimizedItem);
+            allChanges.push(...itemResult.result.changes_made.map((change: string) => `Item ${index + 1}: ${change}`));
+          } else {
+            optimizedItems.push(item); // Keep original on error
+          }
+        });
+        setBulkOptimizationProgress({ current: start + chunk.length, total: totalItems });
       }
 
       // Apply all optimizations at once
@@ -2505,7 +2510,7 @@ export default function Home() {
                       <>
                         <div className="animate-spin rounded-full h-3 w-3 border-b-2 border-white"></div>
                         {bulkOptimizationProgress ? (
-                          `Optimizing ${bulkOptimizationProgress.current}/${bulkOptimizationProgress.total}...`
+                          `Optimizing ${bulkOptimizationProgress.total} items...`
                         ) : (
                           'Optimizing...'
                         )}
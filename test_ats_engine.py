@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the local ATS keyword engine: the word-level Aho-Corasick
+matcher, lexicon lookups on word boundaries and keyword scoring, and the
+job description digests the keywords are extracted into and the BM25 first pass
+that ranks candidates by them.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from ats_engine import DEGREE_PATTERN, AhoCorasick, analyze_keywords, extra_terms_automaton, extract_job_keywords, find_keywords, get_skills_lexicon, tokenize, weighted_share
+from job_descriptions import JobDescriptionRegistry, render_job_digest
+from ranking import rank_resumes
+
+JOB_DESCRIPTION = """Senior Backend Engineer
+About us: we build hiring tools.
+Requirements:
+- 5+ years of experience with Python
+- Bachelor's degree in Computer Science
+Responsibilities:
+- Build REST APIs backed by PostgreSQL
+- Review code and mentor engineers
+Benefits: 401k and paid time off"""
+
+RESUME = {
+    "summary": "Backend engineer",
+    "skills": ["Python", "JavaScript"],
+    "experience": [{"position": "Engineer", "company": "Acme", "description": ["Built machine learning pipelines"]}],
+    "education": []
+}
+
+
+def lexicon_skills(text):
+    return {canonical for _, _, canonical in get_skills_lexicon().find(tokenize(text))}
+
+
+def test_overlapping_patterns_all_match():
+    automaton = AhoCorasick([
+        (("react",), "React"),
+        (("react", "native"), "React Native"),
+        (("native",), "native"),
+        (("a", "b", "c"), "abc"),
+        (("b", "c", "d"), "bcd")
+    ])
+    matches = set(automaton.iter_matches(["react", "native", "apps"]))
+    assert matches == {(0, 1, "React"), (0, 2, "React Native"), (1, 2, "native")}
+    # "b c d" is only found by following the failure link out of "a b c"
+    assert set(automaton.iter_matches(["a", "b", "c", "d"])) == {(0, 3, "abc"), (1, 4, "bcd")}
+
+
+def test_multi_word_skills():
+    assert lexicon_skills("Applied machine learning and deep learning") == {"Machine Learning", "Deep Learning"}
+    assert "Ruby on Rails" in lexicon_skills("Shipped Ruby on Rails services")
+    # A phrase split across other words is not a match
+    assert "Machine Learning" not in lexicon_skills("machine vision and learning")
+
+
+def test_word_boundaries():
+    assert lexicon_skills("Built JavaScript apps") == {"JavaScript"}
+    assert lexicon_skills("Java/Spring services") == {"Java", "Spring"}
+    assert lexicon_skills("C++ and C#") == {"C++", "C#"}
+    assert find_keywords("Senior JavaScript developer", [{"keyword": "Java", "required": True, "lexicon": True}]) == set()
+
+
+def test_case_sensitive_names():
+    assert lexicon_skills("go to market") == set()
+    assert lexicon_skills("Services written in Go") == {"Go"}
+
+
+def test_extra_terms_match_on_word_boundaries():
+    keywords = [{"keyword": "SOC2", "required": False, "lexicon": False}]
+    assert find_keywords("Led the SOC2 audit", keywords) == {"SOC2"}
+    assert find_keywords("Led the SOC2X audit", keywords) == set()
+
+
+def test_extra_terms_automaton_is_built_once_per_keyword_set():
+    keywords = extract_job_keywords("Requirements:\nExperience with GraphQL and SOC2 audits")
+    extra_terms_automaton.cache_clear()
+    for resume in [RESUME, {**RESUME, "skills": ["GraphQL"]}, {**RESUME, "summary": "SOC2 lead"}]:
+        analyze_keywords(resume, "", keywords=keywords)
+    info = extra_terms_automaton.cache_info()
+    assert info.misses == 1 and info.hits == 8, info
+
+
+def test_no_keywords_scores_zero():
+    assert weighted_share([], set()) == 0
+    analysis = analyze_keywords(RESUME, "We want friendly people who enjoy helping customers.")
+    assert not analysis["has_keywords"]
+    assert analysis["keyword_match_score"] == analysis["skills_alignment"] == analysis["experience_relevance"] == 0
+
+
+def test_required_keywords_count_double():
+    keywords = extract_job_keywords("Nice to have: Rust\nRequirements:\nPython\nKubernetes")
+    assert {keyword["keyword"]: keyword["required"] for keyword in keywords} == {"Rust": False, "Python": True, "Kubernetes": True}
+    analysis = analyze_keywords(RESUME, "", keywords=keywords)
+    assert analysis["has_keywords"]
+    assert analysis["matched_keywords"] == ["Python"]
+    assert analysis["keyword_match_score"] == 40  # 2 of 1 + 2 + 2
+
+
+def test_job_digest_is_built_once_per_posting():
+    registry = JobDescriptionRegistry(10, 3600)
+    digest = registry.register(JOB_DESCRIPTION)
+    # Spacing, blank lines and repeated lines do not make a different posting
+    reformatted = "  Senior   Backend Engineer\n\n" + JOB_DESCRIPTION.replace("\n", "\n\n")
+    assert registry.register(reformatted) is digest
+    assert registry.get(digest["id"]) is digest
+    assert registry.stats()["entries"] == 1
+
+    assert digest["title"] == "Senior Backend Engineer"
+    assert digest["seniority"] == "senior" and digest["min_years_experience"] == 5 and digest["degree_required"]
+    assert digest["requirements"] == ["5+ years of experience with Python", "Bachelor's degree in Computer Science"]
+    assert digest["responsibilities"] == ["Build REST APIs backed by PostgreSQL", "Review code and mentor engineers"]
+    assert [(keyword["keyword"], keyword["required"]) for keyword in digest["keywords"]] == [
+        ("Python", True), ("REST APIs", False), ("PostgreSQL", False)
+    ]
+    # The prompt text leaves out the company blurb and benefits
+    rendered = render_job_digest(digest)
+    assert "Required skills: Python" in rendered and "Seniority: senior (5+ years)" in rendered
+    assert "401k" not in rendered and "About us" not in rendered
+
+
+def test_degree_requirements_are_not_confused_with_units():
+    for text in [
+        "Bachelor's degree in Computer Science", "BS/MS in Computer Science", "M.S. in Statistics",
+        "MSc or equivalent experience", "PhD preferred", "B.Sc. in Mathematics", "MS in Data Science"
+    ]:
+        assert DEGREE_PATTERN.search(text), text
+    for text in ["Keep p99 under 100 ms", "Latency below 50ms", "Proficient in MS Office", "ms-level response times"]:
+        assert not DEGREE_PATTERN.search(text), text
+    # A latency requirement does not lower education fit for a resume without an education section
+    assert analyze_keywords(RESUME, "Python engineer. Keep p99 under 100 ms.")["education_fit"] == 70
+    assert analyze_keywords(RESUME, "Python engineer. MS in Computer Science required.")["education_fit"] == 30
+
+
+def test_first_pass_ranking_prefers_required_skills():
+    job_description = "Backend engineer. Required: Python and PostgreSQL. Nice to have: Docker."
+    keywords = extract_job_keywords(job_description)
+    weights = {"skills": 2.0, "experience": 1.5, "other": 1.0}
+    candidates = [
+        {"name": "Designer", "skills": ["Figma", "Sketch"], "experience": []},
+        {"name": "Mention", "summary": "Worked near a Python team", "skills": ["Excel"], "experience": []},
+        {"name": "Backend", "skills": ["Python", "PostgreSQL", "Docker"], "experience": [
+            {"position": "Backend Engineer", "company": "Acme", "description": ["Built Python services on PostgreSQL"]}
+        ]},
+        {"name": "Partial", "skills": ["Python"], "experience": []}
+    ]
+    ranking = rank_resumes(candidates, job_description, keywords, weights)
+    assert [index for index, _ in ranking] == [2, 3, 1, 0]
+    # Scores are relative to the best candidate
+    assert ranking[0][1] == 100.0 and ranking[-1][1] == 0.0
+    assert all(earlier[1] >= later[1] for earlier, later in zip(ranking, ranking[1:]))
+    # Ties keep the input order
+    assert [index for index, _ in rank_resumes([candidates[0], candidates[0]], job_description, keywords, weights)] == [0, 1]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ ATS keyword engine tests passed")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Tests for the caches: TTLCache expiry and LRU eviction, the byte-bounded document
+cache and the ETags of generated documents, the ATS result cache, and the SQLite tier, whose expired
+entries are purged while the process runs and whose table is held to its entry
+and byte limits.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx
+import main
+from cache import ByteLRUCache, SQLiteCache, TTLCache
+from workers import ProcessPool
+
+
+def test_ttl_cache_entries_expire():
+    cache = TTLCache(10, 0.05)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    time.sleep(0.1)
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0 and cache.evictions == 1
+
+
+def test_ttl_cache_evicts_the_least_recently_used():
+    cache = TTLCache(2, 3600)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_byte_cache_evicts_until_the_new_value_fits():
+    cache = ByteLRUCache(100)
+    for key in "abc":
+        cache.set(key, b"x" * 30)
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.set("d", b"y" * 40)
+    assert cache.get("b") is None and all(cache.get(key) is not None for key in "acd")
+    assert cache.total_bytes == 100 and cache.evictions == 1
+    # Replacing a value counts only its new size
+    cache.set("d", b"z" * 10)
+    assert cache.total_bytes == 70 and cache.get("d") == b"z" * 10
+
+
+def test_byte_cache_skips_values_larger_than_the_cache():
+    cache = ByteLRUCache(100)
+    cache.set("small", b"x" * 50)
+    cache.set("huge", b"x" * 101)
+    assert cache.get("huge") is None and cache.get("small") is not None
+    assert cache.stats()["bytes"] == 50 and cache.evictions == 0
+
+
+RESUME_DATA = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "phone": "555-1234",
+    "summary": "Software engineer.",
+    "skills": ["Python"],
+    "experience": [],
+    "education": []
+}
+
+
+async def post_documents(requests: list[tuple[dict, dict]]) -> list[httpx.Response]:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        return [await client.post("/generate-pdf", json=resume, headers=headers) for resume, headers in requests]
+
+
+def test_documents_are_cached_by_etag():
+    renders = []
+
+    def render(resume_data):
+        renders.append(resume_data.name)
+        return f"%PDF {resume_data.name}".encode()
+
+    saved = main.generate_pdf, main.process_pool, main.document_cache
+    main.generate_pdf, main.process_pool, main.document_cache = render, ProcessPool(0), ByteLRUCache(1024 * 1024)
+    try:
+        first, = asyncio.run(post_documents([(RESUME_DATA, {})]))
+        etag = first.headers["ETag"]
+        changed = {**RESUME_DATA, "summary": "Senior software engineer."}
+        cached, not_modified, weak, other = asyncio.run(post_documents([
+            (RESUME_DATA, {}),
+            (RESUME_DATA, {"If-None-Match": etag}),
+            (RESUME_DATA, {"If-None-Match": f'"stale", W/{etag}'}),
+            (changed, {"If-None-Match": etag})
+        ]))
+    finally:
+        main.generate_pdf, main.process_pool, main.document_cache = saved
+
+    assert first.status_code == 200 and first.content == b"%PDF Jane Doe"
+    # The second identical request is served from the cache
+    assert cached.status_code == 200 and cached.content == first.content and cached.headers["ETag"] == etag
+    assert not_modified.status_code == 304 and not_modified.content == b"" and not_modified.headers["ETag"] == etag
+    assert weak.status_code == 304
+    # Different input gets a different ETag, so the old one does not match
+    assert other.status_code == 200 and other.headers["ETag"] != etag
+    assert renders == ["Jane Doe", "Jane Doe"]
+
+
+ATS_RESULT = {
+    "score": {"overall_score": 70, "keyword_match_score": 65, "experience_relevance": 72, "education_fit": 80, "skills_alignment": 68},
+    "insights": [],
+    "recommendations": [],
+    "matched_keywords": ["Python"],
+    "missing_keywords": [],
+    "experience_gaps": [],
+    "strengths": [],
+    "removable_words": []
+}
+
+
+class CountingCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=json.dumps(ATS_RESULT))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_ats_results_are_cached_per_resume_and_job_description():
+    completions = CountingCompletions()
+    saved = main.openai_client, main.ats_cache
+    main.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    main.ats_cache = TTLCache(100, 3600)
+    resume = main.ResumeData(**RESUME_DATA)
+    job_description = "Python engineer"
+
+    async def analyze(resume_data=resume, text=job_description, use_cache=True):
+        return await main.analyze_resume_with_ats(resume_data, text, use_cache=use_cache)
+
+    try:
+        first = asyncio.run(analyze())
+        # Changing the returned analysis does not change what the cache holds
+        first.matched_keywords.append("Changed")
+        first.score.overall_score = 1
+        hit = asyncio.run(analyze())
+        assert completions.calls == 1
+        assert hit.matched_keywords == ["Python"] and hit.score.overall_score == 70
+        hit.strengths.append("Changed")
+        assert asyncio.run(analyze()).strengths == []
+
+        # Formatting-only edits to the job description hit the same entry; other changes do not
+        asyncio.run(analyze(text="  Python\n engineer "))
+        assert completions.calls == 1
+        asyncio.run(analyze(text="Senior Python engineer"))
+        assert completions.calls == 2
+        asyncio.run(analyze(resume_data=main.ResumeData(**{**RESUME_DATA, "skills": ["Python", "SQL"]})))
+        assert completions.calls == 3
+
+        # use_cache=False always calls the model
+        asyncio.run(analyze(use_cache=False))
+        assert completions.calls == 4
+    finally:
+        main.openai_client, main.ats_cache = saved
+
+
+def row_count(cache: SQLiteCache) -> int:
+    return cache._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def test_expired_entries_are_purged_on_write():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SQLiteCache(os.path.join(directory, "cache.sqlite3"), 3600, purge_every=5)
+        for index in range(3):
+            cache.set(f"old{index}", "value")
+        cache._conn.execute("UPDATE cache SET expires_at = expires_at - 7200")
+        cache._conn.commit()
+        cache.set("new0", "value")
+        assert row_count(cache) == 4
+        # The fifth write since the last purge removes the expired rows
+        cache.set("new1", "value")
+        assert row_count(cache) == 2
+        assert cache.get("new0") == "value" and cache.get("old0") is None
+        cache.close()
+
+
+def test_entry_limit_evicts_the_oldest():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SQLiteCache(os.path.join(directory, "cache.sqlite3"), 3600, max_entries=3, purge_every=1)
+        for index in range(5):
+            cache.set(f"key{index}", "value")
+        assert row_count(cache) == 3
+        assert [cache.get(f"key{index}") for index in range(5)] == [None, None, "value", "value", "value"]
+        assert cache.stats()["evictions"] == 2
+        cache.close()
+
+
+def test_byte_limit_keeps_the_newest_values_that_fit():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SQLiteCache(os.path.join(directory, "cache.sqlite3"), 3600, max_bytes=250, purge_every=1)
+        for index in range(4):
+            cache.set(f"key{index}", "x" * 100)
+        assert [cache.get(f"key{index}") is not None for index in range(4)] == [False, False, True, True]
+        # Sizes are counted in bytes, not characters
+        cache.set("wide", "é" * 100)
+        assert cache.get("wide") is not None and cache.get("key2") is None and cache.get("key3") is None
+        cache.close()
+
+
+def test_limits_apply_to_an_existing_file_on_open():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.sqlite3")
+        cache = SQLiteCache(path, 3600)
+        for index in range(10):
+            cache.set(f"key{index}", "value")
+        cache.close()
+        cache = SQLiteCache(path, 3600, max_entries=4)
+        assert row_count(cache) == 4
+        cache.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Cache tests passed")
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Load test verifying that LLM-backed endpoints no longer block the event loop.
+Runs in-process against the FastAPI app with a fake OpenAI client whose
+completions take a fixed amount of time, so no API key or server is needed.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx
+import main
+
+LLM_LATENCY = 0.5  # seconds per fake completion
+CONCURRENT_REQUESTS = 8
+
+ATS_RESULT = {
+    "score": {
+        "overall_score": 70,
+        "keyword_match_score": 65,
+        "experience_relevance": 72,
+        "education_fit": 80,
+        "skills_alignment": 68
+    },
+    "insights": [],
+    "recommendations": [],
+    "matched_keywords": ["Python"],
+    "missing_keywords": ["AWS"],
+    "experience_gaps": [],
+    "strengths": [],
+    "removable_words": []
+}
+
+RESUME_DATA = {
+    "name": "John Doe",
+    "email": "john.doe@email.com",
+    "phone": "555-1234",
+    "summary": "Software engineer with 5 years of experience in web development.",
+    "skills": ["Python", "JavaScript"],
+    "experience": [
+        {
+            "position": "Software Engineer",
+            "company": "Tech Corp",
+            "duration": "2020-2023",
+            "description": ["Developed web applications using React and Node.js"]
+        }
+    ],
+    "education": []
+}
+
+
+class FakeCompletions:
+    """Stand-in for `chat.completions` that sleeps like a slow model."""
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(LLM_LATENCY)
+        message = SimpleNamespace(content=json.dumps(ATS_RESULT))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+class FakeOpenAI:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=FakeCompletions())
+
+
+async def run_load_test():
+    main.openai_client = FakeOpenAI()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=30) as client:
+        async def analyze(i):
+            response = await client.post("/analyze-ats", json={
+                "resume_data": RESUME_DATA,
+                "job_description": f"Senior Python engineer, posting #{i}"
+            })
+            assert response.status_code == 200, response.text
+            return response.json()
+
+        async def health_check():
+            # Give the ATS requests a moment to start, then hit the health endpoint
+            await asyncio.sleep(LLM_LATENCY / 5)
+            start = time.perf_counter()
+            response = await client.get("/")
+            assert response.status_code == 200
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(analyze(i) for i in range(CONCURRENT_REQUESTS)),
+            health_check()
+        )
+        elapsed = time.perf_counter() - start
+
+    health_latency = results[-1]
+    return elapsed, health_latency
+
+
+def test_concurrent_requests_overlap():
+    """Concurrent ATS analyses should take about one model latency, not N of them."""
+    elapsed, health_latency = asyncio.run(run_load_test())
+    serial_time = CONCURRENT_REQUESTS * LLM_LATENCY
+
+    print(f"{CONCURRENT_REQUESTS} concurrent /analyze-ats requests: {elapsed:.2f}s "
+          f"(serial would be {serial_time:.2f}s)")
+    print(f"GET / while analyses were in flight: {health_latency * 1000:.1f}ms")
+
+    assert elapsed < 2 * LLM_LATENCY, "LLM calls are running one after another"
+    assert health_latency < LLM_LATENCY, "Health check was blocked by an LLM call"
+
+
+class CountingCompletions:
+    """Stand-in for `chat.completions` that records how many completions are in flight at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            self.in_flight -= 1
+        message = SimpleNamespace(content=json.dumps({"summary": "Engineer"}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+HYBRID_RESUME_TEXT = """John Doe
+john.doe@email.com | 555-1234
+SUMMARY
+Software engineer with 5 years of experience.
+EXPERIENCE
+Software Engineer, Tech Corp, 2020-2023
+- Developed web applications
+EDUCATION
+BS Computer Science, State University, 2019
+SKILLS
+Python, JavaScript
+PROJECTS
+Resume Copilot
+- Built a resume parser
+"""
+
+
+def test_hybrid_parse_takes_a_limiter_slot_per_section():
+    """Hybrid parsing sends several sections at once; each completion must wait for its own limiter slot."""
+    completions = CountingCompletions()
+    saved = main.openai_client, main.Config.RESUME_PARSING["hybrid_confidence_threshold"]
+    main.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    # Send every section to the LLM
+    main.Config.RESUME_PARSING["hybrid_confidence_threshold"] = 2.0
+    try:
+        response = asyncio.run(main.parse_resume_hybrid(HYBRID_RESUME_TEXT, llm_limiter=asyncio.Semaphore(2)))
+    finally:
+        main.openai_client, main.Config.RESUME_PARSING["hybrid_confidence_threshold"] = saved
+
+    assert completions.calls > 2, completions.calls
+    assert completions.max_in_flight == 2, completions.max_in_flight
+    assert len(response.llm_sections) == completions.calls
+
+
+async def run_registered_job_description_checks():
+    job_description = "Backend Engineer\nRequirements:\n- Python and AWS\nResponsibilities:\n- Build web applications with React"
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        registered = (await client.post("/job-descriptions", json={"job_description": job_description})).json()
+        again = (await client.post("/job-descriptions", json={"job_description": job_description + "\n\n"})).json()
+        assert registered["job_description_id"] == again["job_description_id"]
+        assert registered["required_keywords"] == ["Python", "AWS"]
+
+        by_id = await client.post("/analyze-ats", json={
+            "resume_data": RESUME_DATA, "job_description_id": registered["job_description_id"], "mode": "fast"
+        })
+        by_text = await client.post("/analyze-ats", json={
+            "resume_data": RESUME_DATA, "job_description": job_description, "mode": "fast"
+        })
+        assert by_id.status_code == 200, by_id.text
+        assert by_id.json()["matched_keywords"] == by_text.json()["matched_keywords"] == ["Python", "React"]
+        assert by_id.json()["missing_keywords"] == ["AWS"]
+
+        missing = await client.post("/analyze-ats", json={"resume_data": RESUME_DATA, "job_description_id": "0" * 32, "mode": "fast"})
+        assert missing.status_code == 404, missing.text
+
+
+def test_registered_job_description_is_used_by_id():
+    asyncio.run(run_registered_job_description_checks())
+
+
+class ScoringCompletions(CountingCompletions):
+    """Returns the ATS score written into the job description as "score=NN"; "score=fail" raises."""
+
+    async def create(self, **kwargs):
+        await super().create(**kwargs)
+        prompt = " ".join(message["content"] for message in kwargs["messages"])
+        score = prompt.split("score=")[1].split()[0]
+        if score == "fail":
+            raise RuntimeError("model unavailable")
+        result = dict(ATS_RESULT, score=dict(ATS_RESULT["score"], overall_score=int(score)))
+        message = SimpleNamespace(content=json.dumps(result))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+MULTI_JOB_DESCRIPTIONS = [
+    "Python engineer building React web applications, score=40",
+    "Python developer for Node.js services, score=fail",
+    "Python and JavaScript engineer, score=90",
+    "Embedded C++ and Rust firmware engineer with Verilog and MATLAB, score=99",
+    "Python web developer using React, score=65"
+]
+
+
+async def run_multi_ats(payload: dict) -> dict:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=30) as client:
+        response = await client.post("/analyze-ats/multi", json=dict(payload, resume_data=RESUME_DATA, use_cache=False))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_multi_ats_ranks_jobs_and_prefilters_irrelevant_ones():
+    completions = ScoringCompletions()
+    saved = main.openai_client, main.Config.RESUME_OPTIMIZATION["batch_concurrency"]
+    main.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    main.Config.RESUME_OPTIMIZATION["batch_concurrency"] = 2
+    try:
+        response = asyncio.run(run_multi_ats({"job_descriptions": MULTI_JOB_DESCRIPTIONS, "prefilter": True}))
+    finally:
+        main.openai_client, main.Config.RESUME_OPTIMIZATION["batch_concurrency"] = saved
+
+    # The firmware job shares no keywords with the resume, so it is scored locally instead of by the model
+    assert completions.calls == 4 and completions.max_in_flight == 2
+    results = response["results"]
+    assert [result["index"] for result in results] == [2, 4, 0, 3, 1]
+    assert [result["analysis"]["score"]["overall_score"] for result in results[:3]] == [90, 65, 40]
+    assert results[3]["skipped"] and results[3]["success"] and results[3]["analysis"]["score"]["overall_score"] < 40
+    assert not results[4]["success"] and "model unavailable" in results[4]["error"]
+    assert response["success"] and "1 scored locally" in response["message"]
+
+
+def test_multi_ats_fast_mode_makes_no_llm_calls():
+    completions = ScoringCompletions()
+    saved = main.openai_client
+    main.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    try:
+        response = asyncio.run(run_multi_ats({"job_descriptions": MULTI_JOB_DESCRIPTIONS, "mode": "fast"}))
+    finally:
+        main.openai_client = saved
+
+    assert completions.calls == 0
+    results = response["results"]
+    assert all(result["success"] and not result["skipped"] for result in results)
+    scores = [result["analysis"]["score"]["overall_score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
+    assert results[-1]["index"] == 3
+
+
+def candidate(name: str, skills: list[str], score: int) -> dict:
+    return dict(RESUME_DATA, name=name, skills=skills, summary=f"Engineer, score={score}")
+
+
+def test_rank_candidates_analyzes_only_the_top_k():
+    completions = ScoringCompletions()
+    saved = main.openai_client
+    main.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    resumes = [
+        candidate("Weak", ["Excel"], 95),
+        candidate("Strong", ["Python", "PostgreSQL", "Docker"], 60),
+        candidate("Medium", ["Python"], 80),
+        candidate("Other", ["Figma"], 99)
+    ]
+    payload = {"resumes": resumes, "job_description": "Python and PostgreSQL engineer, Docker a plus", "top_k": 2, "use_cache": False}
+    transport = httpx.ASGITransport(app=main.app)
+
+    async def rank():
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=30) as client:
+            return await client.post("/rank-candidates", json=payload)
+
+    try:
+        response = asyncio.run(rank())
+    finally:
+        main.openai_client = saved
+
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    # The two best first-pass candidates are analyzed and ordered by ATS score; the rest keep their first-pass order
+    assert completions.calls == 2
+    assert [result["name"] for result in results[:2]] == ["Medium", "Strong"]
+    assert [result["analysis"]["score"]["overall_score"] for result in results[:2]] == [80, 60]
+    assert [result["first_pass_rank"] for result in results] == [2, 1, 3, 4]
+    assert all(result["analysis"] is None for result in results[2:])
+    assert results[1]["first_pass_score"] == 100.0
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_overlap()
+    test_hybrid_parse_takes_a_limiter_slot_per_section()
+    test_registered_job_description_is_used_by_id()
+    test_multi_ats_ranks_jobs_and_prefilters_irrelevant_ones()
+    test_multi_ats_fast_mode_makes_no_llm_calls()
+    test_rank_candidates_analyzes_only_the_top_k()
+    print("✅ Requests overlapped instead of running sequentially")
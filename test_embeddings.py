@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the local hashed n-gram embeddings: top-k search over an index, job
+requirements matched to similar resume skills and bullets in ATS analyses, and
+bullets ordered for rewriting by how little they resemble the job.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx
+import main
+from embeddings import EmbeddingIndex, HashedNgramEmbedder
+
+embedder = HashedNgramEmbedder(512)
+
+SKILLS = [{"text": "Python programming"}, {"text": "PostgreSQL databases"}, {"text": "Team leadership"}]
+
+
+def test_search_returns_the_most_similar_items_best_first():
+    index = EmbeddingIndex(embedder, SKILLS)
+    results = index.search(["python developer", "database administration with postgresql"], k=2)
+    assert [item["text"] for item, _ in results[0]][0] == "Python programming"
+    assert [item["text"] for item, _ in results[1]][0] == "PostgreSQL databases"
+    for row in results:
+        assert len(row) == 2
+        assert row[0][1] >= row[1][1]
+
+
+def test_search_with_k_above_the_item_count_returns_every_item():
+    results = EmbeddingIndex(embedder, SKILLS).search(["python"], k=10)
+    assert len(results) == 1 and len(results[0]) == len(SKILLS)
+    assert sorted(item["text"] for item, _ in results[0]) == sorted(item["text"] for item in SKILLS)
+    similarities = [similarity for _, similarity in results[0]]
+    assert similarities == sorted(similarities, reverse=True)
+
+
+def test_empty_queries_and_items():
+    index = EmbeddingIndex(embedder, SKILLS)
+    assert index.search([], k=3) == []
+    assert list(index.best_similarity([])) == [0.0, 0.0, 0.0]
+    empty = EmbeddingIndex(embedder, [])
+    assert empty.search(["python", "sql"], k=3) == [[], []]
+    assert len(empty.best_similarity(["python"])) == 0
+    # Text with nothing to embed matches nothing
+    assert all(similarity == 0.0 for _, similarity in index.search([""], k=3)[0])
+
+
+EMBEDDING_JOB_DESCRIPTION = """Backend Engineer
+Requirements:
+- Experience designing RESTful APIs in Python
+- Familiarity with Kubernetes cluster operations
+- Fluent in Mandarin
+"""
+
+EMBEDDING_RESUME = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "phone": "555-1234",
+    "summary": "",
+    "skills": ["Python", "Kubernetes"],
+    "experience": [{
+        "position": "Engineer",
+        "company": "Acme",
+        "duration": "2020-2023",
+        "description": [
+            "Designed REST APIs with Python and Flask",
+            "Organized the team offsite",
+            "Operated Kubernetes clusters in production"
+        ]
+    }],
+    "education": []
+}
+
+
+def test_requirements_are_matched_to_similar_resume_bullets():
+    async def analyze():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.post("/analyze-ats", json={
+                "resume_data": EMBEDDING_RESUME, "job_description": EMBEDDING_JOB_DESCRIPTION, "mode": "fast"
+            })
+
+    response = asyncio.run(analyze())
+    assert response.status_code == 200, response.text
+    analysis = response.json()
+    # Paraphrased requirements find their bullets; nothing on the resume resembles the language requirement
+    assert [(match["requirement"], match["evidence"], match["source"]) for match in analysis["requirement_matches"]] == [
+        ("Experience designing RESTful APIs in Python", "Designed REST APIs with Python and Flask", "experience"),
+        ("Familiarity with Kubernetes cluster operations", "Operated Kubernetes clusters in production", "experience")
+    ]
+    assert all(match["similarity"] >= main.Config.EMBEDDINGS["min_similarity"] for match in analysis["requirement_matches"])
+    assert analysis["unmatched_requirements"] == ["Fluent in Mandarin"]
+
+
+def test_bullet_priority_puts_the_least_aligned_bullets_first():
+    job_digest = main.job_registry.register(EMBEDDING_JOB_DESCRIPTION)
+    priority = main.bullet_rewrite_priority("experience", EMBEDDING_RESUME, job_digest)
+    assert [(bullet.entry, bullet.bullet) for bullet in priority] == [(0, 1), (0, 2), (0, 0)]
+    assert priority[0].text == "Organized the team offsite"
+    assert [bullet.alignment for bullet in priority] == sorted(bullet.alignment for bullet in priority)
+    # Sections without bullets, and optimizations without a job description, have no priority
+    assert main.bullet_rewrite_priority("skills", EMBEDDING_RESUME, job_digest) == []
+    assert main.bullet_rewrite_priority("experience", EMBEDDING_RESUME, None) == []
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Embedding tests passed")
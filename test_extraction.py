@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming DOCX extractor: headers, body paragraphs, table rows and
+text boxes come out in reading order, with a text box's text right after the
+paragraph it is anchored in (or within its table cell), and text box fallback
+copies are not repeated.
+"""
+
+import io
+import os
+import string
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from docx import Document
+from docx.oxml import parse_xml
+
+from extraction import iter_docx_text, join_chunks
+
+# A floating text box as Word writes it: the drawing (mc:Choice) and a VML copy for old readers (mc:Fallback)
+TEXT_BOX_PARAGRAPH = """
+<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+     xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+     xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+     xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"
+     xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+     xmlns:v="urn:schemas-microsoft-com:vml">
+  $before
+  <w:r>
+    <mc:AlternateContent>
+      <mc:Choice Requires="wps">
+        <w:drawing>
+          <wp:anchor>
+            <a:graphic>
+              <a:graphicData uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">
+                <wps:wsp>
+                  <wps:txbx>
+                    <w:txbxContent>$lines</w:txbxContent>
+                  </wps:txbx>
+                </wps:wsp>
+              </a:graphicData>
+            </a:graphic>
+          </wp:anchor>
+        </w:drawing>
+      </mc:Choice>
+      <mc:Fallback>
+        <w:pict>
+          <v:shape>
+            <v:textbox>
+              <w:txbxContent>$lines</w:txbxContent>
+            </v:textbox>
+          </v:shape>
+        </w:pict>
+      </mc:Fallback>
+    </mc:AlternateContent>
+  </w:r>
+  $after
+</w:p>
+"""
+
+
+def text_box_paragraph(lines: list[str], before: str = "", after: str = ""):
+    """A paragraph holding a text box with the given lines, between optional runs of text."""
+    run = lambda text: f"<w:r><w:t xml:space=\"preserve\">{text}</w:t></w:r>" if text else ""
+    xml = string.Template(TEXT_BOX_PARAGRAPH).substitute(
+        before=run(before),
+        after=run(after),
+        lines="".join(f"<w:p>{run(line)}</w:p>" for line in lines)
+    )
+    return parse_xml(xml)
+
+
+def save(document) -> bytes:
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def build_docx() -> bytes:
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe - Resume"
+    document.sections[0].footer.paragraphs[0].text = "Page 1"
+    document.add_paragraph("Jane Doe")
+    # Body content goes before the section properties, which python-docx keeps last
+    document.element.body.sectPr.addprevious(text_box_paragraph(["jane@example.com", "github.com/janedoe"]))
+    document.add_paragraph("Skills")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Languages"
+    table.cell(0, 1).text = "Python, SQL"
+    table.cell(1, 0).text = "Tools"
+    table.cell(1, 1).text = "Docker"
+    table.cell(1, 1).add_paragraph("Kubernetes")
+    document.add_paragraph("Experience")
+    return save(document)
+
+
+def test_docx_tables_and_text_boxes_in_reading_order():
+    blocks = list(iter_docx_text(io.BytesIO(build_docx())))
+    assert blocks == [
+        "Jane Doe - Resume",
+        "Jane Doe",
+        "jane@example.com",
+        "github.com/janedoe",
+        "Skills",
+        "Languages | Python, SQL",
+        "Tools | Docker Kubernetes",
+        "Experience",
+        "Page 1"
+    ], blocks
+
+
+def test_text_box_follows_the_paragraph_it_is_anchored_in():
+    document = Document()
+    document.add_paragraph("Summary")
+    document.element.body.sectPr.addprevious(text_box_paragraph(["Open to relocation"], before="Engineer with", after=" 8 years"))
+    document.add_paragraph("Experience")
+    blocks = list(iter_docx_text(io.BytesIO(save(document))))
+    assert blocks == ["Summary", "Engineer with 8 years", "Open to relocation", "Experience"], blocks
+
+
+def test_text_box_in_a_table_cell_stays_in_its_row():
+    document = Document()
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Languages"
+    table.cell(0, 1).text = "Python"
+    table.cell(0, 1)._tc.append(text_box_paragraph(["Go", "Rust"], before="SQL"))
+    table.cell(1, 0).text = "Tools"
+    table.cell(1, 1).text = "Docker"
+    document.add_paragraph("Experience")
+    blocks = list(iter_docx_text(io.BytesIO(save(document))))
+    assert blocks == ["Languages | Python SQL Go Rust", "Tools | Docker", "Experience"], blocks
+
+
+def test_docx_text_respects_the_character_budget():
+    text = join_chunks(iter_docx_text(io.BytesIO(build_docx())), max_chars=30)
+    assert text == "Jane Doe - Resume\nJane Doe\njan"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Text extraction tests passed")
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk parsing uploads: unpacking zips safely (member names that try to
+escape the staging directory, oversized members, zip bombs) and the file count
+limits of POST /parse-resumes/jobs, which running jobs are marked interrupted, and
+the periodic maintenance that deletes expired jobs; and reading uploads in chunks,
+with the size limit and large uploads spilled to a temp file.
+Runs in-process; no server or API key is needed.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx
+import main
+from fastapi import HTTPException, UploadFile
+from jobs import BulkJobStore, unpack_resume_zip
+from workers import ProcessPool
+
+ALLOWED_EXTENSIONS = [".pdf", ".docx"]
+MB = 1024 * 1024
+
+
+def write_zip(path: str, members: dict) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+def unpack(members: dict, max_member_size: int = MB, max_files: int = 100, max_total_size: int = 10 * MB):
+    """Unpack a zip of members; return the entries and the files written, relative to a scratch directory."""
+    with tempfile.TemporaryDirectory() as directory:
+        zip_path = os.path.join(directory, "upload.zip")
+        dest_dir = os.path.join(directory, "files")
+        os.makedirs(dest_dir)
+        write_zip(zip_path, members)
+        entries = unpack_resume_zip(zip_path, dest_dir, ALLOWED_EXTENSIONS, max_member_size, max_files, max_total_size)
+        written = sorted(
+            os.path.relpath(os.path.join(root, name), directory)
+            for root, _, names in os.walk(directory) for name in names
+        )
+        return entries, written
+
+
+def unpack_error(members: dict, **limits) -> HTTPException:
+    try:
+        unpack(members, **limits)
+    except HTTPException as e:
+        return e
+    raise AssertionError("The zip was accepted")
+
+
+def test_member_names_cannot_escape_the_staging_directory():
+    entries, written = unpack({
+        "../../evil.pdf": b"%PDF-1.4 zero",  # Starts with "." so is skipped like a hidden file
+        "resumes/../../evil.pdf": b"%PDF-1.4 one",
+        "/etc/absolute.pdf": b"%PDF-1.4 two",
+        "nested/../../../up.docx": b"docx",
+        "C:\\windows\\drive.pdf": b"%PDF-1.4 three"
+    })
+    assert written == ["files/0.pdf", "files/1.pdf", "files/2.docx", "files/3.pdf", "upload.zip"], written
+    assert [entry["filename"] for entry in entries] == [
+        "resumes/../../evil.pdf", "/etc/absolute.pdf", "nested/../../../up.docx", "C:\\windows\\drive.pdf"
+    ]
+    assert all(entry["path"] and not entry["error"] for entry in entries)
+
+
+def test_skips_folders_and_hidden_files_and_flags_unsupported_types():
+    entries, written = unpack({
+        "resumes/": b"",
+        "__MACOSX/resumes/._a.pdf": b"fork",
+        "resumes/.DS_Store": b"finder",
+        "resumes/a.pdf": b"%PDF-1.4",
+        "resumes/notes.txt": b"hello"
+    })
+    assert [entry["filename"] for entry in entries] == ["resumes/a.pdf", "resumes/notes.txt"]
+    assert entries[1]["error"].startswith("Unsupported file type") and not entries[1]["path"]
+    assert written == ["files/0.pdf", "upload.zip"]
+
+
+def test_oversized_members_fail_alone():
+    entries, written = unpack({"small.pdf": b"x" * 100, "big.pdf": b"x" * (MB + 1)}, max_member_size=MB)
+    assert entries[0]["size"] == 100 and not entries[0]["error"]
+    assert entries[1]["error"].startswith("File too large") and not entries[1]["path"]
+    assert written == ["files/0.pdf", "upload.zip"]
+
+
+def test_member_that_understates_its_size_is_cut_off():
+    with tempfile.TemporaryDirectory() as directory:
+        zip_path = os.path.join(directory, "upload.zip")
+        write_zip(zip_path, {"bomb.pdf": b"\0" * (3 * MB)})
+        # Rewrite the declared uncompressed size in both headers to 10 bytes
+        with open(zip_path, "rb") as source:
+            data = bytearray(source.read())
+        with zipfile.ZipFile(zip_path) as archive:
+            info = archive.infolist()[0]
+        data[info.header_offset + 22:info.header_offset + 26] = (10).to_bytes(4, "little")
+        central = data.rindex(b"PK\x01\x02")
+        data[central + 24:central + 28] = (10).to_bytes(4, "little")
+        with open(zip_path, "wb") as target:
+            target.write(bytes(data))
+        # zipfile stops reading at the declared size (or rejects the member), so at most
+        # max_member_size bytes are ever written
+        dest_dir = os.path.join(directory, "files")
+        os.makedirs(dest_dir)
+        try:
+            entries = unpack_resume_zip(zip_path, dest_dir, ALLOWED_EXTENSIONS, MB, 10, 10 * MB)
+        except zipfile.BadZipFile:
+            entries = []
+        for name in os.listdir(dest_dir):
+            assert os.path.getsize(os.path.join(dest_dir, name)) <= MB
+        assert all(entry["size"] <= MB for entry in entries)
+
+
+def test_total_unpacked_size_is_bounded():
+    members = {f"{index}.pdf": b"\0" * (MB - 1) for index in range(5)}
+    error = unpack_error(members, max_member_size=MB, max_total_size=3 * MB)
+    assert error.status_code == 413 and "too large" in error.detail
+    entries, _ = unpack(members, max_member_size=MB, max_total_size=5 * MB)
+    assert sum(entry["size"] for entry in entries) == 5 * (MB - 1)
+
+
+def test_too_many_members():
+    members = {f"{index}.pdf": b"%PDF-1.4" for index in range(4)}
+    error = unpack_error(members, max_files=3)
+    assert error.status_code == 400 and "Too many files" in error.detail
+    # Skipped entries do not count
+    entries, _ = unpack({**{f"{index}.pdf": b"%PDF-1.4" for index in range(3)}, "__MACOSX/._0.pdf": b"", "docs/": b""}, max_files=3)
+    assert len(entries) == 3
+
+
+def test_only_jobs_of_stopped_runs_are_interrupted():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bulk_jobs.sqlite3")
+        files = [{"filename": "a.pdf", "error": ""}, {"filename": "b.pdf", "error": ""}]
+        first = BulkJobStore(path, 3600, 300)
+        job_id = first.create_job("full", files)
+        # No progress for an hour (e.g. waiting on the LLM limiter) does not make a job of a live run stale
+        first._conn.execute("UPDATE jobs SET updated_at = updated_at - 3600")
+        first._conn.commit()
+        second = BulkJobStore(path, 3600, 300)
+        second.interrupt_stale()
+        first.interrupt_stale()
+        assert first.get_job(job_id)["status"] == "running"
+
+        # Reading a job writes nothing
+        changes = first._conn.total_changes
+        first.get_job(job_id)
+        assert first._conn.total_changes == changes
+
+        # Once the first run's heartbeat is old, another run interrupts its job
+        first._conn.execute("UPDATE runs SET heartbeat_at = heartbeat_at - 600 WHERE run_id = ?", (first.run_id,))
+        first._conn.commit()
+        second.interrupt_stale()
+        job = second.get_job(job_id)
+        assert job["status"] == "interrupted" and job["counts"]["failed"] == 2, job
+
+        # Late writes from the first run do not contradict the interrupted state
+        first.update_file(job_id, 0, "done", resume_id="r1")
+        first.finish_job(job_id)
+        job = second.get_job(job_id)
+        assert job["status"] == "interrupted" and job["counts"]["failed"] == 2, job
+        first.close()
+        second.close()
+
+
+def test_maintenance_deletes_expired_jobs_and_their_results():
+    with tempfile.TemporaryDirectory() as directory:
+        saved = main.bulk_jobs
+        main.bulk_jobs = BulkJobStore(os.path.join(directory, "bulk_jobs.sqlite3"), 3600, 300)
+        try:
+            old_job = main.bulk_jobs.create_job("fast", [{"filename": "a.pdf", "error": ""}])
+            main.bulk_jobs.update_file(old_job, 0, "done", resume_id="r1", result="{}")
+            main.bulk_jobs.finish_job(old_job)
+            new_job = main.bulk_jobs.create_job("fast", [{"filename": "b.pdf", "error": ""}])
+            main.bulk_jobs._conn.execute("UPDATE jobs SET created_at = created_at - 7200 WHERE id = ?", (old_job,))
+            main.bulk_jobs._conn.commit()
+
+            asyncio.run(main.run_bulk_job_maintenance())
+            assert main.bulk_jobs.get_job(old_job) is None
+            assert main.bulk_jobs.get_job(new_job)["status"] == "running"
+            assert main.bulk_jobs._conn.execute("SELECT COUNT(*) FROM job_files WHERE job_id = ?", (old_job,)).fetchone()[0] == 0
+        finally:
+            main.bulk_jobs.close()
+            main.bulk_jobs = saved
+
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="resume.pdf")
+
+
+def with_upload_limits(check):
+    """Run check(directory) with small upload limits and temp_dir in a scratch directory."""
+    saved = dict(main.Config.UPLOAD)
+    with tempfile.TemporaryDirectory() as directory:
+        main.Config.UPLOAD.update(max_file_size=1000, spill_threshold=100, chunk_size=30, temp_dir=os.path.join(directory, "spill"))
+        try:
+            check(directory)
+        finally:
+            main.Config.UPLOAD.clear()
+            main.Config.UPLOAD.update(saved)
+
+
+def test_small_uploads_stay_in_memory_and_large_ones_spill():
+    def check(directory):
+        content, digest = asyncio.run(main.read_upload(upload(b"x" * 100), ".pdf"))
+        assert content == b"x" * 100 and len(digest) == 64
+        assert not os.path.exists(os.path.join(directory, "spill"))
+
+        data = bytes(range(256)) * 2
+        content, spilled_digest = asyncio.run(main.read_upload(upload(data), ".pdf"))
+        assert isinstance(content, str) and content.endswith(".pdf")
+        with open(content, "rb") as spilled:
+            assert spilled.read() == data
+        assert len(spilled_digest) == 64
+        main.discard_upload(content)
+        assert not os.path.exists(content)
+
+    with_upload_limits(check)
+
+
+def test_uploads_over_the_limit_are_rejected_and_cleaned_up():
+    def check(directory):
+        try:
+            asyncio.run(main.read_upload(upload(b"x" * 1001)))
+            raise AssertionError("The upload was accepted")
+        except HTTPException as e:
+            assert e.status_code == 413
+        assert os.listdir(os.path.join(directory, "spill")) == []
+
+        path = os.path.join(directory, "staged.pdf")
+        try:
+            asyncio.run(main.stage_upload(upload(b"x" * 1001), path, 1000))
+            raise AssertionError("The upload was accepted")
+        except HTTPException as e:
+            assert e.status_code == 413
+        assert not os.path.exists(path)
+        assert len(asyncio.run(main.stage_upload(upload(b"x" * 1000), path, 1000))) == 64
+        assert os.path.getsize(path) == 1000
+
+    with_upload_limits(check)
+
+
+def test_staging_reports_the_error_from_opening_the_file():
+    def failing_open(path, mode):
+        raise OSError("No space left on device")
+
+    main.open = failing_open  # Shadows the builtin inside main only
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            asyncio.run(main.stage_upload(upload(b"data"), os.path.join(directory, "staged.pdf"), 1000))
+        raise AssertionError("The upload was staged")
+    except OSError as e:
+        # Not a FileNotFoundError from removing a file that was never created
+        assert str(e) == "No space left on device" and e.__context__ is None, repr(e)
+    finally:
+        del main.open
+
+
+def zip_bytes(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+async def post_bulk_upload(files: list) -> httpx.Response:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post("/parse-resumes/jobs", files=files, data={"mode": "fast"})
+        # Let the background job finish before the event loop closes
+        await asyncio.gather(*list(main.bulk_job_tasks.values()), return_exceptions=True)
+        return response
+
+
+def run_with_bulk_limits(max_files: int, upload):
+    """Post an upload to a fresh job store with a given file limit; returns the response."""
+    with tempfile.TemporaryDirectory() as directory:
+        saved = main.bulk_jobs, main.process_pool, main.bulk_config["max_files"]
+        main.bulk_jobs = BulkJobStore(os.path.join(directory, "bulk_jobs.sqlite3"), 3600, 1800)
+        main.process_pool = ProcessPool(0)
+        main.bulk_config["max_files"] = max_files
+        try:
+            return asyncio.run(post_bulk_upload(upload))
+        finally:
+            main.bulk_jobs.close()
+            main.bulk_jobs, main.process_pool, main.bulk_config["max_files"] = saved
+
+
+def test_endpoint_rejects_too_many_files():
+    response = run_with_bulk_limits(3, [("files", (f"{index}.txt", b"text")) for index in range(4)])
+    assert response.status_code == 400 and "Too many files" in response.json()["detail"], response.text
+    # Files inside zips count towards the same limit
+    response = run_with_bulk_limits(3, [
+        ("files", ("a.txt", b"text")),
+        ("files", ("more.zip", zip_bytes({f"{index}.txt": b"text" for index in range(3)})))
+    ])
+    assert response.status_code == 400 and "Too many files" in response.json()["detail"], response.text
+
+
+def test_endpoint_accepts_more_files_than_the_multipart_default():
+    # Starlette stops at 1000 files per form unless told otherwise
+    response = run_with_bulk_limits(1200, [("files", (f"{index}.txt", b"text")) for index in range(1001)])
+    assert response.status_code == 202, response.text
+    assert response.json()["total"] == 1001
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Bulk upload tests passed")
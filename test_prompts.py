@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the prompt templates: the fixed instructions of each LLM prompt come before
+its first placeholder, so the system message and the instructions form a static prefix
+that is identical on every request, with only the resume and job data after it.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from prompt_templates import PromptRegistry
+
+# User templates and their system messages
+CACHED_PROMPTS = [
+    ("resume_parsing", "resume_parsing_system"),
+    ("ats_analysis", "ats_analysis_system"),
+    ("section_optimization", "section_optimization_system")
+]
+LAST_INSTRUCTION = "Return only the JSON object, no additional text or formatting."
+
+registry = PromptRegistry()
+
+
+def test_instructions_come_before_the_first_placeholder():
+    for version, templates in registry.templates.items():
+        for name, _ in CACHED_PROMPTS:
+            template = templates[name]
+            prefix = template.static_prefix
+            assert LAST_INSTRUCTION in prefix, f"{version}/{name}: instructions are not all in the static prefix"
+            # Only data follows the prefix: the output format and rules are not repeated after it
+            rest = template.render(**{placeholder: "" for placeholder in template.placeholders})[len(prefix):]
+            assert "JSON" not in rest and "IMPORTANT" not in rest, f"{version}/{name}: instructions after a placeholder"
+
+
+def test_system_messages_have_no_placeholders():
+    # A placeholder in the system message would make the whole prompt uncacheable
+    for version, templates in registry.templates.items():
+        for _, system_name in CACHED_PROMPTS:
+            assert not templates[system_name].placeholders, f"{version}/{system_name}"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Prompt tests passed")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline resume parser: heading detection and section segmentation,
+contact details pulled from the header, per-section confidence, and hybrid parsing,
+which sends only the low-confidence sections to the LLM.
+Accuracy on held-out resumes is measured separately by bench_resume_parser.py.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from resume_parser import heading_section, parse_contact, parse_sections, section_confidence, segment_sections
+
+CLEAN_RESUME = """Jane Doe
+San Francisco, CA | jane.doe@example.com | (555) 123-4567
+linkedin.com/in/janedoe | github.com/janedoe
+
+PROFESSIONAL SUMMARY
+Backend engineer with 6 years of experience building APIs.
+
+Work Experience
+Senior Software Engineer | Acme Corp | Jan 2021 - Present
+- Built Python services handling 2M requests a day
+- Led migration to PostgreSQL
+Software Engineer | Globex Inc | 2018 - 2020
+- Developed React dashboards
+
+Education
+B.S. Computer Science, Stanford University, 2018
+
+Technical Skills
+Python, PostgreSQL, Docker, React
+
+Page 1 of 2
+"""
+
+# A header without a phone number, an experience section written as prose and an education line without a degree
+MESSY_RESUME = """Jane Doe
+jane@example.com
+EXPERIENCE
+I worked at several companies over the years doing many different things including building software and managing teams and talking to customers about their needs which was very rewarding.
+EDUCATION
+Stanford
+SKILLS
+Python, SQL
+"""
+
+
+def test_heading_detection():
+    for line, section in [
+        ("EXPERIENCE", "experience"),
+        ("Work Experience", "experience"),
+        ("PROFESSIONAL SUMMARY", "summary"),
+        ("Skills & Tools", "skills"),
+        ("Technical Skills:", "skills"),
+        ("Education", "education")
+    ]:
+        assert heading_section(line) == section, line
+    # Bullets and sentences that start with a heading word are content
+    for line in ["- Education", "Experience with Python and many other things here", "Jane Doe"]:
+        assert heading_section(line) is None, line
+
+
+def test_sections_are_split_by_heading():
+    sections = segment_sections(CLEAN_RESUME)
+    assert list(sections) == ["header", "summary", "experience", "education", "skills"]
+    assert sections["header"][0] == "Jane Doe"
+    assert sections["experience"][0] == "Senior Software Engineer | Acme Corp | Jan 2021 - Present"
+    # Blank lines and page numbers are dropped
+    assert sections["skills"] == ["Python, PostgreSQL, Docker, React"]
+
+
+def test_contact_details_come_from_the_header():
+    contact = parse_contact(segment_sections(CLEAN_RESUME)["header"])
+    assert contact == {
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "(555) 123-4567",
+        "location": "San Francisco, CA",
+        "github_profile": "github.com/janedoe",
+        "linkedin_profile": "linkedin.com/in/janedoe",
+        "website": ""
+    }
+
+
+def test_sections_are_parsed_into_resume_fields():
+    parsed = parse_sections(segment_sections(CLEAN_RESUME))
+    assert [(role["position"], role["company"], role["duration"]) for role in parsed["experience"]] == [
+        ("Senior Software Engineer", "Acme Corp", "Jan 2021 - Present"),
+        ("Software Engineer", "Globex Inc", "2018 - 2020")
+    ]
+    assert parsed["experience"][0]["description"] == ["Built Python services handling 2M requests a day", "Led migration to PostgreSQL"]
+    assert parsed["education"][0]["degree"] == "B.S. Computer Science" and parsed["education"][0]["institution"] == "Stanford University"
+    assert parsed["skills"] == ["Python", "PostgreSQL", "Docker", "React"]
+
+
+def test_confidence_is_high_for_a_clean_resume_and_low_where_the_parse_is_incomplete():
+    sections = segment_sections(CLEAN_RESUME)
+    assert section_confidence(sections, parse_sections(sections)) == {
+        "contact": 1.0, "summary": 1.0, "experience": 1.0, "education": 1.0, "skills": 1.0
+    }
+    sections = segment_sections(MESSY_RESUME)
+    confidence = section_confidence(sections, parse_sections(sections))
+    assert confidence["skills"] == 1.0
+    assert confidence["contact"] == 0.7  # No phone number
+    assert confidence["experience"] < 0.8 and confidence["education"] == 0.0
+
+
+def test_hybrid_parse_sends_only_low_confidence_sections_to_the_llm():
+    sent = {}
+
+    async def parse_section(section, section_text, prompt_version=None, llm_limiter=None):
+        sent[section] = section_text
+        if section == "education":
+            raise RuntimeError("model unavailable")
+        if section == "contact":
+            return {"name": "Jane Doe", "phone": "555-0100"}
+        return {section: [{
+            "position": "Software Engineer", "company": "Acme", "duration": "2019 - 2023",
+            "description": ["Built software and managed a team"]
+        }]}
+
+    saved = main.openai_client, main.parse_section_with_chatgpt
+    main.openai_client, main.parse_section_with_chatgpt = object(), parse_section
+    try:
+        response = asyncio.run(main.parse_resume_hybrid(MESSY_RESUME))
+    finally:
+        main.openai_client, main.parse_section_with_chatgpt = saved
+
+    assert sorted(sent) == ["contact", "education", "experience"]
+    assert sent["contact"] == "Jane Doe\njane@example.com" and sent["education"] == "Stanford"
+    # A failed section keeps its local result and is not reported as parsed by the LLM
+    assert sorted(response.llm_sections) == ["contact", "experience"]
+    assert response.data.phone == "555-0100" and response.data.email == "jane@example.com"
+    assert response.data.experience[0].company == "Acme"
+    assert response.data.skills == ["Python", "SQL"]
+
+
+def test_hybrid_parse_of_a_clean_resume_makes_no_llm_calls():
+    async def parse_section(*args, **kwargs):
+        raise AssertionError("A confident section was sent to the LLM")
+
+    saved = main.openai_client, main.parse_section_with_chatgpt
+    main.openai_client, main.parse_section_with_chatgpt = object(), parse_section
+    try:
+        response = asyncio.run(main.parse_resume_hybrid(CLEAN_RESUME))
+    finally:
+        main.openai_client, main.parse_section_with_chatgpt = saved
+    assert response.llm_sections == [] and response.data.name == "Jane Doe"
+    assert "above the confidence threshold" in response.message
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Resume parser tests passed")
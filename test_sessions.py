@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Tests for resume sessions: RFC 6902 JSON Patch, If-Match versioning on the
+/resumes endpoints, compare-and-set writes when two writers race, and looking
+up stored resumes off the event loop, several at a time for candidate ranking.
+Endpoint tests run in-process against the FastAPI app; no server or API key is needed.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx
+import main
+from sessions import (
+    JsonPatchError, MemorySessionBackend, ResumeSessionStore, SessionConflictError, SQLiteSessionBackend, apply_json_patch
+)
+
+DOCUMENT = {
+    "name": "Jane Doe",
+    "skills": ["Python", "SQL"],
+    "experience": [{"position": "Engineer", "company": "Acme", "description": ["Built APIs", "Ran on-call"]}]
+}
+
+RESUME_DATA = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "phone": "555-0100",
+    "summary": "Backend engineer",
+    "skills": ["Python", "SQL"],
+    "experience": [{"position": "Engineer", "company": "Acme", "duration": "2020-2023", "description": ["Built APIs"]}],
+    "education": []
+}
+
+
+def patch_fails(operations) -> bool:
+    try:
+        apply_json_patch(DOCUMENT, operations)
+    except JsonPatchError:
+        return True
+    return False
+
+
+def test_add_appends_with_dash():
+    patched = apply_json_patch(DOCUMENT, [{"op": "add", "path": "/skills/-", "value": "Go"}])
+    assert patched["skills"] == ["Python", "SQL", "Go"]
+    patched = apply_json_patch(DOCUMENT, [{"op": "add", "path": "/experience/0/description/-", "value": "Led migrations"}])
+    assert patched["experience"][0]["description"][-1] == "Led migrations"
+    # Inserting at an index shifts the rest; the original document is never modified
+    assert apply_json_patch(DOCUMENT, [{"op": "add", "path": "/skills/0", "value": "Go"}])["skills"] == ["Go", "Python", "SQL"]
+    assert DOCUMENT["skills"] == ["Python", "SQL"]
+
+
+def test_move_and_copy():
+    moved = apply_json_patch(DOCUMENT, [{"op": "move", "from": "/experience/0/description/1", "path": "/experience/0/description/0"}])
+    assert moved["experience"][0]["description"] == ["Ran on-call", "Built APIs"]
+    moved = apply_json_patch(DOCUMENT, [{"op": "move", "from": "/skills/0", "path": "/skills/-"}])
+    assert moved["skills"] == ["SQL", "Python"]
+    copied = apply_json_patch(DOCUMENT, [{"op": "copy", "from": "/experience/0", "path": "/experience/-"}])
+    assert copied["experience"][1] == copied["experience"][0]
+    copied["experience"][1]["company"] = "Globex"
+    assert copied["experience"][0]["company"] == "Acme"  # A copy, not a shared reference
+    assert patch_fails([{"op": "move", "from": "/experience/0", "path": "/experience/0/description/0"}])
+
+
+def test_test_operation():
+    assert apply_json_patch(DOCUMENT, [
+        {"op": "test", "path": "/skills/1", "value": "SQL"},
+        {"op": "replace", "path": "/skills/1", "value": "PostgreSQL"}
+    ])["skills"] == ["Python", "PostgreSQL"]
+    assert patch_fails([{"op": "test", "path": "/name", "value": "John Doe"}])
+
+
+def test_patch_is_all_or_nothing():
+    assert patch_fails([
+        {"op": "replace", "path": "/name", "value": "John Doe"},
+        {"op": "remove", "path": "/skills/5"}
+    ])
+    assert DOCUMENT["name"] == "Jane Doe"
+
+
+def test_invalid_paths():
+    assert patch_fails([{"op": "replace", "path": "/missing", "value": 1}])
+    assert patch_fails([{"op": "remove", "path": "/skills/2"}])
+    assert patch_fails([{"op": "add", "path": "/skills/3", "value": "Go"}])
+    assert patch_fails([{"op": "add", "path": "/skills/01", "value": "Go"}])
+    assert patch_fails([{"op": "replace", "path": "/skills/-", "value": "Go"}])
+    assert patch_fails([{"op": "add", "path": "skills/-", "value": "Go"}])
+    assert patch_fails([{"op": "add", "path": "/name/first", "value": "Jane"}])
+    assert patch_fails([{"op": "copy", "path": "/skills/-"}])
+    assert patch_fails([{"op": "rename", "path": "/name"}])
+
+
+def test_malformed_operations():
+    assert patch_fails([{"op": "add", "path": 5, "value": 1}])
+    assert patch_fails([{"op": "add", "path": None, "value": 1}])
+    assert patch_fails([{"op": "move", "from": ["skills", 0], "path": "/skills/-"}])
+    assert patch_fails([{"op": "copy", "from": 0, "path": "/skills/-"}])
+    assert patch_fails([{"op": ["add"], "path": "/name", "value": "X"}])
+    assert patch_fails([{"path": "/name", "value": "X"}])
+    assert patch_fails(["add /name"])
+    assert patch_fails({"op": "add", "path": "/name", "value": "X"})
+    # A malformed operation later in the patch fails it before anything is applied
+    assert patch_fails([{"op": "replace", "path": "/name", "value": "X"}, {"op": "remove", "path": 1}])
+
+
+def test_pointer_escapes():
+    document = {"a/b": 1, "c~d": 2}
+    assert apply_json_patch(document, [{"op": "test", "path": "/a~1b", "value": 1}, {"op": "test", "path": "/c~0d", "value": 2}]) == document
+
+
+async def run_endpoint_checks():
+    main.resume_sessions = ResumeSessionStore(MemorySessionBackend(100, 3600))
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        created = (await client.post("/resumes", json=RESUME_DATA)).json()
+        resume_id = created["resume_id"]
+        assert created["version"] == 1
+
+        # Invalid paths and failed tests leave the resume unchanged
+        for operations in [
+            [{"op": "replace", "path": "/experience/3/position", "value": "Lead"}],
+            [{"op": "remove", "path": "/no_such_field"}],
+            [{"op": "test", "path": "/name", "value": "Someone Else"}, {"op": "replace", "path": "/name", "value": "X"}],
+            [{"op": "replace", "path": "/skills", "value": "not a list"}],
+            [{"op": "add", "path": 5, "value": 1}],
+            [{"op": "copy", "from": {"path": "/name"}, "path": "/summary"}],
+            [{"op": 1, "path": "/name", "value": "X"}]
+        ]:
+            response = await client.patch(f"/resumes/{resume_id}", json=operations)
+            assert response.status_code == 422, (operations, response.status_code, response.text)
+        assert (await client.get(f"/resumes/{resume_id}")).json()["version"] == 1
+
+        response = await client.patch(
+            f"/resumes/{resume_id}", json=[{"op": "add", "path": "/skills/-", "value": "Go"}], headers={"If-Match": '"1"'}
+        )
+        assert response.status_code == 200, response.text
+        assert response.json()["version"] == 2
+        assert response.json()["data"]["skills"] == ["Python", "SQL", "Go"]
+
+        # Version 1 is stale now
+        response = await client.patch(
+            f"/resumes/{resume_id}", json=[{"op": "replace", "path": "/name", "value": "John Doe"}], headers={"If-Match": "1"}
+        )
+        assert response.status_code == 412, response.text
+        response = await client.put(f"/resumes/{resume_id}", json={**RESUME_DATA, "name": "John Doe"}, headers={"If-Match": "1"})
+        assert response.status_code == 412, response.text
+        stored = (await client.get(f"/resumes/{resume_id}")).json()
+        assert stored["version"] == 2 and stored["data"]["name"] == "Jane Doe"
+
+        response = await client.put(f"/resumes/{resume_id}", json={**RESUME_DATA, "name": "John Doe"}, headers={"If-Match": "2"})
+        assert response.status_code == 200 and response.json()["version"] == 3
+        response = await client.put(f"/resumes/{resume_id}", json=RESUME_DATA, headers={"If-Match": "latest"})
+        assert response.status_code == 400
+
+
+def test_endpoints_return_422_and_412():
+    asyncio.run(run_endpoint_checks())
+
+
+def race(writers) -> list:
+    """Start the writers at the same moment and return what each returned or raised."""
+    barrier = threading.Barrier(len(writers))
+    results = [None] * len(writers)
+
+    def run(index, writer):
+        barrier.wait()
+        try:
+            results[index] = writer()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index, writer)) for index, writer in enumerate(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_sqlite_compare_and_set_has_one_winner():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.sqlite3")
+        # Two connections to one file, like two worker processes
+        first, second = SQLiteSessionBackend(path, 3600), SQLiteSessionBackend(path, 3600)
+        session_id = ResumeSessionStore(first).create(dict(DOCUMENT))["id"]
+        for _ in range(20):
+            version = first.load(session_id)["version"]
+            results = race([
+                lambda backend=backend, name=name: backend.save(
+                    session_id, {"version": version + 1, "resume": {**DOCUMENT, "name": name}}, expected_version=version
+                )
+                for backend, name in [(first, "First"), (second, "Second")]
+            ])
+            assert sorted(results) == [False, True], results
+            winner = "First" if results[0] else "Second"
+            assert second.load(session_id) == {"version": version + 1, "resume": {**DOCUMENT, "name": winner}}
+        first.close()
+        second.close()
+
+
+def test_store_updates_from_the_same_version_conflict():
+    for backend in [MemorySessionBackend(100, 3600), None]:
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResumeSessionStore(backend or SQLiteSessionBackend(os.path.join(directory, "sessions.sqlite3"), 3600))
+            session_id = store.create(dict(DOCUMENT))["id"]
+            results = race([
+                lambda name=name: store.patch(
+                    session_id, [{"op": "replace", "path": "/name", "value": name}], lambda resume: resume, expected_version=1
+                )
+                for name in ["First", "Second"]
+            ])
+            winners = [result for result in results if isinstance(result, dict)]
+            assert len(winners) == 1, results
+            assert sum(isinstance(result, SessionConflictError) for result in results) == 1, results
+            assert store.get(session_id)["version"] == 2
+            assert store.get(session_id)["resume"]["name"] == winners[0]["resume"]["name"]
+            store.close()
+
+
+def test_get_many_returns_records_in_order_with_gaps():
+    for backend in [MemorySessionBackend(1000, 3600), None]:
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResumeSessionStore(backend or SQLiteSessionBackend(os.path.join(directory, "sessions.sqlite3"), 3600))
+            # More IDs than one SQLite query takes
+            session_ids = [store.create({**DOCUMENT, "name": f"Candidate {index}"})["id"] for index in range(600)]
+            store.delete(session_ids[1])
+            lookup = [session_ids[599], session_ids[1], "missing", session_ids[0], session_ids[0]] + session_ids[2:599]
+            records = store.get_many(lookup)
+            assert [record["resume"]["name"] if record else None for record in records[:5]] == [
+                "Candidate 599", None, None, "Candidate 0", "Candidate 0"
+            ]
+            assert [record["id"] for record in records[5:]] == session_ids[2:599]
+            assert store.get_many([]) == []
+            store.close()
+
+
+class ThreadRecordingStore(ResumeSessionStore):
+    """Session store that records the threads its lookups run on."""
+
+    def __init__(self, backend):
+        super().__init__(backend)
+        self.lookups = []
+
+    def get(self, session_id):
+        self.lookups.append(("get", threading.current_thread()))
+        return super().get(session_id)
+
+    def get_many(self, session_ids):
+        self.lookups.append(("get_many", threading.current_thread()))
+        return super().get_many(session_ids)
+
+
+async def run_lookup_checks(store: ThreadRecordingStore):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        resume_ids = [
+            (await client.post("/resumes", json={**RESUME_DATA, "name": name, "skills": skills})).json()["resume_id"]
+            for name, skills in [("Designer", ["Figma"]), ("Engineer", ["Python", "SQL"])]
+        ]
+        job_description = "Python and SQL engineer"
+        response = await client.post("/analyze-ats", json={"resume_id": resume_ids[1], "job_description": job_description, "mode": "fast"})
+        assert response.status_code == 200, response.text
+
+        response = await client.post("/rank-candidates", json={"resume_ids": resume_ids, "job_description": job_description, "mode": "fast"})
+        assert response.status_code == 200, response.text
+        assert [result["name"] for result in response.json()["results"]] == ["Engineer", "Designer"]
+        assert [result["resume_id"] for result in response.json()["results"]] == resume_ids[::-1]
+
+        response = await client.post("/rank-candidates", json={"resume_ids": [resume_ids[0], "0" * 32], "job_description": job_description, "mode": "fast"})
+        assert response.status_code == 404, response.text
+
+
+def test_stored_resumes_are_looked_up_off_the_event_loop():
+    store = ThreadRecordingStore(MemorySessionBackend(100, 3600))
+    saved = main.resume_sessions
+    main.resume_sessions = store
+    try:
+        asyncio.run(run_lookup_checks(store))
+    finally:
+        main.resume_sessions = saved
+    # One lookup for the analysis, one batched lookup per ranking request
+    assert [kind for kind, _ in store.lookups] == ["get", "get_many", "get_many"]
+    assert all(thread is not threading.main_thread() for _, thread in store.lookups)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Resume session tests passed")
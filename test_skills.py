@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for skill canonicalization: aliases, version suffixes and the longest-match
+trie walk that finds a known name at the start of a longer skill.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from ats_engine import extract_job_keywords, find_keywords
+from skills import SkillCanonicalizer, get_skill_canonicalizer, skill_key
+
+SKILLS = {
+    "JavaScript": ["JS", "ECMAScript"],
+    "Java": [],
+    "C": [],
+    "C++": ["cpp"],
+    "C#": ["csharp"],
+    "React": ["React.js", "ReactJS"],
+    "Python": ["py"],
+    "Vue": ["Vue.js"],
+    "Angular": ["AngularJS"],
+    "Go": ["Golang"],
+    "PostgreSQL": ["Postgres", "psql"],
+    "Postgres Admin": ["Postgres"]  # Claims an alias PostgreSQL already has
+}
+
+canonicalizer = SkillCanonicalizer(SKILLS)
+
+
+def test_skill_key_ignores_case_spacing_and_punctuation():
+    assert skill_key("React.js") == skill_key("react js") == skill_key("ReactJS") == "reactjs"
+    assert skill_key("C++") == "c++" and skill_key("C#") == "c#"
+    assert skill_key("snake_case") == "snakecase"
+
+
+def test_aliases_resolve_to_the_canonical_name():
+    for skill, expected in [
+        ("JS", "JavaScript"), ("ecmascript", "JavaScript"), ("React.js", "React"), ("react js", "React"),
+        ("cpp", "C++"), ("CSharp", "C#"), ("Golang", "Go"), ("psql", "PostgreSQL"), ("python", "Python")
+    ]:
+        assert canonicalizer.lookup(skill) == expected, (skill, canonicalizer.lookup(skill))
+    # The first skill to claim an alias keeps it
+    assert canonicalizer.lookup("Postgres") == "PostgreSQL"
+    assert canonicalizer.lookup("Postgres Admin") == "Postgres Admin"
+
+
+def test_version_suffixes_are_dropped():
+    for skill, expected in [
+        ("Python 3.11", "Python"), ("Python3", "Python"), ("python 2.7.x", "Python"), ("Vue3", "Vue"),
+        ("Vue.js 2", "Vue"), ("Angular v17", "Angular"), ("Java 17+", "Java"), ("React 18.2", "React")
+    ]:
+        assert canonicalizer.lookup(skill) == expected, (skill, canonicalizer.lookup(skill))
+
+
+def test_suffixes_that_are_not_versions_do_not_match():
+    for skill in ["Python Django", "Java EE", "JavaScripts", "Javas", "Reactive", "Golang tools", "Py2neo"]:
+        assert canonicalizer.lookup(skill) is None, (skill, canonicalizer.lookup(skill))
+
+
+def test_longest_known_name_wins():
+    # "c" and "java" are also prefixes of these keys; only the longest leaves a version behind
+    assert canonicalizer.lookup("C++ 20") == "C++"
+    assert canonicalizer.lookup("C# 12") == "C#"
+    assert canonicalizer.lookup("C 99") == "C"
+    assert canonicalizer.lookup("JavaScript ES2020") is None
+    assert canonicalizer.lookup("JavaScript 2020") == "JavaScript"
+    assert canonicalizer.lookup("Java 21") == "Java"
+    # The longest match can be an alias ("angularjs", not "angular")
+    assert canonicalizer.lookup("AngularJS 1.8") == "Angular"
+    assert canonicalizer.lookup("Angularjs2") == "Angular"
+
+
+def test_unknown_skills_keep_their_text():
+    assert canonicalizer.lookup("Basket weaving") is None
+    assert canonicalizer.canonicalize("  Basket   weaving ") == "Basket weaving"
+    assert canonicalizer.canonicalize("python 3.12") == "Python"
+
+
+def test_canonicalize_list_drops_duplicates_and_empty_entries():
+    assert canonicalizer.canonicalize_list(
+        ["ReactJS", "Python 3.11", "", "  ", "react", "JS", "py", "Basket weaving", "basket  WEAVING", "C++", "cpp 17"]
+    ) == ["React", "Python", "JavaScript", "Basket weaving", "C++"]
+
+
+def test_lexicon_canonicalizer():
+    lexicon = get_skill_canonicalizer()
+    assert lexicon.lookup("Python 3.11") == "Python"
+    assert lexicon.lookup("Basket weaving") is None
+
+
+def test_swiftui_is_not_swift():
+    lexicon = get_skill_canonicalizer()
+    assert lexicon.lookup("SwiftUI") == lexicon.lookup("Swift UI") == "SwiftUI"
+    assert lexicon.lookup("Swift") == lexicon.lookup("Swift 5.9") == "Swift"
+    # A SwiftUI requirement is not met by a Swift resume, nor the other way round
+    swiftui = extract_job_keywords("Requirements: SwiftUI")
+    swift = extract_job_keywords("Requirements: Swift")
+    assert [keyword["keyword"] for keyword in swiftui] == ["SwiftUI"]
+    assert find_keywords("Built iOS apps in Swift", swiftui) == set()
+    assert find_keywords("Built iOS screens with SwiftUI", swift) == set()
+    assert find_keywords("Built iOS screens with SwiftUI", swiftui) == {"SwiftUI"}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Skill canonicalization tests passed")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tests for the Server-Sent Event endpoints /analyze-ats/stream and /optimize-section/stream:
+a successful call sends its tokens, then a "result" event and the token usage; unusable
+output is retried; and a failing model call ends the stream with an "error" event.
+Runs in-process with a fake streaming OpenAI client; no server or API key is needed.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx
+import main
+from cache import TTLCache
+
+ATS_RESULT = {
+    "score": {"overall_score": 70, "keyword_match_score": 65, "experience_relevance": 72, "education_fit": 80, "skills_alignment": 68},
+    "insights": [],
+    "recommendations": [],
+    "matched_keywords": ["Python"],
+    "missing_keywords": ["AWS"],
+    "experience_gaps": [],
+    "strengths": [],
+    "removable_words": []
+}
+
+OPTIMIZATION_RESULT = {
+    "optimized_section": {"experience": [{
+        "position": "Software Engineer",
+        "company": "Tech Corp",
+        "duration": "2020-2023",
+        "description": ["Built Python APIs serving 2M requests a day", "Ran the weekly on-call rotation"]
+    }]},
+    "explanation": "Named the API work.",
+    "changes_made": ["Bullet 1: named the framework"]
+}
+
+RESUME_DATA = {
+    "name": "John Doe",
+    "email": "john.doe@email.com",
+    "phone": "555-1234",
+    "summary": "Software engineer.",
+    "skills": ["Python"],
+    "experience": [{
+        "position": "Software Engineer",
+        "company": "Tech Corp",
+        "duration": "2020-2023",
+        "description": ["Built Python APIs", "Ran the weekly on-call rotation"]
+    }],
+    "education": []
+}
+
+JOB_DESCRIPTION = "Backend Engineer\nRequirements:\n- Python APIs\n- AWS"
+
+
+def chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+async def stream_chunks(chunks, error=None):
+    for item in chunks:
+        yield item
+    if error is not None:
+        raise error
+
+
+class StreamingCompletions:
+    """Stand-in for `chat.completions` that streams each scripted reply in a few pieces, one reply per call."""
+
+    def __init__(self, replies: list):
+        self.replies = list(replies)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        assert kwargs["stream"]
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        text, error = reply if isinstance(reply, tuple) else (reply, None)
+        pieces = [chunk(text[start:start + 40]) for start in range(0, len(text), 40)]
+        if error is None:
+            pieces.append(chunk(usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20, prompt_tokens_details=None)))
+        return stream_chunks(pieces, error)
+
+
+def parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def stream(path: str, payload: dict, replies: list) -> tuple[list[tuple[str, dict]], StreamingCompletions]:
+    completions = StreamingCompletions(replies)
+    saved = main.openai_client, main.ats_cache
+    main.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    main.ats_cache = TTLCache(100, 3600)
+
+    async def post():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.post(path, json=payload)
+
+    try:
+        response = asyncio.run(post())
+    finally:
+        main.openai_client, main.ats_cache = saved
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return parse_events(response.text), completions
+
+
+def kinds(events: list[tuple[str, dict]]) -> list[str]:
+    """Event names with runs of "token" collapsed to one."""
+    collapsed = []
+    for name, _ in events:
+        if not (name == "token" and collapsed and collapsed[-1] == "token"):
+            collapsed.append(name)
+    return collapsed
+
+
+ATS_PAYLOAD = {"resume_data": RESUME_DATA, "job_description": JOB_DESCRIPTION}
+OPTIMIZATION_PAYLOAD = {
+    "resume_data": RESUME_DATA,
+    "job_description": JOB_DESCRIPTION,
+    "section": "experience",
+    "section_data": {"experience": RESUME_DATA["experience"]}
+}
+
+
+def test_ats_stream_ends_with_the_result():
+    events, _ = stream("/analyze-ats/stream", ATS_PAYLOAD, [json.dumps(ATS_RESULT)])
+    assert kinds(events) == ["token", "result", "usage"]
+    assert "".join(data["content"] for name, data in events if name == "token") == json.dumps(ATS_RESULT)
+    result = events[-2][1]
+    assert result["score"]["overall_score"] == 70 and result["matched_keywords"] == ["Python"]
+    # Filled in by the server, not the model
+    assert [match["requirement"] for match in result["requirement_matches"]] == ["Python APIs"]
+    assert events[-1][1]["prompt_tokens"] == 100
+
+
+def test_ats_stream_reuses_a_cached_result():
+    completions = StreamingCompletions([json.dumps(ATS_RESULT)])
+    saved = main.openai_client, main.ats_cache
+    main.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    main.ats_cache = TTLCache(100, 3600)
+
+    async def post_twice():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return [await client.post("/analyze-ats/stream", json=ATS_PAYLOAD) for _ in range(2)]
+
+    try:
+        first, second = asyncio.run(post_twice())
+    finally:
+        main.openai_client, main.ats_cache = saved
+    assert completions.calls == 1
+    assert kinds(parse_events(second.text)) == ["result"]
+    assert parse_events(second.text)[0][1] == parse_events(first.text)[-2][1]
+
+
+def test_unusable_output_is_retried():
+    events, completions = stream("/analyze-ats/stream", ATS_PAYLOAD, ["I cannot help with that.", json.dumps(ATS_RESULT)])
+    assert completions.calls == 2
+    assert kinds(events) == ["token", "retry", "token", "result", "usage"]
+
+
+def test_failed_model_call_sends_an_error_event():
+    events, _ = stream("/analyze-ats/stream", ATS_PAYLOAD, [RuntimeError("model unavailable")])
+    assert events == [("error", {"detail": "model unavailable"})]
+
+
+def test_stream_cut_off_mid_reply_sends_an_error_event():
+    reply = (json.dumps(OPTIMIZATION_RESULT), ConnectionError("connection reset"))
+    events, _ = stream("/optimize-section/stream", OPTIMIZATION_PAYLOAD, [reply])
+    assert kinds(events) == ["token", "error"]
+    assert events[-1][1] == {"detail": "connection reset"}
+
+
+def test_section_stream_ends_with_the_result():
+    events, _ = stream("/optimize-section/stream", OPTIMIZATION_PAYLOAD, [json.dumps(OPTIMIZATION_RESULT)])
+    assert kinds(events) == ["token", "result", "usage"]
+    result = events[-2][1]
+    assert result["success"] and result["optimized_section"] == OPTIMIZATION_RESULT["optimized_section"]
+    # The bullet the job says least about comes first
+    assert [bullet["text"] for bullet in result["bullet_priority"]][0] == "Ran the weekly on-call rotation"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Streaming tests passed")
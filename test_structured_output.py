@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Table tests for repairing the model's almost-valid JSON: output cut off by
+max_tokens, trailing commas, and JSON wrapped in prose or code fences; and the
+response_format schemas sent to the model.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from structured_output import parse_json_response, repair_json
+
+# (model output, expected value after repair)
+REPAIR_CASES = [
+    # Cut inside a string value or key
+    ('{"summary": "Led a team of', {"summary": "Led a team of"}),
+    ('{"a": 1, "b', {"a": 1}),
+    ('["Python", "Go', ["Python", "Go"]),
+    # Cut right after an escape character, or after an escaped quote
+    ('{"a": "line\\', {"a": "line"}),
+    ('{"a": "say \\"hi\\"", "b"', {"a": 'say "hi"'}),
+    ('{"a": "C:\\\\', {"a": "C:\\"}),
+    # Dangling key or separator
+    ('{"a": 1, "b"', {"a": 1}),
+    ('{"a": 1, "b":', {"a": 1}),
+    ('{"a": 1, "b": ', {"a": 1}),
+    ('{"a": {"b": "c", "d"', {"a": {"b": "c"}}),
+    ('{"a": "x", ', {"a": "x"}),
+    # Values cut off mid-token
+    ('{"a": 1, "b": tr', {"a": 1}),
+    ('{"a": [true, fals', {"a": [True]}),
+    ('{"a": 7, "b": 1.', {"a": 7}),
+    ('{"a": true', {"a": True}),
+    ('{"a": 12', {"a": 12}),
+    # Trailing commas
+    ('{"a": [1, 2,], }', {"a": [1, 2]}),
+    ('{"a": {"b": 1,\n},\n}', {"a": {"b": 1}}),
+    # Nested arrays and objects
+    ('{"a": [[1, 2], [3', {"a": [[1, 2], [3]]}),
+    ('[{"a": 1}, {"b": [', [{"a": 1}, {"b": []}]),
+    ('{"insights": [{"title": "Keywords", "impact": "hi', {"insights": [{"title": "Keywords", "impact": "hi"}]}),
+    # Brackets and commas inside strings are text, not structure
+    ('{"a": "x, ]}", "b": [', {"a": "x, ]}", "b": []}),
+    # Leading prose and code fences
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('Here is the analysis:\n```json\n{"a": 1}\n```\nLet me know!', {"a": 1}),
+    ('Sure! {"a": [1, 2]} Hope this helps.', {"a": [1, 2]}),
+    ('```\n{"a": "b",}\n```', {"a": "b"}),
+]
+
+
+def test_repair_cases():
+    for text, expected in REPAIR_CASES:
+        repaired = repair_json(text)
+        assert json.loads(repaired) == expected, f"{text!r} -> {repaired!r}"
+
+
+def test_text_without_json_is_left_alone():
+    assert repair_json("I cannot help with that.") == "I cannot help with that."
+
+
+def test_parse_json_response_reports_repair():
+    assert parse_json_response('{"a": 1}') == ({"a": 1}, False)
+    assert parse_json_response('```json\n{"a": 1}\n```') == ({"a": 1}, False)
+    assert parse_json_response('{"a": 1,}') == ({"a": 1}, True)
+    assert parse_json_response('{"a": [1, 2') == ({"a": [1, 2]}, True)
+
+
+def test_parse_json_response_rejects_non_objects():
+    for text in ["[1, 2]", "I cannot help with that."]:
+        try:
+            parse_json_response(text)
+        except ValueError:
+            continue
+        raise AssertionError(f"{text!r} was accepted")
+
+
+
+def test_response_formats_leave_out_server_filled_fields():
+    for response_format, server_filled in [
+        (main.ATS_RESPONSE_FORMAT, ["success", "message", "requirement_matches", "unmatched_requirements"]),
+        (main.SECTION_OPTIMIZATION_RESPONSE_FORMAT, ["success", "message", "bullet_priority"]),
+        (main.RESUME_RESPONSE_FORMAT, ["success", "message"])
+    ]:
+        schema = response_format["json_schema"]["schema"]
+        for field in server_filled:
+            assert field not in schema["properties"], (response_format["json_schema"]["name"], field)
+            assert field not in schema["required"], (response_format["json_schema"]["name"], field)
+        # Definitions only the left-out fields used are dropped too
+        assert "RequirementMatch" not in schema.get("$defs", {}) and "BulletPriority" not in schema.get("$defs", {})
+    assert "insights" in main.ATS_RESPONSE_FORMAT["json_schema"]["schema"]["properties"]
+    assert "optimized_section" in main.SECTION_OPTIMIZATION_RESPONSE_FORMAT["json_schema"]["schema"]["properties"]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ JSON repair tests passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for token budgeting: truncate_to_tokens and the resume and job description fitters
+always return text within their budget, including single long lines of dense text that take
+more tokens per character than usual, which are shortened rather than dropped.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from tokens import estimate_tokens, fit_job_description, fit_resume_text, truncate_to_tokens
+
+
+def test_keeps_whole_lines_that_fit():
+    text = "Python developer\nBuilt APIs\nLed a team of five engineers"
+    assert truncate_to_tokens(text, 1000, estimate_tokens) == text
+    assert truncate_to_tokens(text, 10, estimate_tokens) == "Python developer\nBuilt APIs"
+
+
+def test_dense_single_line_is_cut_to_the_budget():
+    dense_lines = [
+        "1,2;3|4" * 400,  # Digits and punctuation: about one token per 1-2 characters
+        "履歴書の職務経歴と技術スキル" * 200,  # Non-Latin script
+        "a" * 5000  # One long "word", estimated at four characters per token
+    ]
+    for text in dense_lines:
+        for budget in [1, 7, 50, 300]:
+            cut = truncate_to_tokens(text, budget, estimate_tokens)
+            assert estimate_tokens(cut) <= budget, (text[:10], budget, estimate_tokens(cut))
+            assert text.startswith(cut) and cut
+
+
+def test_zero_budget_is_empty():
+    assert truncate_to_tokens("anything", 0, estimate_tokens) == ""
+
+
+# Pasted or PDF-extracted text often arrives as one line
+ONE_LINE_JOB_DESCRIPTION = "Senior Python engineer building REST APIs on PostgreSQL and AWS. " * 300
+ONE_LINE_RESUME = "Jane Doe jane@example.com Software engineer with Python, Docker and Kubernetes experience. " * 300
+
+
+def test_job_description_on_one_line_is_shortened_not_dropped():
+    for budget in [5, 500]:
+        fitted = fit_job_description(ONE_LINE_JOB_DESCRIPTION, budget, estimate_tokens)
+        assert fitted and ONE_LINE_JOB_DESCRIPTION.startswith(fitted)
+        assert estimate_tokens(fitted) <= budget
+
+
+def test_resume_on_one_line_is_shortened_not_dropped():
+    for budget in [5, 500]:
+        fitted = fit_resume_text(ONE_LINE_RESUME, budget, estimate_tokens)
+        assert fitted and ONE_LINE_RESUME.startswith(fitted)
+        assert estimate_tokens(fitted) <= budget
+
+
+def test_leftover_budget_goes_to_the_best_line_that_did_not_fit():
+    job_description = "Requirements:\n- " + "Python and PostgreSQL " * 200 + "\nBenefits: dental"
+    fitted = fit_job_description(job_description, 60, estimate_tokens)
+    lines = fitted.split("\n")
+    # Lines keep their order: the shortened requirement stays between its heading and the benefits
+    assert lines[0] == "Requirements:" and lines[1].startswith("- Python and PostgreSQL") and lines[-1] == "Benefits: dental"
+    assert estimate_tokens(fitted) <= 60
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Token budgeting tests passed")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the document process pool: work runs inline when the pool is disabled,
+errors keep their HTTP status, the in-flight and queue-depth counters reported on
+/metrics, and shutting the pool down. /metrics reads SQLite-backed stores off the
+event loop.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx
+import main
+from fastapi import HTTPException
+from workers import ProcessPool
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+def slow_pid(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def reject(detail: str):
+    raise HTTPException(status_code=422, detail=detail)
+
+
+def fail():
+    raise ValueError("broken document")
+
+
+def test_pool_of_zero_runs_inline():
+    pool = ProcessPool(0)
+    assert asyncio.run(pool.run(slow_pid, 0)) == os.getpid()
+    assert pool._executor is None
+    assert pool.stats() == {"max_workers": 0, "in_flight": 0, "queue_depth": 0, "peak_in_flight": 1, "completed": 1, "failed": 0}
+
+
+def test_errors_keep_their_status():
+    for pool in [ProcessPool(0), ProcessPool(1)]:
+        try:
+            for function, args, status_code, detail in [(reject, ("bad input",), 422, "bad input"), (fail, (), 500, "broken document")]:
+                try:
+                    asyncio.run(pool.run(function, *args))
+                    raise AssertionError("The error was swallowed")
+                except HTTPException as e:
+                    assert (e.status_code, e.detail) == (status_code, detail)
+            assert pool.stats()["failed"] == 2 and pool.stats()["in_flight"] == 0
+        finally:
+            pool.shutdown()
+
+
+def test_queue_depth_counts_work_waiting_for_a_worker():
+    pool = ProcessPool(1)
+    depths = []
+
+    async def run_three():
+        tasks = [asyncio.create_task(pool.run(slow_pid, 0.2)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        depths.append(pool.stats())
+        return await asyncio.gather(*tasks)
+
+    try:
+        pids = asyncio.run(run_three())
+    finally:
+        pool.shutdown()
+    # One task runs in the single worker process while two wait
+    assert depths[0]["in_flight"] == 3 and depths[0]["queue_depth"] == 2
+    assert len(set(pids)) == 1 and pids[0] != os.getpid()
+    stats = pool.stats()
+    assert stats["peak_in_flight"] == 3 and stats["completed"] == 3 and stats["queue_depth"] == 0
+
+
+def test_shutdown_stops_the_workers_and_the_pool_can_restart():
+    pool = ProcessPool(1)
+    assert asyncio.run(pool.run(square, 7)) == 49
+    executor = pool._executor
+    pool.shutdown()
+    assert pool._executor is None
+    try:
+        executor.submit(square, 2)
+        raise AssertionError("The executor still accepts work")
+    except RuntimeError:
+        pass
+    pool.shutdown()  # A second shutdown is a no-op
+    # Work sent after shutdown starts a new executor
+    assert asyncio.run(pool.run(square, 3)) == 9
+    pool.shutdown()
+
+
+class ThreadRecordingStats:
+    """Wraps a store and records the thread its stats() runs on."""
+
+    def __init__(self, store, threads: list):
+        self.store = store
+        self.threads = threads
+
+    def stats(self) -> dict:
+        self.threads.append(threading.current_thread())
+        return self.store.stats()
+
+
+def test_metrics_report_the_pool_and_read_stores_off_the_event_loop():
+    threads = []
+    saved = main.parse_cache, main.resume_sessions, main.bulk_jobs, main.process_pool
+    main.parse_cache, main.resume_sessions, main.bulk_jobs = (
+        ThreadRecordingStats(store, threads) for store in (main.parse_cache, main.resume_sessions, main.bulk_jobs)
+    )
+    main.process_pool = ProcessPool(0)
+
+    async def get_metrics():
+        await main.process_pool.run(square, 2)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.get("/metrics")
+
+    try:
+        response = asyncio.run(get_metrics())
+    finally:
+        main.parse_cache, main.resume_sessions, main.bulk_jobs, main.process_pool = saved
+    assert response.status_code == 200, response.text
+    metrics = response.json()
+    assert metrics["process_pool"]["completed"] == 1 and metrics["process_pool"]["queue_depth"] == 0
+    assert "running_in_process" in metrics["bulk_jobs"]
+    assert len(threads) == 3 and all(thread is not threading.main_thread() for thread in threads)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("✅ Process pool tests passed")